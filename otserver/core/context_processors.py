@@ -11,6 +11,7 @@ def feature_flags(request):
         "POWERGAMERS_SHOWBOX_ENABLED": settings.POWERGAMERS_SHOWBOX_ENABLED,
         "ONLINERANKING_SHOWBOX_ENABLED": settings.ONLINERANKING_SHOWBOX_ENABLED,
         "DISCORDWIDGET_ENABLED": settings.DISCORDWIDGET_ENABLED,
+        "OT_STATUS_STREAM_PATH": getattr(settings, "OT_STATUS_STREAM_PATH", ""),
         
     }
 
@@ -13,4 +13,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402  (needs the app registry loaded above)
+from pages.status_stream import StatusStreamApp  # noqa: E402
+
+# OT_STATUS_STREAM_PATH (Server-Sent Events) is answered here, outside the sync
+# middleware stack, so each open stream is a coroutine rather than a thread.
+application = StatusStreamApp(django_application)
+
+if getattr(settings, "OT_DB_WARMUP", True):
+    from pages.db import warm_up  # noqa: E402
+    warm_up()
@@ -58,7 +58,9 @@ CHARMARKET_SHOWBOX_ENABLED = env.bool("CHARMARKET_SHOWBOX_ENABLED")
 POWERGAMERS_SHOWBOX_ENABLED = env.bool("POWERGAMERS_SHOWBOX_ENABLED")
 ONLINERANKING_SHOWBOX_ENABLED = env.bool("ONLINERANKING_SHOWBOX_ENABLED")
 DISCORDWIDGET_ENABLED = env.bool("DISCORDWIDGET_ENABLED")
-OT_DB_ALIAS = env("DB_NAME")
+OT_DB_ALIAS = "default"
+OT_DB_WARMUP = os.getenv("OT_DB_WARMUP", "1") == "1"  # preload the schema snapshot when a worker starts (main/wsgi.py)
+OT_SCHEMA_TTL = int(os.getenv("OT_SCHEMA_TTL", 600))  # seconds a cached schema snapshot stays valid
 
 # Application definition
 
@@ -75,6 +77,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'pages.middleware.QueryProfilerMiddleware',
+    'pages.middleware.ReadAfterWriteMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -108,46 +112,58 @@ WSGI_APPLICATION = 'main.wsgi.application'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
 # Use environment variables for database configuration
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.mysql",
-        "NAME": env("DB_NAME"),
-        "USER": env("DB_USER"),
-        "PASSWORD": env("DB_PASSWORD"),
-        "HOST": env("DB_HOST", default="127.0.0.1"),
-        "PORT": env("DB_PORT", default="3306"),
-        "OPTIONS": {
-            "charset": "utf8mb4",
-            # Keeps Django strict about invalid data; good default for MySQL
-            "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
-        },
-    },
-    "retrowar": {
-        "ENGINE": "django.db.backends.mysql",
-        "NAME": env("DB_NAME"),
-        "USER": env("DB_USER"),
-        "PASSWORD": env("DB_PASSWORD"),
-        "HOST": env("DB_HOST", default="127.0.0.1"),
-        "PORT": env("DB_PORT", default="3306"),
-        "OPTIONS": {
-            "charset": "utf8mb4",
-            # Keeps Django strict about invalid data; good default for MySQL
-            "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
-        },
-    },
-    env("DB_NAME"): {
+def _mysql_db(host, port, user, password):
+    """One MySQL alias. Connections are persistent (CONN_MAX_AGE) and health-checked
+    before reuse, so each worker thread keeps one open connection per alias."""
+    return {
         "ENGINE": "django.db.backends.mysql",
         "NAME": env("DB_NAME"),
-        "USER": env("DB_USER"),
-        "PASSWORD": env("DB_PASSWORD"),
-        "HOST": env("DB_HOST", default="127.0.0.1"),
-        "PORT": env("DB_PORT", default="3306"),
+        "USER": user,
+        "PASSWORD": password,
+        "HOST": host,
+        "PORT": port,
+        "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", default=300),  # seconds; recycled after this
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {
             "charset": "utf8mb4",
             # Keeps Django strict about invalid data; good default for MySQL
             "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
+            "connect_timeout": env.int("DB_CONNECT_TIMEOUT", default=5),
         },
     }
+
+# Django and the OT tables live in the same MySQL schema: one alias for both,
+# so the ORM and pages.db.DB share the same persistent connection.
+DATABASES = {
+    "default": _mysql_db(
+        env("DB_HOST", default="127.0.0.1"), env("DB_PORT", default="3306"),
+        env("DB_USER"), env("DB_PASSWORD"),
+    ),
+}
+
+# Optional read replica: public read pages go here, writes and reads right after
+# a write stay on the primary (pages.db.DB + pages.middleware.ReadAfterWriteMiddleware).
+if env("DB_REPLICA_HOST", default=""):
+    DATABASES["replica"] = {
+        **_mysql_db(
+            env("DB_REPLICA_HOST"), env("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+            env("DB_REPLICA_USER", default=DATABASES["default"]["USER"]),
+            env("DB_REPLICA_PASSWORD", default=DATABASES["default"]["PASSWORD"]),
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+OT_DB_READ_ALIAS = "replica" if "replica" in DATABASES else OT_DB_ALIAS
+OT_DB_STICKY_SECONDS = int(os.getenv("OT_DB_STICKY_SECONDS", 10))  # read from primary this long after a write
+OT_TX_RETRY_ATTEMPTS = int(os.getenv("OT_TX_RETRY_ATTEMPTS", 4))      # DB.atomic_retry: tries on deadlock/lock wait
+OT_TX_RETRY_BACKOFF = float(os.getenv("OT_TX_RETRY_BACKOFF", 0.05))  # ...base backoff seconds (full jitter)
+
+# Shared by every worker and the status_poller process (status snapshots, query
+# result cache tags, schema versions), so it must not be per-process locmem.
+# The file cache default works, but its add()/incr() are not atomic across
+# processes (pages.swr locks can have several winners); prefer redis/memcached.
+# e.g. CACHE_URL=rediscache://127.0.0.1:6379/1 or pymemcache://127.0.0.1:11211
+CACHES = {
+    "default": env.cache("CACHE_URL", default=f"filecache://{BASE_DIR / 'var' / 'cache'}"),
 }
 
 
@@ -210,6 +226,28 @@ OT_STATUS_TIMEOUT = 3.0        # seconds
 OT_STATUS_MIN_INTERVAL = 15
 OT_STATUS_RETRIES = 1
 OT_STATUS_RETRY_DELAY = 1.0
+# Views read status from pages.status_snapshot, kept fresh by `manage.py status_poller`.
+OT_STATUS_INFO_INTERVAL = int(os.getenv("OT_STATUS_INFO_INTERVAL", 60))  # poller: TSQP info refresh (seconds)
+OT_STATUS_MAX_AGE = int(os.getenv("OT_STATUS_MAX_AGE", 45))              # snapshot older than this counts as stale
+OT_STATUS_LIVE_FALLBACK = os.getenv("OT_STATUS_LIVE_FALLBACK", "1") == "1"  # query in-request when stale (no poller)
+OT_PRESENCE_LOCAL_TTL = float(os.getenv("OT_PRESENCE_LOCAL_TTL", 5))         # pages.presence: per-process reuse of the online sets
+# Live status over SSE (pages.status_stream). ASGI only: set e.g. "/status/stream/"
+# when serving main.asgi; "" (the default, for mod_wsgi) = the pages keep polling.
+OT_STATUS_STREAM_PATH = os.getenv("OT_STATUS_STREAM_PATH", "")
+OT_STATUS_STREAM_TICK = float(os.getenv("OT_STATUS_STREAM_TICK", 1.0))      # seconds between snapshot checks per world
+OT_STATUS_STREAM_KEEPALIVE = float(os.getenv("OT_STATUS_STREAM_KEEPALIVE", 15))
+OT_STATUS_STREAM_MAX = int(os.getenv("OT_STATUS_STREAM_MAX", 5000))         # open streams per process
+
+# OTClient updater manifest (pages.updater_manifest)
+OT_UPDATER_API_DIR = os.getenv("OT_UPDATER_API_DIR", "/srv/django_otwebsite/otserver/api")
+OT_UPDATER_RESCAN = float(os.getenv("OT_UPDATER_RESCAN", 5))   # seconds between stat walks of the tree
+OT_UPDATER_INDEX_PATH = os.getenv("OT_UPDATER_INDEX_PATH", str(BASE_DIR / "var" / "updater_index.json"))
+OT_UPDATER_HASH_WORKERS = int(os.getenv("OT_UPDATER_HASH_WORKERS", 0))   # 0 = min(8, CPUs); see pages/checksums.py
+
+# Per-request SQL profiling (pages.middleware.QueryProfilerMiddleware)
+OT_SERVER_TIMING = os.getenv("OT_SERVER_TIMING", "1") == "1"         # emit Server-Timing header
+OT_QUERY_BUDGET_COUNT = int(os.getenv("OT_QUERY_BUDGET_COUNT", 20))  # log requests above this many queries
+OT_QUERY_BUDGET_MS = float(os.getenv("OT_QUERY_BUDGET_MS", 250))     # ...or above this much DB time
 
 # Map to your schema (adjust if your accounts table differs)
 OT_PASSWORD_TYPE = "sha1"           # or "plain", "md5", "sha256"
@@ -246,6 +284,7 @@ LOGGING = {
     "handlers": {"console": {"class": "logging.StreamHandler"}},
     "loggers": {
         "pages.mail_backends": {"handlers": ["console"], "level": "INFO"},
+        "pages.middleware": {"handlers": ["console"], "level": "WARNING"},
     },
 }
 
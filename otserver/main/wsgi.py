@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'main.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402  (needs the app registry loaded above)
+
+if getattr(settings, "OT_DB_WARMUP", True):
+    from pages.db import warm_up  # noqa: E402
+    warm_up()
@@ -76,6 +76,39 @@ CREATE TABLE IF NOT EXISTS coins_ledger (
   INDEX idx_acct_time (account_id, created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Closed months of coins_ledger, summarized per account (manage.py ledger_compact)
+CREATE TABLE IF NOT EXISTS coins_ledger_monthly (
+  account_id INT NOT NULL,
+  month INT UNSIGNED NOT NULL,        -- YEAR*100+MONTH, UTC (e.g. 202405)
+  delta_sum BIGINT NOT NULL,
+  credits BIGINT UNSIGNED NOT NULL,
+  debits  BIGINT UNSIGNED NOT NULL,
+  entries INT UNSIGNED NOT NULL,
+  first_id BIGINT NOT NULL,
+  last_id  BIGINT NOT NULL,
+  PRIMARY KEY (account_id, month)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Detail rows moved out of coins_ledger by ledger_compact (same ids)
+CREATE TABLE IF NOT EXISTS coins_ledger_archive (
+  id BIGINT PRIMARY KEY,
+  account_id INT NOT NULL,
+  delta BIGINT NOT NULL,
+  kind ENUM('credit','debit','hold','release','settle','fee','refund') NOT NULL,
+  ref  VARCHAR(64) NULL,
+  note VARCHAR(255) NULL,
+  created_at INT UNSIGNED NOT NULL,
+  INDEX idx_acct_time (account_id, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- SUM(delta) per account over ledger ids <= last_id (live + archive); incremental balance checks
+CREATE TABLE IF NOT EXISTS coins_ledger_checkpoint (
+  account_id INT PRIMARY KEY,
+  ledger_sum BIGINT NOT NULL,
+  last_id BIGINT NOT NULL,
+  checked_at INT UNSIGNED NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 -- Active coin hold for the highest bidder
 CREATE TABLE IF NOT EXISTS bazaar_holds (
   id BIGINT AUTO_INCREMENT PRIMARY KEY,
@@ -152,6 +185,14 @@ CREATE TABLE IF NOT EXISTS store_orders (
   UNIQUE KEY uniq_tx (txid, actionid)     -- idempotency across retries
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Players-online history per status endpoint ("host:port"): minute/hour/day
+-- ring buffers serialized by pages.online_history (manage.py status_poller)
+CREATE TABLE IF NOT EXISTS online_history (
+  world_key  VARCHAR(64) PRIMARY KEY,
+  data       MEDIUMBLOB NOT NULL,
+  updated_at INT UNSIGNED NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 
 ALTER TABLE accounts ADD COLUMN email VARCHAR(255) NOT NULL DEFAULT '';
 ALTER TABLE accounts ADD email varchar(255) CHARACTER SET utf8mb3 COLLATE utf8mb3_general_ci DEFAULT '' NOT NULL;
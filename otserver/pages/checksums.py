@@ -0,0 +1,75 @@
+# pages/checksums.py
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+import mmap
+import os
+import time
+import zlib
+
+# CRC32 of updater assets. Files of MMAP_MIN bytes and up are mapped and fed to
+# zlib.crc32 in one call (no read copies); smaller ones are read whole. zlib.crc32
+# releases the GIL on large buffers, so a thread pool scales on big files; a
+# process pool (processes=True) also parallelizes the per-file overhead of many
+# small ones. Batches too small to pay for a pool are hashed inline.
+
+MMAP_MIN = 1 << 20          # 1 MiB
+_INLINE_FILES = 8           # below this many files...
+_INLINE_BYTES = 4 << 20     # ...or this many bytes in total, skip the pool
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class FileChecksum:
+    path: Path
+    crc: str          # 8 lowercase hex digits, as in the updater manifest
+    size: int
+    seconds: float
+    mmapped: bool
+
+
+def crc32_file(path: PathLike) -> FileChecksum:
+    path = Path(path)
+    t0 = time.perf_counter()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_MIN:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                crc = zlib.crc32(m)
+        else:
+            crc = zlib.crc32(f.read())
+    return FileChecksum(path, format(crc & 0xFFFFFFFF, "08x"), size, time.perf_counter() - t0, size >= MMAP_MIN)
+
+
+def crc32_hex(path: PathLike) -> str:
+    return crc32_file(path).crc
+
+
+def default_workers() -> int:
+    return min(8, os.cpu_count() or 1)
+
+
+def checksum_many(paths: Iterable[PathLike], *, workers: Optional[int] = None,
+                  processes: bool = False, sizes: Optional[List[int]] = None) -> List[FileChecksum]:
+    """
+    FileChecksum per path, in input order. `sizes` (same order, e.g. from a stat
+    walk) lets the largest files start first; OSError from any file propagates.
+    """
+    paths = [Path(p) for p in paths]
+    workers = workers or default_workers()
+    if sizes is None:
+        sizes = [p.stat().st_size for p in paths]
+    if workers <= 1 or len(paths) < _INLINE_FILES or sum(sizes) < _INLINE_BYTES:
+        return [crc32_file(p) for p in paths]
+
+    order = sorted(range(len(paths)), key=lambda i: -sizes[i])
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        done = list(pool.map(crc32_file, [paths[i] for i in order], chunksize=16 if processes else 1))
+    out: List[Optional[FileChecksum]] = [None] * len(paths)
+    for i, res in zip(order, done):
+        out[i] = res
+    return out  # type: ignore[return-value]
@@ -2,133 +2,247 @@
 from __future__ import annotations
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import re
+import sys
+import logging
 import json
 import time
+import base64
+import hashlib
+import keyword
+import random
+import threading
 
 from django.http import JsonResponse, Http404
 from django.conf import settings
-from django.db import connections, transaction
+from django.core.cache import cache
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections, transaction
 from django.db.utils import OperationalError, InterfaceError
 
+from . import profiling
+from .schema_catalog import SchemaCatalog, SchemaSnapshot
+
+log = logging.getLogger(__name__)
+
 ParamMap = Mapping[str, Any]
 Params   = Union[Sequence[Any], ParamMap, None]
 
-OT_DB_ALIAS: str = getattr(settings, "OT_DB_ALIAS", "retrowar")
+OT_DB_ALIAS: str = getattr(settings, "OT_DB_ALIAS", "default")
+OT_DB_READ_ALIAS: str = getattr(settings, "OT_DB_READ_ALIAS", OT_DB_ALIAS)
+OT_DB_STICKY_SECONDS: int = int(getattr(settings, "OT_DB_STICKY_SECONDS", 10))
+OT_DB_GATHER_WORKERS: int = int(getattr(settings, "OT_DB_GATHER_WORKERS", 8))
+OT_TX_RETRY_ATTEMPTS: int = int(getattr(settings, "OT_TX_RETRY_ATTEMPTS", 4))
+OT_TX_RETRY_BACKOFF: float = float(getattr(settings, "OT_TX_RETRY_BACKOFF", 0.05))
 
 # -------- utilities --------
 def _now() -> int:
     return int(time.time())
 
-def wallet_ensure(self, account_id: int) -> None:
-    now = _now()
-    self.run("execute",
-        "INSERT INTO coins_wallet (account_id,balance,created_at,updated_at) "
-        "VALUES (%s,0,%s,%s) ON DUPLICATE KEY UPDATE updated_at=VALUES(updated_at)",
-        [account_id, now, now])
-
-def wallet_balance(self, account_id: int) -> int:
-    row = self.run("select_one", "SELECT balance FROM coins_wallet WHERE account_id=%s", [account_id])
-    if not row:
-        return 0
-    return int(row["balance"])
-
-def wallet_delta(self, account_id: int, delta: int, kind: str, ref: str = None, note: str = None) -> None:
-    """Atomic balance update with ledger row."""
-    now = _now()
-    with self.atomic():
-        self.wallet_ensure(account_id)
-        # Update balance
-        self.run("execute",
-            "UPDATE coins_wallet SET balance=balance+%s, updated_at=%s WHERE account_id=%s",
-            [delta, now, account_id])
-        # Ledger row
-        self.run("execute",
-            "INSERT INTO coins_ledger (account_id, delta, kind, ref, note, created_at) "
-            "VALUES (%s,%s,%s,%s,%s,%s)",
-            [account_id, delta, kind, ref, note, now])
-
-def hold_create(self, offer_id: int, account_id: int, amount: int) -> int:
-    """Create an active hold: debit coins from bidder and park them on the offer."""
-    now = _now()
-    ref = f"offer:{offer_id}"
-    with self.atomic():
-        bal = self.wallet_balance(account_id)
-        if bal < amount:
-            raise ValueError("Insufficient coins")
-        # debit
-        self.wallet_delta(account_id, -int(amount), "hold", ref=ref)
-        # create hold
-        self.run("execute",
-            "INSERT INTO bazaar_holds (offer_id, account_id, amount, active, created_at) "
-            "VALUES (%s,%s,%s,1,%s)", [offer_id, account_id, amount, now])
-        # return new id
-        row = self.run("select_one", "SELECT LAST_INSERT_ID() AS id", [])
-        return int(row["id"])
-
-def hold_get_active(self, offer_id: int):
-    return self.run("select_one",
-        "SELECT * FROM bazaar_holds WHERE offer_id=%s AND active=1", [offer_id])
-
-def hold_release(self, hold_id: int) -> None:
-    """Release an active hold back to the bidder."""
-    now = _now()
-    hold = self.run("select_one", "SELECT * FROM bazaar_holds WHERE id=%s AND active=1", [hold_id])
-    if not hold:  # nothing to do
-        return
-    ref = f"offer:{hold['offer_id']}"
-    with self.atomic():
-        # mark inactive
-        self.run("execute", "UPDATE bazaar_holds SET active=0, released_at=%s WHERE id=%s", [now, hold_id])
-        # refund
-        self.wallet_delta(hold["account_id"], int(hold["amount"]), "release", ref=ref)
-
-def hold_settle_to_seller(self, hold_id: int, seller_account_id: int, *, fee_bps: int = 0, fee_account_id: int = 1) -> None:
+# -------- read/write routing --------
+# Reads go to the replica (OT_DB_READ_ALIAS) unless the current request/task is
+# pinned to the primary: it wrote something itself, or it came in with the
+# sticky cookie set by ReadAfterWriteMiddleware after a recent write.
+_pinned_until: ContextVar[float] = ContextVar("ot_db_pinned_until", default=0.0)
+_wrote: ContextVar[bool] = ContextVar("ot_db_wrote", default=False)
+
+def pin_primary(seconds: Optional[float] = None) -> None:
+    """Send this context's reads to the primary for `seconds` (default OT_DB_STICKY_SECONDS)."""
+    secs = OT_DB_STICKY_SECONDS if seconds is None else seconds
+    _pinned_until.set(max(_pinned_until.get(), time.time() + max(0.0, float(secs))))
+
+def is_pinned() -> bool:
+    return _wrote.get() or _pinned_until.get() > time.time()
+
+def _mark_write() -> None:
+    _wrote.set(True)
+    pin_primary()
+
+def begin_request(pinned_until: float = 0.0) -> Tuple[Any, Any]:
+    """Fresh routing state for a request (see ReadAfterWriteMiddleware); returns tokens for end_request()."""
+    return _pinned_until.set(pinned_until), _wrote.set(False)
+
+def end_request(tokens: Tuple[Any, Any]) -> bool:
+    """Restore the previous routing state; True if the request wrote to the primary."""
+    wrote = _wrote.get()
+    _pinned_until.reset(tokens[0])
+    _wrote.reset(tokens[1])
+    return wrote
+
+def _coins(amount: Any) -> int:
+    amount = int(amount)
+    if amount <= 0:
+        raise ValueError("Amount must be positive")
+    return amount
+
+def _stream_cursor(conn):
     """
-    Move the held amount to the seller (minus fee). Marks hold inactive.
-    fee_bps = basis points (100 = 1%).
+    Unbuffered cursor on the raw DB-API connection (PyMySQL / mysqlclient SSCursor).
+    Other backends fall back to a regular Django cursor consumed with fetchmany().
     """
-    now = _now()
-    hold = self.run("select_one", "SELECT * FROM bazaar_holds WHERE id=%s AND active=1", [hold_id])
-    if not hold:
-        return
-    amount = int(hold["amount"])
-    fee = (amount * int(fee_bps)) // 10_000 if fee_bps > 0 else 0
-    net = amount - fee
-    ref = f"offer:{hold['offer_id']}"
-    with self.atomic():
-        # deactivate hold
-        self.run("execute", "UPDATE bazaar_holds SET active=0, released_at=%s WHERE id=%s", [now, hold_id])
-        # settle to seller
-        self.wallet_delta(seller_account_id, net, "settle", ref=ref)
-        if fee > 0:
-            self.wallet_delta(fee_account_id, fee, "fee", ref=ref)
+    if conn.vendor == "mysql":
+        raw = conn.connection
+        driver = sys.modules.get(type(raw).__module__.split(".", 1)[0])
+        ss = getattr(getattr(driver, "cursors", None), "SSCursor", None)
+        if ss is not None:
+            return raw.cursor(ss)
+    return conn.cursor()
 
 def _rows_as_dicts(cur) -> List[Dict[str, Any]]:
     cols = [c[0] for c in (cur.description or [])]
     return [dict(zip(cols, row)) for row in cur.fetchall()]
 
+# -------- compact row factories (db.run(..., row="tuple"|"record"|"columns")) --------
+
+class TupleRows(list):
+    """Plain tuples plus one shared column index: rows.index["name"] -> position."""
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns: Sequence[str], rows: Iterable[tuple]) -> None:
+        super().__init__(rows)
+        self.columns = tuple(columns)
+        self.index = {c: i for i, c in enumerate(self.columns)}
+
+class Record:
+    """
+    Base of the generated __slots__ row classes. Reads like a dict too
+    (row["name"], row.get("name"), "name" in row, templates' {{ row.name }}),
+    so views can switch from dict rows without touching their lookups.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return getattr(self, self._fields[key])
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+
+    def __contains__(self, key) -> bool:
+        return key in self._fields
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return [getattr(self, f) for f in self._fields]
+
+    def items(self):
+        return [(f, getattr(self, f)) for f in self._fields]
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def _asdict(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in self._fields}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{f}={getattr(self, f)!r}' for f in self._fields)})"
+
+    def __reduce__(self):
+        # generated classes aren't importable by name; rebuild through the factory
+        return _record_from, (self._fields, tuple(self.values()))
+
+_RECORD_RESERVED = frozenset(dir(Record))
+
+def _record_from(fields: Tuple[str, ...], values: Tuple[Any, ...]) -> Record:
+    return _record_class(tuple(fields))(values)
+
+@lru_cache(maxsize=256)
+def _record_class(columns: Tuple[str, ...]) -> Optional[type]:
+    """
+    One __slots__ class per column signature (cached). None when a column can't be
+    an attribute (not an identifier, a Python keyword, a Record method name): the
+    caller falls back to dict rows, which read the same way.
+    """
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"Duplicate column names in {columns!r}; alias them in the SELECT")
+    for c in columns:
+        if not c.isidentifier() or keyword.iskeyword(c) or c in _RECORD_RESERVED:
+            log.debug("record rows: column %r is not a valid field; using dict rows", c)
+            return None
+    ns: Dict[str, Any] = {"__slots__": columns, "_fields": columns}
+    if columns:
+        # Generated from validated identifiers only: plain tuple unpacking into the slots.
+        src = f"def __init__(self, values):\n    {', '.join('self.' + c for c in columns)}, = values\n"
+        exec(src, ns)
+    else:
+        ns["__init__"] = lambda self, values: None
+    name = "Row_" + hashlib.sha1(",".join(columns).encode("utf-8")).hexdigest()[:8]
+    return type(name, (Record,), ns)
+
+def _rows_as_tuples(cur) -> TupleRows:
+    return TupleRows([c[0] for c in (cur.description or [])], cur.fetchall())
+
+def _rows_as_records(cur) -> List[Union[Record, Dict[str, Any]]]:
+    cols = tuple(c[0] for c in (cur.description or []))
+    cls = _record_class(cols)
+    if cls is None:
+        return [dict(zip(cols, row)) for row in cur.fetchall()]
+    return [cls(row) for row in cur.fetchall()]
+
+def _rows_as_columns(cur) -> Dict[str, List[Any]]:
+    cols = [c[0] for c in (cur.description or [])]
+    data = cur.fetchall()
+    return {c: [row[i] for row in data] for i, c in enumerate(cols)}
+
+_ROW_FACTORIES = {
+    "dict": _rows_as_dicts,
+    "tuple": _rows_as_tuples,
+    "record": _rows_as_records,
+    "columns": _rows_as_columns,
+}
+
+def _row_factory(row: str):
+    try:
+        return _ROW_FACTORIES[row]
+    except KeyError:
+        raise ValueError(f"Unknown row format: {row}") from None
+
+def _row_count(rows) -> int:
+    if isinstance(rows, dict):
+        return len(next(iter(rows.values()), ()))
+    return len(rows)
+
 _named_re = re.compile(r":([a-zA-Z_][a-zA-Z0-9_]*)")
+_BIND_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=_BIND_CACHE_SIZE)
+def _compile_named(sql: str) -> Tuple[str, Tuple[str, ...]]:
+    """Rewrite :name placeholders to %s once per distinct SQL string -> (sql, names in order)."""
+    names: List[str] = []
+    def repl(m: re.Match) -> str:
+        names.append(m.group(1))
+        return "%s"
+    return _named_re.sub(repl, sql), tuple(names)
 
 def _bind(sql: str, params: Params) -> Tuple[str, List[Any]]:
     """
     Allow both positional params and named params in SQL.
     - If params is a list/tuple: assumed '%s' placeholders in sql.
-    - If params is a dict: replace :name in sql with %s and map values.
+    - If params is a dict: replace :name in sql with %s and map values
+      (the rewrite is memoized per SQL string, see _compile_named).
     """
     if params is None:
         return sql, []
     if isinstance(params, (list, tuple)):
         return sql, list(params)
     if isinstance(params, Mapping):
-        names: List[str] = []
-        def repl(m: re.Match) -> str:
-            names.append(m.group(1))
-            return "%s"
-        sql2 = _named_re.sub(repl, sql)
-        args = [params[name] for name in names]
-        return sql2, args
+        sql2, names = _compile_named(sql)
+        return sql2, [params[name] for name in names]
     raise TypeError("params must be list/tuple/dict/None")
 
 def _should_retry(exc: Exception) -> bool:
@@ -147,6 +261,103 @@ def _should_retry(exc: Exception) -> bool:
     # Lost connection / server gone / lock timeout / deadlock
     return code in {2006, 2013, 1205, 1213}
 
+_LOCK_CONFLICT = {1205: "lock_wait_timeout", 1213: "deadlock"}
+
+def _lock_conflict(exc: Exception) -> Optional[str]:
+    """'deadlock' / 'lock_wait_timeout' for InnoDB lock conflicts, else None."""
+    if not isinstance(exc, OperationalError) or not getattr(exc, "args", None):
+        return None
+    try:
+        return _LOCK_CONFLICT.get(int(exc.args[0]))
+    except (TypeError, ValueError):
+        return None
+
+# Process-wide counters for atomic_retry (see tx_retry_stats()).
+_tx_stats: Dict[str, int] = {"runs": 0, "retries": 0, "deadlock": 0, "lock_wait_timeout": 0, "gave_up": 0}
+_tx_stats_lock = threading.Lock()
+
+def _tx_count(**incr: int) -> None:
+    with _tx_stats_lock:
+        for k, v in incr.items():
+            _tx_stats[k] = _tx_stats.get(k, 0) + v
+
+def tx_retry_stats() -> Dict[str, int]:
+    """Snapshot of atomic_retry counters since process start."""
+    with _tx_stats_lock:
+        return dict(_tx_stats)
+
+
+def warm_up(aliases: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Load the schema snapshot of the OT aliases, so a fresh worker doesn't pay the
+    information_schema scan on its first request. Called from main/wsgi.py and
+    main/asgi.py. Connections are thread-local and this runs on the importing
+    thread, not a request thread, so the connection it needed is closed again
+    rather than left idle; request threads connect on first use as usual.
+    Failures are logged, never raised. Returns alias -> milliseconds spent.
+    """
+    timings: Dict[str, float] = {}
+    for alias in dict.fromkeys(aliases or (OT_DB_ALIAS, OT_DB_READ_ALIAS)):
+        if alias not in settings.DATABASES:
+            continue
+        t0 = time.perf_counter()
+        try:
+            SchemaCatalog.for_alias(alias).snapshot()
+        except Exception:
+            log.warning("DB warm-up failed for alias=%s", alias, exc_info=True)
+            continue
+        finally:
+            connections[alias].close()
+        timings[alias] = (time.perf_counter() - t0) * 1000.0
+    return timings
+
+# -------- concurrent gather --------
+# Worker threads each hold their own Django connection (connections are
+# thread-local), kept alive by CONN_MAX_AGE between gathers.
+_gather_pool: Optional[ThreadPoolExecutor] = None
+_gather_pool_lock = threading.Lock()
+
+def _gather_executor() -> ThreadPoolExecutor:
+    global _gather_pool
+    if _gather_pool is None:
+        with _gather_pool_lock:
+            if _gather_pool is None:
+                _gather_pool = ThreadPoolExecutor(max_workers=max(1, OT_DB_GATHER_WORKERS),
+                                                  thread_name_prefix="ot-db-gather")
+    return _gather_pool
+
+def _gather_worker(fn):
+    # Same connection hygiene Django applies around a request: drop connections
+    # that errored or outlived CONN_MAX_AGE, re-check health before reuse.
+    close_old_connections()
+    try:
+        return fn()
+    finally:
+        close_old_connections()
+
+# -------- bulk writes --------
+_DEFAULT_MAX_PACKET = 4 * 1024 * 1024      # MySQL 5.7 default; used when the server can't be asked
+_PACKET_HEADROOM = 0.75                     # fraction of max_allowed_packet a statement may use
+_MANY_GROUP = 16                            # same-shaped statements per executemany() call
+_max_packet_cache: Dict[str, int] = {}
+
+def _sql_size(v: Any) -> int:
+    """Rough upper bound of a value's length once the driver has escaped it into the statement."""
+    if v is None or isinstance(v, bool):
+        return 5
+    if isinstance(v, (int, float)):
+        return 24
+    if isinstance(v, (bytes, bytearray, memoryview)):
+        return 2 * len(v) + 10          # binary: worst case every byte escaped
+    return len(str(v).encode("utf-8")) + 2 + 4  # quotes + a little escaping slack
+
+def _bulk_columns(first: Any, columns: Optional[Sequence[str]]) -> List[str]:
+    if columns:
+        return list(columns)
+    if not isinstance(first, Mapping):
+        raise ValueError("columns= is required when rows are sequences")
+    return list(first.keys())
+
 @dataclass
 class PageMeta:
     page: int
@@ -156,6 +367,116 @@ class PageMeta:
     has_prev: bool
     has_next: bool
     start_index: int
+    total_is_estimate: bool = False
+
+@dataclass
+class SeekMeta:
+    """PageMeta-compatible meta for keyset pages; total/total_pages only when with_total is set (and known)."""
+    page: int
+    per_page: int
+    total: Optional[int]
+    total_pages: Optional[int]
+    has_prev: bool
+    has_next: bool
+    start_index: int
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+    total_is_estimate: bool = False
+
+_seek_key_re = re.compile(r"^\s*(?P<expr>.+?)(?:\s+(?P<dir>ASC|DESC))?\s*$", re.IGNORECASE)
+
+def _parse_seek_keys(keys: Sequence[Union[str, Sequence[str]]]) -> List[Tuple[str, bool]]:
+    """
+    Normalize seek keys to [(field, desc)].
+      "p.level DESC"            -> ("level", True)
+      ("p.name", "ASC")         -> ("name", False)
+      ("COALESCE(x,0)", "DESC", "x_or_zero") -> ("x_or_zero", True)
+    The field is the result-column name (table prefix dropped); it must be selected by the query.
+    """
+    out: List[Tuple[str, bool]] = []
+    for k in keys:
+        if isinstance(k, str):
+            m = _seek_key_re.match(k)
+            if not m:
+                raise ValueError(f"Bad seek key: {k!r}")
+            expr, direction, field = m.group("expr"), (m.group("dir") or "ASC"), None
+        else:
+            expr, direction, field = (list(k) + [None, None])[:3]
+            direction = direction or "ASC"
+        field = field or expr.rsplit(".", 1)[-1].strip("`")
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", field):
+            raise ValueError(f"Seek key {expr!r} needs a plain column alias")
+        out.append((field, direction.upper() == "DESC"))
+    if not out:
+        raise ValueError("seek pagination needs at least one key")
+    return out
+
+def _encode_cursor(values: Sequence[Any], direction: str, page: int) -> str:
+    raw = json.dumps({"v": list(values), "d": direction, "p": page}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(token: Optional[str], nkeys: int) -> Optional[Dict[str, Any]]:
+    """Return {"v": [...], "d": "n"|"p", "p": int} or None for a missing/garbled token."""
+    if not token:
+        return None
+    try:
+        pad = "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(token + pad).decode("utf-8"))
+        if len(data["v"]) != nkeys or data["d"] not in ("n", "p"):
+            return None
+        data["p"] = max(1, int(data.get("p") or 1))
+        return data
+    except Exception:
+        return None
+
+def _seek_predicate(keys: List[Tuple[str, bool]], values: Sequence[Any], forward: bool) -> Tuple[str, List[Any]]:
+    """Row-after-cursor predicate that works with mixed ASC/DESC keys."""
+    ors: List[str] = []
+    args: List[Any] = []
+    for i, (field, desc) in enumerate(keys):
+        ands = [f"sub.{f} = %s" for f, _ in keys[:i]]
+        args.extend(values[:i])
+        op = "<" if desc == forward else ">"
+        ands.append(f"sub.{field} {op} %s")
+        args.append(values[i])
+        ors.append("(" + " AND ".join(ands) + ")")
+    return "(" + " OR ".join(ors) + ")", args
+
+_ws_re = re.compile(r"\s+")
+
+def _query_key(prefix: str, alias: str, sql: str, args: Sequence[Any]) -> str:
+    """Stable cache key for a bound statement: whitespace-normalized SQL + args."""
+    norm = _ws_re.sub(" ", sql).strip()
+    raw = json.dumps([alias, norm, list(args)], separators=(",", ":"), default=str)
+    return f"{prefix}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+# -------- result cache (tag-versioned) --------
+# A cached result's key embeds the current version of each of its tags;
+# invalidate(tag) replaces the version, so every entry under that tag misses
+# from then on and simply ages out of the cache. Versions are random tokens,
+# not counters: the file cache's incr() is get+set and it culls keys, and a
+# counter that reset to 0 (or lost an increment) would bring old results back.
+# A missing version key just gets a fresh token, which nothing was cached under.
+_TAG_KEY = "ot_qtag:{tag}"
+
+def _new_tag_version() -> str:
+    return f"{time.time_ns():x}{random.getrandbits(32):08x}"
+
+def _tag_versions(tags: Sequence[str]) -> List[str]:
+    if not tags:
+        return []
+    keys = [_TAG_KEY.format(tag=t) for t in tags]
+    got = cache.get_many(keys)
+    for k in keys:
+        if k not in got:
+            cache.add(k, _new_tag_version(), timeout=None)
+            got[k] = cache.get(k) or _new_tag_version()
+    return [got[k] for k in keys]
+
+def invalidate(*tags: str) -> None:
+    """Evict every cached DB.run() result tagged with any of `tags`."""
+    for tag in dict.fromkeys(tags):
+        cache.set(_TAG_KEY.format(tag=tag), _new_tag_version(), timeout=None)
 
 # -------- main helper --------
 
@@ -164,8 +485,10 @@ class DB:
     One-stop DB helper.
 
     db.run(kind, sql, params, **opts)
-      kind: "select" | "select_one" | "scalar" | "execute" | "paginate"
+      kind: "select" | "select_one" | "scalar" | "execute" | "paginate" | "seek" | "iter"
       params: list/tuple OR dict using :named params in SQL.
+      "execute" and the builders write to `alias`; every other kind reads from
+      `read_alias` (the replica) unless inside atomic() or pinned after a write.
 
     Examples:
       rows = db.run("select", "SELECT * FROM players WHERE level >= :min", {"min": 8})
@@ -173,31 +496,110 @@ class DB:
       val  = db.run("scalar", "SELECT COUNT(*) FROM players")
       n    = db.run("execute", "UPDATE players SET level=level+1 WHERE name=:n", {"n":"Bob"})
       rows, meta = db.run("paginate", "SELECT * FROM players", {}, order_by="experience DESC", page=2, per_page=50)
+      rows, meta = db.run("seek", "SELECT * FROM players", {}, keys=("level DESC", "name ASC"), cursor=token)
+      for row in db.run("iter", "SELECT * FROM player_deaths", batch=5000): ...
+      recs = db.run("select", "SELECT pid, sid FROM player_items", row="record")  # also "tuple" | "columns"
+      rows = db.run("select", "SELECT * FROM guilds", cache_ttl=60, tags=("guilds",)); db.invalidate("guilds")
 
     Also has builder helpers:
       insert(table, data) -> int rowcount
+      insert_many(table, rows, chunk=500) / upsert_many(table, rows, update_cols=None) -> int rowcount
       update(table, data, where) -> int rowcount
       delete(table, where) -> int rowcount
       select(table, columns='*', where=None, order_by=None, limit=None, offset=None) -> rows
     """
-    def __init__(self, alias: Optional[str] = None, *, retries: int = 1, backoff: float = 0.25) -> None:
-        self.alias = alias or OT_DB_ALIAS
+    def __init__(
+        self,
+        alias: Optional[str] = None,
+        *,
+        read_alias: Optional[str] = None,
+        retries: int = 1,
+        backoff: float = 0.25,
+    ) -> None:
+        self.alias = alias or OT_DB_ALIAS                                   # primary: writes
+        self.read_alias = read_alias or (alias if alias else OT_DB_READ_ALIAS)  # replica: reads
         self.retries = max(0, int(retries))
         self.backoff = max(0.0, float(backoff))
 
+    def read_using(self) -> str:
+        """Alias for the next read: the replica, unless in a transaction or pinned after a write."""
+        if self.read_alias == self.alias or is_pinned():
+            return self.alias
+        if connections[self.alias].in_atomic_block:
+            return self.alias
+        return self.read_alias
+
     @contextmanager
-    def cursor(self):
-        cur = connections[self.alias].cursor()
+    def cursor(self, using: Optional[str] = None):
+        cur = connections[using or self.alias].cursor()
         try:
             yield cur
         finally:
             cur.close()
 
     @contextmanager
-    def atomic(self):
-        with transaction.atomic(using=self.alias):
+    def atomic(self, *, savepoint: bool = True):
+        with transaction.atomic(using=self.alias, savepoint=savepoint):
             yield self
 
+    def atomic_retry(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        attempts: Optional[int] = None,
+        backoff: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) in a transaction and replay the whole unit of work
+        when InnoDB picks it as a deadlock victim (1213) or a lock wait times out
+        (1205). Sleeps a full-jitter backoff between tries (uniform up to
+        backoff * 2**try, capped at 1s) so colliding bidders spread out.
+
+          hid = db.atomic_retry(place_bid, offer_id, acc, amount)
+
+        fn must be safe to rerun: everything it wrote is rolled back before a retry,
+        but side effects outside the DB are not. Nested inside another atomic block
+        it runs once, since only the outermost transaction can be replayed.
+        """
+        attempts = max(1, int(OT_TX_RETRY_ATTEMPTS if attempts is None else attempts))
+        backoff = OT_TX_RETRY_BACKOFF if backoff is None else max(0.0, float(backoff))
+        if connections[self.alias].in_atomic_block:
+            with self.atomic():
+                return fn(*args, **kwargs)
+
+        _tx_count(runs=1)
+        for attempt in range(1, attempts + 1):
+            try:
+                with self.atomic():
+                    return fn(*args, **kwargs)
+            except OperationalError as e:
+                reason = _lock_conflict(e)
+                if reason is None:
+                    raise
+                _tx_count(**{reason: 1})
+                if attempt >= attempts:
+                    _tx_count(gave_up=1)
+                    log.error("transaction %s gave up after %d attempts (%s)",
+                              getattr(fn, "__name__", fn), attempt, reason)
+                    raise
+                _tx_count(retries=1)
+                delay = random.uniform(0, min(1.0, backoff * (2 ** attempt)))
+                log.warning("transaction %s hit %s, retry %d/%d in %.0f ms",
+                            getattr(fn, "__name__", fn), reason, attempt, attempts - 1, delay * 1000)
+                with profiling.span("tx_retry"):
+                    time.sleep(delay)
+
+    def _can_retry(self, exc: Exception, alias: str) -> bool:
+        """
+        Statement-level retry policy. Inside a transaction InnoDB has already rolled
+        back (deadlock) or may hold partial work, so the error must reach the
+        outermost atomic_retry instead of re-running one statement.
+        """
+        if not _should_retry(exc):
+            return False
+        return not connections[alias].in_atomic_block
+
     # ---------- public: single entrypoint ----------
 
     def run(
@@ -209,64 +611,269 @@ class DB:
         order_by: str = "",
         page: int = 1,
         per_page: int = 25,
+        keys: Sequence[Union[str, Sequence[str]]] = (),
+        cursor: Optional[str] = None,
+        with_total: Union[bool, str] = False,
+        count_ttl: int = 0,
+        approx_over: int = 0,
+        batch: int = 1000,
+        row: str = "dict",
+        cache_ttl: int = 0,
+        tags: Sequence[str] = (),
     ):
         kind = kind.lower().strip()
+        if kind == "execute":
+            return self._execute(sql, params)
+        opts = dict(order_by=order_by, page=page, per_page=per_page, keys=keys, cursor=cursor,
+                    with_total=with_total, count_ttl=count_ttl, approx_over=approx_over, batch=batch, row=row)
+        if cache_ttl > 0 and kind != "iter":
+            return self._cached(kind, sql, params, opts, cache_ttl=cache_ttl, tags=tags)
+        return self._dispatch(kind, sql, params, opts)
+
+    def invalidate(self, *tags: str) -> None:
+        """
+        Drop cached results tagged with any of `tags`. Inside atomic() this waits
+        for the commit, so nobody re-caches the pre-commit rows under the new version.
+        """
+        transaction.on_commit(lambda: invalidate(*tags), using=self.alias)
+
+    def _cached(self, kind, sql, params, opts, *, cache_ttl: int, tags: Sequence[str]):
+        """
+        Opt-in result cache (run(..., cache_ttl=60, tags=("guilds",))). Keyed on the
+        bound SQL + args + run options + current tag versions. With a replica, skipped
+        while the request is pinned to the primary after a write, so writers see their
+        writes (single database: tag invalidation already covers that).
+        """
+        if self.read_alias != self.alias and is_pinned():
+            return self._dispatch(kind, sql, params, opts)
+        tags = tuple(tags)
+        bound_sql, args = _bind(sql, params)
+        shape = [kind, sorted((k, v) for k, v in opts.items() if k != "batch"), tags, _tag_versions(tags)]
+        key = _query_key("ot_q", self.alias, bound_sql, list(args) + [shape])
+        hit = cache.get(key)
+        if hit is not None:
+            return hit[0]
+        result = self._dispatch(kind, bound_sql, args, opts)
+        cache.set(key, (result,), cache_ttl)  # boxed so None/empty results cache too
+        return result
+
+    def _dispatch(self, kind: str, sql: str, params: Params, opts: Dict[str, Any]):
+        order_by, page, per_page = opts["order_by"], opts["page"], opts["per_page"]
+        keys, cursor, with_total = opts["keys"], opts["cursor"], opts["with_total"]
+        count_ttl, approx_over, batch, row = opts["count_ttl"], opts["approx_over"], opts["batch"], opts["row"]
+        using = self.read_using()
         if kind == "paginate":
-            return self._paginate(sql, params, order_by=order_by, page=page, per_page=per_page)
+            return self._paginate(sql, params, order_by=order_by, page=page, per_page=per_page,
+                                  count_ttl=count_ttl, approx_over=approx_over, row=row, using=using)
+        if kind == "seek":
+            return self._seek(sql, params, keys=keys, cursor=cursor, per_page=per_page, with_total=with_total,
+                              count_ttl=count_ttl, approx_over=approx_over, using=using)
         if kind == "select":
-            return self._select(sql, params)
+            return self._select(sql, params, row=row, using=using)
         if kind == "select_one":
-            return self._select_one(sql, params)
+            return self._select_one(sql, params, row=row, using=using)
         if kind == "scalar":
-            return self._scalar(sql, params)
-        if kind == "execute":
-            return self._execute(sql, params)
+            return self._scalar(sql, params, using=using)
+        if kind == "iter":
+            return self._iter(sql, params, batch=batch, row=row, using=using)
         raise ValueError(f"Unknown kind: {kind}")
 
+    # ---------- concurrent independent queries ----------
+
+    def gather(
+        self,
+        tasks: Mapping[str, Union[Tuple[Any, ...], Callable[[], Any]]],
+        *,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run independent reads concurrently and return {name: result}.
+        A task is (kind, sql[, params[, opts]]) for run(), or any zero-arg callable
+        (e.g. a status-port query). One task runs in the calling thread, the rest on
+        a shared thread pool (OT_DB_GATHER_WORKERS), each with its own connection;
+        page latency becomes roughly the slowest task rather than the sum.
+
+          res = db.gather({
+              "player": ("select_one", "SELECT * FROM players WHERE name=:n", {"n": name}),
+              "deaths": ("select", "SELECT ... WHERE player_id=:id", {"id": pid}),
+          })
+
+        Inside atomic() the tasks run sequentially on the transaction's connection.
+        With return_exceptions=True a failing task's exception is returned as its
+        result instead of being raised.
+        """
+        calls = {name: self._gather_call(task) for name, task in tasks.items()}
+        if not calls:
+            return {}
+        if len(calls) == 1 or connections[self.alias].in_atomic_block:
+            return {name: self._gather_one(fn, return_exceptions) for name, fn in calls.items()}
+
+        names = list(calls)
+        pool = _gather_executor()
+        futures = {
+            name: pool.submit(copy_context().run, _gather_worker, calls[name])
+            for name in names[1:]
+        }
+        out = {names[0]: self._gather_one(calls[names[0]], True)}
+        for name, fut in futures.items():
+            try:
+                out[name] = fut.result()
+            except Exception as e:
+                out[name] = e
+        results = {name: out[name] for name in names}
+        if not return_exceptions:
+            for res in results.values():
+                if isinstance(res, Exception):
+                    raise res
+        return results
+
+    async def agather(self, tasks, *, return_exceptions: bool = False) -> Dict[str, Any]:
+        """gather() for async views (ASGI)."""
+        return await sync_to_async(self.gather)(tasks, return_exceptions=return_exceptions)
+
+    def _gather_call(self, task) -> Callable[[], Any]:
+        if callable(task):
+            return task
+        if not isinstance(task, (list, tuple)) or not 2 <= len(task) <= 4:
+            raise TypeError("gather task must be a callable or (kind, sql[, params[, opts]])")
+        kind, sql = task[0], task[1]
+        params = task[2] if len(task) > 2 else None
+        opts = task[3] if len(task) > 3 else {}
+        if str(kind).lower().strip() in ("execute", "iter"):
+            raise ValueError(f"gather runs reads only, not {kind!r}")
+        return lambda: self.run(kind, sql, params, **opts)
+
+    @staticmethod
+    def _gather_one(fn: Callable[[], Any], return_exceptions: bool) -> Any:
+        try:
+            return fn()
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
     # ---------- core ops (with retry & binding) ----------
 
-    def _execute(self, sql: str, params: Params = None) -> int:
+    def _execute(self, sql: str, params: Params = None, *, lastrowid: bool = False) -> int:
+        """Run a write; returns rowcount (or the AUTO_INCREMENT id with lastrowid=True)."""
         sql2, args = _bind(sql, params)
         attempt = 0
+        t0 = time.perf_counter()
         while True:
             try:
                 with self.cursor() as cur:
                     cur.execute(sql2, args)
-                    return cur.rowcount
+                    n = cur.rowcount
+                    new_id = cur.lastrowid
+                _mark_write()
+                profiling.record(sql2, time.perf_counter() - t0, n, attempt, self.alias)
+                return int(new_id) if lastrowid else n
             except Exception as e:
-                if attempt < self.retries and _should_retry(e):
+                if attempt < self.retries and self._can_retry(e, self.alias):
                     attempt += 1; time.sleep(self.backoff * attempt); continue
+                profiling.record(sql2, time.perf_counter() - t0, 0, attempt, self.alias, error=True)
                 raise
 
-    def _select(self, sql: str, params: Params = None) -> List[Dict[str, Any]]:
+    def _select(self, sql: str, params: Params = None, *, row: str = "dict", using: Optional[str] = None) -> List[Dict[str, Any]]:
         sql2, args = _bind(sql, params)
+        factory = _row_factory(row)
+        using = using or self.alias
         attempt = 0
+        t0 = time.perf_counter()
         while True:
             try:
-                with self.cursor() as cur:
+                with self.cursor(using) as cur:
                     cur.execute(sql2, args)
-                    return _rows_as_dicts(cur)
+                    rows = factory(cur)
+                profiling.record(sql2, time.perf_counter() - t0, _row_count(rows), attempt, using)
+                return rows
             except Exception as e:
-                if attempt < self.retries and _should_retry(e):
+                if attempt < self.retries and self._can_retry(e, using):
                     attempt += 1; time.sleep(self.backoff * attempt); continue
+                profiling.record(sql2, time.perf_counter() - t0, 0, attempt, using, error=True)
                 raise
 
-    def _select_one(self, sql: str, params: Params = None, default: Any = None) -> Any:
-        rows = self._select(sql, params)
+    def _iter(
+        self, sql: str, params: Params = None, *, batch: int = 1000, row: str = "dict", using: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rows through an unbuffered (server-side) cursor, `batch` rows per fetch,
+        so memory stays flat on huge tables. Transient errors are retried until the
+        first row is yielded; after that they propagate.
+        The connection is busy until the generator is exhausted or closed: don't issue
+        other queries on the same alias while iterating.
+        """
+        sql2, args = _bind(sql, params)
+        batch = max(1, int(batch))
+        if row not in ("dict", "tuple", "record"):
+            raise ValueError(f"iter supports dict/tuple/record rows, not {row!r}")
+        using = using or self.alias
+        conn = connections[using]
+        attempt = 0
+        t0 = time.perf_counter()
+        while True:
+            cur = None
+            try:
+                with conn.wrap_database_errors:
+                    conn.ensure_connection()
+                    cur = _stream_cursor(conn)
+                    cur.execute(sql2, args)
+                    cols = [c[0] for c in (cur.description or [])]
+                    rows = cur.fetchmany(batch)
+                break
+            except Exception as e:
+                if cur is not None:
+                    try: cur.close()
+                    except Exception: pass
+                if attempt < self.retries and self._can_retry(e, using):
+                    attempt += 1; time.sleep(self.backoff * attempt); continue
+                profiling.record(sql2, time.perf_counter() - t0, 0, attempt, using, error=True)
+                raise
+
+        make = None
+        if row == "record":
+            make = _record_class(tuple(cols))   # None -> dict rows
+        elif row == "tuple":
+            make = tuple
+        if make is None:
+            make = lambda values: dict(zip(cols, values))
+        count = 0
+        try:
+            while rows:
+                for values in rows:
+                    yield make(values)
+                count += len(rows)
+                with conn.wrap_database_errors:
+                    rows = cur.fetchmany(batch)
+        finally:
+            with conn.wrap_database_errors:
+                cur.close()
+            profiling.record(sql2, time.perf_counter() - t0, count, attempt, using)
+
+    def _select_one(
+        self, sql: str, params: Params = None, default: Any = None, *, row: str = "dict", using: Optional[str] = None,
+    ) -> Any:
+        if row == "columns":
+            raise ValueError("select_one has no columnar form")
+        rows = self._select(sql, params, row=row, using=using)
         return rows[0] if rows else default
 
-    def _scalar(self, sql: str, params: Params = None, default: Any = None) -> Any:
+    def _scalar(self, sql: str, params: Params = None, default: Any = None, *, using: Optional[str] = None) -> Any:
         sql2, args = _bind(sql, params)
+        using = using or self.alias
         attempt = 0
+        t0 = time.perf_counter()
         while True:
             try:
-                with self.cursor() as cur:
+                with self.cursor(using) as cur:
                     cur.execute(sql2, args)
                     row = cur.fetchone()
+                profiling.record(sql2, time.perf_counter() - t0, 1 if row else 0, attempt, using)
                 return (row[0] if row else default)
             except Exception as e:
-                if attempt < self.retries and _should_retry(e):
+                if attempt < self.retries and self._can_retry(e, using):
                     attempt += 1; time.sleep(self.backoff * attempt); continue
+                profiling.record(sql2, time.perf_counter() - t0, 0, attempt, using, error=True)
                 raise
 
     def _paginate(
@@ -277,48 +884,195 @@ class DB:
         order_by: str = "",
         page: int = 1,
         per_page: int = 25,
+        count_ttl: int = 0,
+        approx_over: int = 0,
+        row: str = "dict",
+        using: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], PageMeta]:
+        """
+        OFFSET pagination. Options for the total:
+          count_ttl:   cache the total for this exact bound SQL + args (seconds; 0 = off)
+          approx_over: if the planner estimates more rows than this, use the estimate
+                       instead of a COUNT(*) scan (meta["total_is_estimate"] = True)
+        """
         page = max(1, int(page))
         per_page = max(1, int(per_page))
 
         # Bind once for the COUNT subquery (same params).
         base_bound_sql, base_args = _bind(base_sql, params)
 
-        total = self._scalar(f"SELECT COUNT(*) FROM ({base_bound_sql}) sub", base_args, default=0)
+        total, estimated = self._count(base_bound_sql, base_args, count_ttl=count_ttl, approx_over=approx_over,
+                                       using=using)
         offset = (page - 1) * per_page
 
         sql = base_bound_sql
         if order_by:
             sql += f" ORDER BY {order_by}"
         sql += " LIMIT %s OFFSET %s"
-        rows = self._select(sql, list(base_args) + [per_page, offset])
+        rows = self._select(sql, list(base_args) + [per_page, offset], row=row, using=using)
 
         total_pages = max(1, (total + per_page - 1) // per_page)
         meta = PageMeta(
             page=page, per_page=per_page, total=total, total_pages=total_pages,
-            has_prev=page > 1, has_next=page < total_pages, start_index=offset + 1
+            has_prev=page > 1, has_next=page < total_pages, start_index=offset + 1,
+            total_is_estimate=estimated,
         )
         return rows, meta.__dict__
-    
+
+    def _count(
+        self,
+        bound_sql: str,
+        args: Sequence[Any],
+        *,
+        count_ttl: int = 0,
+        approx_over: int = 0,
+        estimate_only: bool = False,
+        using: Optional[str] = None,
+    ) -> Tuple[Optional[int], bool]:
+        """
+        Total rows of an already-bound query -> (total, is_estimate).
+        `estimate_only`: never run COUNT(*); (None, True) if the planner has no estimate.
+        """
+        prefix = "ot_count_est" if estimate_only else "ot_count"
+        key = _query_key(prefix, self.alias, bound_sql, args) if count_ttl > 0 else None
+        if key:
+            hit = cache.get(key)
+            if hit is not None:
+                return (None if hit[0] is None else int(hit[0])), bool(hit[1])
+
+        total, estimated = None, False
+        if estimate_only:
+            total, estimated = self._estimate_rows(bound_sql, args, using=using), True
+        elif approx_over > 0:
+            guess = self._estimate_rows(bound_sql, args, using=using)
+            if guess is not None and guess > approx_over:
+                total, estimated = guess, True
+        if total is None and not estimate_only:
+            total = int(self._scalar(f"SELECT COUNT(*) FROM ({bound_sql}) sub", list(args), default=0, using=using) or 0)
+
+        if key:
+            cache.set(key, (total, estimated), count_ttl)
+        return total, estimated
+
+    def _estimate_rows(self, bound_sql: str, args: Sequence[Any], *, using: Optional[str] = None) -> Optional[int]:
+        """
+        Planner row estimate for a query: product of EXPLAIN rows*filtered over the
+        join plan; plain table scans fall back to information_schema.TABLE_ROWS.
+        Returns None when no estimate is available.
+        """
+        try:
+            plan = self._select(f"EXPLAIN {bound_sql}", list(args), using=using)
+        except Exception:
+            return None
+        est = 1.0
+        for step in plan:
+            step = {k.lower(): v for k, v in step.items()}
+            rows = step.get("rows")
+            if rows is None:
+                table = step.get("table") or ""
+                real = self.schema.tables.get(table.lower())
+                if not real:
+                    continue
+                rows = self._scalar(
+                    "SELECT TABLE_ROWS FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = %s", [real[0]], using=using)
+                if rows is None:
+                    continue
+            filtered = float(step.get("filtered") or 100.0)
+            est *= max(1.0, float(rows) * filtered / 100.0)
+        return int(est) if plan else None
+
+    def _seek(
+        self,
+        base_sql: str,
+        params: Params = None,
+        *,
+        keys: Sequence[Union[str, Sequence[str]]],
+        cursor: Optional[str] = None,
+        per_page: int = 25,
+        with_total: Union[bool, str] = False,
+        count_ttl: int = 0,
+        approx_over: int = 0,
+        using: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Keyset pagination: every page is an index range scan of per_page+1 rows,
+        however deep it is. `keys` must make the order total (end with a unique column).
+        with_total=True adds a COUNT (see approx_over); with_total="estimate" only the
+        planner's row estimate, so the page stays index-only (total None if unknown).
+        Returns (rows, SeekMeta.__dict__); pass meta["next_cursor"]/["prev_cursor"] back as `cursor`.
+        """
+        per_page = max(1, int(per_page))
+        seek_keys = _parse_seek_keys(keys)
+        state = _decode_cursor(cursor, len(seek_keys))
+        forward = state is None or state["d"] == "n"
+        page = state["p"] if state else 1
+
+        base_bound_sql, base_args = _bind(base_sql, params)
+        sql = f"SELECT * FROM ({base_bound_sql}) sub"
+        args = list(base_args)
+        if state:
+            pred, pred_args = _seek_predicate(seek_keys, state["v"], forward)
+            sql += f" WHERE {pred}"
+            args += pred_args
+        order = []
+        for field, desc in seek_keys:
+            order.append(f"sub.{field} {'DESC' if desc == forward else 'ASC'}")
+        sql += " ORDER BY " + ", ".join(order) + " LIMIT %s"
+        rows = self._select(sql, args + [per_page + 1], using=using)
+
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        if forward:
+            has_prev, has_next = state is not None, more
+        else:
+            rows.reverse()
+            has_prev, has_next = more, True
+        if has_prev and page <= 1:
+            page = 2  # cursor lost its page hint; keep links sane
+        elif not has_prev:
+            page = 1
+
+        def key_of(row):
+            return [row[f] for f, _ in seek_keys]
+
+        total = total_pages = None
+        estimated = False
+        if with_total:
+            total, estimated = self._count(base_bound_sql, base_args, count_ttl=count_ttl, approx_over=approx_over,
+                                           estimate_only=with_total == "estimate", using=using)
+            if total is not None:
+                # an estimate can undershoot; never claim fewer pages than we can see
+                total_pages = max(1, (total + per_page - 1) // per_page, page + has_next)
+
+        meta = SeekMeta(
+            page=page, per_page=per_page, total=total, total_pages=total_pages,
+            has_prev=has_prev, has_next=has_next, start_index=(page - 1) * per_page + 1,
+            next_cursor=_encode_cursor(key_of(rows[-1]), "n", page + 1) if (rows and has_next) else None,
+            prev_cursor=_encode_cursor(key_of(rows[0]), "p", page - 1) if (rows and has_prev) else None,
+            total_is_estimate=estimated,
+        )
+        return rows, meta.__dict__
+
+    # ---------- schema (served from the process-wide SchemaCatalog) ----------
+
+    @property
+    def schema(self) -> SchemaSnapshot:
+        return SchemaCatalog.for_alias(self.alias).snapshot()
+
+    def refresh_schema(self) -> SchemaSnapshot:
+        return SchemaCatalog.for_alias(self.alias).refresh()
+
     def _table_exists(self, name: str) -> bool:
-        return bool(self.run(
-        "scalar",
-        "SELECT COUNT(*) FROM information_schema.tables "
-        "WHERE table_schema = DATABASE() AND table_name = :t",
-        {"t": name}
-    ))
+        return self.schema.has_table(name)
 
     def _columns(self, name: str) -> List[str]:
-        rows = self.run("select", f"SHOW COLUMNS FROM {name}")
-        return [r["Field"] for r in rows]
+        if not self.schema.has_table(name):
+            raise ValueError(f"Unknown table: {name}")
+        return list(self.schema.columns(name))
 
     def _has_column(self, table: str, col: str) -> bool:
-        return bool(self.run(
-            "scalar",
-            "SELECT COUNT(*) FROM information_schema.columns "
-            "WHERE table_schema = DATABASE() AND table_name = :t AND column_name = :c",
-            {"t": table, "c": col}
-        ))
+        return self.schema.has_column(table, col)
 
     def _detect_depot_schema(self):
         """
@@ -412,6 +1166,166 @@ class DB:
         return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
 
 
+    # ---------- coins wallet (coins_wallet / coins_ledger / bazaar_holds) ----------
+    #
+    # Balance checks are part of the UPDATE itself (WHERE balance >= amount), so
+    # there is no read-then-write window and each wallet row is locked by exactly
+    # one statement. Ledger rows for one operation go out as one multi-row INSERT.
+    # Inner blocks use atomic(savepoint=False): no SAVEPOINT round trips when a
+    # caller (e.g. a bazaar bid under atomic_retry) already owns the transaction.
+
+    def wallet_ensure(self, account_id: int) -> None:
+        now = _now()
+        self.run("execute",
+            "INSERT INTO coins_wallet (account_id,balance,created_at,updated_at) "
+            "VALUES (%s,0,%s,%s) ON DUPLICATE KEY UPDATE updated_at=VALUES(updated_at)",
+            [account_id, now, now])
+
+    def wallet_balance(self, account_id: int) -> int:
+        row = self.run("select_one", "SELECT balance FROM coins_wallet WHERE account_id=%s", [account_id])
+        if not row:
+            return 0
+        return int(row["balance"])
+
+    def wallet_credit(self, account_id: int, amount: int, kind: str = "credit", ref: str = None, note: str = None) -> None:
+        """Add coins (creates the wallet row on first use). 2 statements."""
+        amount = _coins(amount)
+        now = _now()
+        with self.atomic(savepoint=False):
+            self._wallet_add([(account_id, amount)], now)
+            self._ledger([(account_id, amount, kind, ref, note)], now)
+
+    def wallet_debit(self, account_id: int, amount: int, kind: str = "debit", ref: str = None, note: str = None) -> None:
+        """Take coins or raise ValueError("Insufficient coins"); nothing is written then. 2 statements."""
+        amount = _coins(amount)
+        now = _now()
+        with self.atomic(savepoint=False):
+            self._wallet_take(account_id, amount, now)
+            self._ledger([(account_id, -amount, kind, ref, note)], now)
+
+    def wallet_delta(self, account_id: int, delta: int, kind: str, ref: str = None, note: str = None) -> None:
+        """Signed form of wallet_credit / wallet_debit."""
+        if delta < 0:
+            self.wallet_debit(account_id, -int(delta), kind, ref=ref, note=note)
+        elif delta > 0:
+            self.wallet_credit(account_id, int(delta), kind, ref=ref, note=note)
+
+    def wallet_transfer(
+        self,
+        from_account: int,
+        to_account: int,
+        amount: int,
+        *,
+        kind_out: str = "debit",
+        kind_in: str = "credit",
+        ref: str = None,
+        note: str = None,
+    ) -> None:
+        """
+        Move coins between accounts in one transaction (3 statements). Raises
+        ValueError("Insufficient coins") if the sender can't cover it. Wallet rows
+        are locked in account-id order so opposite transfers can't deadlock.
+        """
+        amount = _coins(amount)
+        if from_account == to_account:
+            raise ValueError("Cannot transfer to the same account")
+        now = _now()
+        with self.atomic(savepoint=False):
+            if from_account < to_account:
+                self._wallet_take(from_account, amount, now)
+                self._wallet_add([(to_account, amount)], now)
+            else:
+                self._wallet_add([(to_account, amount)], now)
+                self._wallet_take(from_account, amount, now)
+            self._ledger([
+                (from_account, -amount, kind_out, ref, note),
+                (to_account, amount, kind_in, ref, note),
+            ], now)
+
+    def hold_create(self, offer_id: int, account_id: int, amount: int) -> int:
+        """Create an active hold: debit coins from bidder and park them on the offer."""
+        amount = _coins(amount)
+        now = _now()
+        ref = f"offer:{offer_id}"
+        with self.atomic(savepoint=False):
+            self._wallet_take(account_id, amount, now)
+            hold_id = self._execute(
+                "INSERT INTO bazaar_holds (offer_id, account_id, amount, active, created_at) "
+                "VALUES (%s,%s,%s,1,%s)", [offer_id, account_id, amount, now], lastrowid=True)
+            self._ledger([(account_id, -amount, "hold", ref, None)], now)
+            return hold_id
+
+    def hold_get_active(self, offer_id: int):
+        return self.run("select_one",
+            "SELECT * FROM bazaar_holds WHERE offer_id=%s AND active=1", [offer_id])
+
+    def hold_release(self, hold_id: int) -> None:
+        """Release an active hold back to the bidder."""
+        now = _now()
+        with self.atomic(savepoint=False):
+            hold = self._hold_close(hold_id, now)
+            if not hold:  # nothing to do
+                return
+            amount = int(hold["amount"])
+            self._wallet_add([(hold["account_id"], amount)], now)
+            self._ledger([(hold["account_id"], amount, "release", f"offer:{hold['offer_id']}", None)], now)
+
+    def hold_settle_to_seller(self, hold_id: int, seller_account_id: int, *, fee_bps: int = 0, fee_account_id: int = 1) -> None:
+        """
+        Move the held amount to the seller (minus fee). Marks hold inactive.
+        fee_bps = basis points (100 = 1%).
+        """
+        now = _now()
+        with self.atomic(savepoint=False):
+            hold = self._hold_close(hold_id, now)
+            if not hold:
+                return
+            amount = int(hold["amount"])
+            fee = (amount * int(fee_bps)) // 10_000 if fee_bps > 0 else 0
+            net = amount - fee
+            ref = f"offer:{hold['offer_id']}"
+            credits = [(seller_account_id, net)]
+            ledger = [(seller_account_id, net, "settle", ref, None)]
+            if fee > 0:
+                credits.append((fee_account_id, fee))
+                ledger.append((fee_account_id, fee, "fee", ref, None))
+            self._wallet_add(credits, now)
+            self._ledger(ledger, now)
+
+    def _hold_close(self, hold_id: int, now: int) -> Optional[Dict[str, Any]]:
+        """Lock an active hold and mark it inactive; returns the hold row or None."""
+        hold = self.run("select_one",
+            "SELECT id, offer_id, account_id, amount FROM bazaar_holds WHERE id=%s AND active=1 FOR UPDATE",
+            [hold_id])
+        if not hold:
+            return None
+        self._execute("UPDATE bazaar_holds SET active=0, released_at=%s WHERE id=%s", [now, hold_id])
+        return hold
+
+    def _wallet_take(self, account_id: int, amount: int, now: int) -> None:
+        n = self._execute(
+            "UPDATE coins_wallet SET balance=balance-%s, updated_at=%s "
+            "WHERE account_id=%s AND balance>=%s",
+            [amount, now, account_id, amount])
+        if not n:
+            raise ValueError("Insufficient coins")
+        self.invalidate(f"wallet:{account_id}")
+
+    def _wallet_add(self, credits: Sequence[Tuple[int, int]], now: int) -> None:
+        # one upsert for every account being credited
+        self._execute(
+            "INSERT INTO coins_wallet (account_id,balance,created_at,updated_at) VALUES "
+            + ", ".join(["(%s,%s,%s,%s)"] * len(credits))
+            + " ON DUPLICATE KEY UPDATE balance=balance+VALUES(balance), updated_at=VALUES(updated_at)",
+            [v for acc, amt in credits for v in (acc, amt, now, now)])
+        self.invalidate(*(f"wallet:{acc}" for acc, _ in credits))
+
+    def _ledger(self, rows: Sequence[Tuple[int, int, str, Optional[str], Optional[str]]], now: int) -> None:
+        self._execute(
+            "INSERT INTO coins_ledger (account_id, delta, kind, ref, note, created_at) VALUES "
+            + ", ".join(["(%s,%s,%s,%s,%s,%s)"] * len(rows)),
+            [v for r in rows for v in (*r, now)])
+
     # ---------- convenience builders (optional) ----------
 
     def insert(self, table: str, data: Mapping[str, Any]) -> int:
@@ -420,6 +1334,143 @@ class DB:
         sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
         return self._execute(sql, [data[c] for c in cols])
 
+    def insert_many(
+        self,
+        table: str,
+        rows: Iterable[Union[Mapping[str, Any], Sequence[Any]]],
+        *,
+        columns: Optional[Sequence[str]] = None,
+        chunk: int = 500,
+        ignore: bool = False,
+    ) -> int:
+        """
+        Multi-row INSERT: rows are packed into `INSERT ... VALUES (..),(..),...`
+        statements of at most `chunk` rows (and under max_allowed_packet), and
+        same-shaped statements go to the driver in one executemany() call.
+        Rows are dicts (columns taken from the first one) or sequences with `columns=`.
+        Runs in one transaction; returns the summed rowcount.
+        """
+        verb = "INSERT IGNORE" if ignore else "INSERT"
+        return self._write_many(verb, table, rows, columns=columns, chunk=chunk)
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: Iterable[Union[Mapping[str, Any], Sequence[Any]]],
+        *,
+        update_cols: Optional[Union[Sequence[str], Mapping[str, str]]] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk: int = 500,
+    ) -> int:
+        """
+        Multi-row INSERT ... ON DUPLICATE KEY UPDATE.
+          update_cols=None           -> overwrite every inserted column
+          update_cols=["a", "b"]     -> a=VALUES(a), b=VALUES(b)
+          update_cols={"n": "n+VALUES(n)"} -> raw expressions
+        Returns MySQL's affected rows (1 per insert, 2 per changed row, 0 per no-op).
+        """
+        def suffix(cols: List[str]) -> str:
+            if isinstance(update_cols, Mapping):
+                sets = [f"{c}={expr}" for c, expr in update_cols.items()]
+            else:
+                sets = [f"{c}=VALUES({c})" for c in (update_cols or cols)]
+            if not sets:
+                raise ValueError("upsert_many needs at least one column to update")
+            return " ON DUPLICATE KEY UPDATE " + ", ".join(sets)
+        return self._write_many("INSERT", table, rows, columns=columns, chunk=chunk, suffix=suffix)
+
+    def _write_many(self, verb, table, rows, *, columns=None, chunk=500, suffix=None) -> int:
+        it = iter(rows)
+        first = next(it, None)
+        if first is None:
+            return 0
+        cols = _bulk_columns(first, columns)
+        ncols = len(cols)
+        if not ncols:
+            raise ValueError("rows have no columns")
+        by_name = isinstance(first, Mapping)
+
+        conn = connections[self.alias]
+        max_params = getattr(conn.features, "max_query_params", None) or 65535
+        chunk = max(1, min(int(chunk), max_params // ncols))
+        head = f"{verb} INTO {table} ({', '.join(cols)}) VALUES "
+        tail = suffix(cols) if suffix else ""
+        one = "(" + ", ".join(["%s"] * ncols) + ")"
+        budget = int(self._max_packet() * _PACKET_HEADROOM) - len(head) - len(tail)
+
+        total = 0
+        group: List[List[Any]] = []     # flattened args of statements sharing one SQL text
+        group_n = 0
+
+        def flush_group() -> None:
+            nonlocal total, group, group_n
+            if group:
+                sql = head + ", ".join([one] * group_n) + tail
+                total += self._execute_many(sql, group)
+                group, group_n = [], 0
+
+        def emit(args: List[Any], n: int) -> None:
+            nonlocal group_n
+            if group and (n != group_n or len(group) >= _MANY_GROUP):
+                flush_group()
+            group.append(args)
+            group_n = n
+
+        with self.atomic():
+            args: List[Any] = []
+            n = size = 0
+            for r in chain((first,), it):
+                if by_name:
+                    try:
+                        vals = [r[c] for c in cols]
+                    except KeyError as e:
+                        raise ValueError(f"row is missing column {e.args[0]!r}") from None
+                else:
+                    vals = list(r)
+                    if len(vals) != ncols:
+                        raise ValueError(f"row has {len(vals)} values, expected {ncols}")
+                rsize = sum(_sql_size(v) for v in vals) + 2 * ncols + 4
+                if n and (n >= chunk or size + rsize > budget):
+                    emit(args, n)
+                    args, n, size = [], 0, 0
+                args.extend(vals)
+                n += 1
+                size += rsize
+            if n:
+                emit(args, n)
+            flush_group()
+        return total
+
+    def _execute_many(self, sql: str, seq_args: List[List[Any]]) -> int:
+        attempt = 0
+        t0 = time.perf_counter()
+        while True:
+            try:
+                with self.cursor() as cur:
+                    cur.executemany(sql, seq_args)
+                    n = cur.rowcount
+                _mark_write()
+                profiling.record(sql, time.perf_counter() - t0, n, attempt, self.alias)
+                return max(0, n)
+            except Exception as e:
+                if attempt < self.retries and self._can_retry(e, self.alias):
+                    attempt += 1; time.sleep(self.backoff * attempt); continue
+                profiling.record(sql, time.perf_counter() - t0, 0, attempt, self.alias, error=True)
+                raise
+
+    def _max_packet(self) -> int:
+        """Server max_allowed_packet for this alias, asked once per process."""
+        size = _max_packet_cache.get(self.alias)
+        if size is None:
+            size = _DEFAULT_MAX_PACKET
+            if connections[self.alias].vendor == "mysql":
+                try:
+                    size = int(self._scalar("SELECT @@max_allowed_packet") or size)
+                except Exception:
+                    pass
+            _max_packet_cache[self.alias] = size
+        return size
+
     def update(self, table: str, data: Mapping[str, Any], where: Mapping[str, Any]) -> int:
         set_sql = ", ".join([f"{k}=%s" for k in data.keys()])
         w_sql, w_args = self._where_clause(where)
@@ -1,14 +1,24 @@
+from django.conf import settings
+
+from .db import is_pinned
+
+
 class OTServRouter:
     app_label = "otdata"  # choose an app label for your OT models
 
     def db_for_read(self, model, **hints):
-        return "retrowar" if model._meta.app_label == self.app_label else None
+        if model._meta.app_label != self.app_label:
+            return None
+        # same replica/primary choice as DB.read_using()
+        write_alias = getattr(settings, "OT_DB_ALIAS", "default")
+        read_alias = getattr(settings, "OT_DB_READ_ALIAS", write_alias)
+        return write_alias if is_pinned() else read_alias
 
     def db_for_write(self, model, **hints):
         # usually read-only; keep writes off unless you intend to edit OT DB
-        return "retrowar" if model._meta.app_label == self.app_label else None
+        return getattr(settings, "OT_DB_ALIAS", "default") if model._meta.app_label == self.app_label else None
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
         if app_label == self.app_label:
-            return db == "retrowar"
+            return db == getattr(settings, "OT_DB_ALIAS", "default")
         return db == "default"
@@ -15,10 +15,17 @@ class Command(BaseCommand):
         db = DB()
         now = int(time())
         ended = db.run("select",
-            "SELECT * FROM bazaar_offers WHERE status='active' AND end_time<=%s", [now])
+            "SELECT id FROM bazaar_offers WHERE status='active' AND end_time<=%s", [now])
         closed = 0
 
-        for o in ended:
+        def close(offer_id):
+            # re-read on the primary under a row lock: the list above may come from a
+            # lagging replica, and a late bid may have landed since
+            o = db.run("select_one",
+                "SELECT * FROM bazaar_offers WHERE id=%s AND status='active' AND end_time<=%s FOR UPDATE",
+                [offer_id, now])
+            if not o:
+                return False
             active = db.hold_get_active(o["id"])
             if o["current_bidder_account_id"] and active:
                 # sold -> settle to seller
@@ -34,6 +41,12 @@ class Command(BaseCommand):
                 db.run("execute",
                     "UPDATE bazaar_offers SET status='expired', updated_at=%s WHERE id=%s",
                     [now, o["id"]])
-            closed += 1
+            db.invalidate("bazaar", f"bazaar:{o['id']}")
+            return True
+
+        for o in ended:
+            # settle + status flip commit together, replayed on deadlock with a late bid
+            if db.atomic_retry(close, o["id"]):
+                closed += 1
 
         self.stdout.write(f"Closed {closed} auctions.")
\ No newline at end of file
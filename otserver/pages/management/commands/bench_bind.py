@@ -0,0 +1,82 @@
+# pages/management/commands/bench_bind.py
+import ast
+import re
+import timeit
+from pathlib import Path
+from typing import Any, List, Mapping, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.db import _bind, _compile_named, _named_re
+
+SQL_HINT = re.compile(r"\b(SELECT|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def _bind_uncached(sql: str, params) -> Tuple[str, List[Any]]:
+    """The previous _bind: regex rewrite with a closure on every call."""
+    if params is None:
+        return sql, []
+    if isinstance(params, (list, tuple)):
+        return sql, list(params)
+    if isinstance(params, Mapping):
+        names: List[str] = []
+        def repl(m: re.Match) -> str:
+            names.append(m.group(1))
+            return "%s"
+        sql2 = _named_re.sub(repl, sql)
+        return sql2, [params[name] for name in names]
+    raise TypeError("params must be list/tuple/dict/None")
+
+
+def _view_queries(root: Path) -> List[str]:
+    """Static SQL string literals used by pages/views*.py."""
+    out = []
+    for path in sorted(root.glob("views*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and SQL_HINT.search(node.value):
+                out.append(node.value)
+    return out
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark named-parameter binding (old regex path vs memoized templates) on the views' SQL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=20000, help="Calls per query per path.")
+
+    def handle(self, *args, **opts):
+        number = opts["number"]
+        queries = _view_queries(Path(__file__).resolve().parents[2])
+        named = [q for q in queries if _named_re.search(q)]
+        if not named:
+            self.stdout.write("No named-parameter queries found.")
+            return
+
+        cases = []
+        for q in named:
+            params = {n: 1 for n in _named_re.findall(q)}
+            if _bind(q, params) != _bind_uncached(q, params):
+                raise CommandError(f"cached and uncached binding differ for:\n{q}")
+            cases.append((q, params))
+
+        _compile_named.cache_clear()
+        self.stdout.write(f"{len(queries)} SQL literals in views, {len(cases)} with :named params; {number} calls each.")
+
+        total_old = total_new = 0.0
+        for q, params in cases:
+            t_old = timeit.timeit(lambda: _bind_uncached(q, params), number=number)
+            t_new = timeit.timeit(lambda: _bind(q, params), number=number)
+            total_old += t_old
+            total_new += t_new
+            label = " ".join(q.split())[:60]
+            self.stdout.write(
+                f"  {t_old / number * 1e9:8.0f} ns -> {t_new / number * 1e9:6.0f} ns "
+                f"({t_old / t_new:4.1f}x)  {label}"
+            )
+
+        calls = number * len(cases)
+        self.stdout.write(self.style.SUCCESS(
+            f"old {total_old / calls * 1e9:.0f} ns/call, memoized {total_new / calls * 1e9:.0f} ns/call, "
+            f"speedup {total_old / total_new:.1f}x  ({_compile_named.cache_info()})"
+        ))
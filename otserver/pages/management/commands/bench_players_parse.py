@@ -0,0 +1,125 @@
+# pages/management/commands/bench_players_parse.py
+import random
+import struct
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.server_status import R_PLAYERS_COUNTS, R_PLAYERS_LIST, _parse_players_body
+from pages.status_emulator import build_reply, synthetic_players
+
+
+# ---------- the previous parser (slice + int.from_bytes per field) ----------
+
+def _u16(b: bytes, i: int) -> Tuple[int, int]:
+    return int.from_bytes(b[i:i+2], "little"), i + 2
+
+def _u32(b: bytes, i: int) -> Tuple[int, int]:
+    return int.from_bytes(b[i:i+4], "little"), i + 4
+
+def _str(b: bytes, i: int) -> Tuple[str, int]:
+    ln, i = _u16(b, i)
+    s = b[i:i+ln]; i += ln
+    return s.decode("utf-8", "ignore"), i
+
+def _parse_sliced(body: bytes) -> Dict[str, Any]:
+    i = 0
+    online = maxp = peak = 0
+    players = []
+    while i < len(body):
+        code = body[i]; i += 1
+        if code == R_PLAYERS_COUNTS:
+            online, i = _u32(body, i)
+            maxp,  i = _u32(body, i)
+            peak,  i = _u32(body, i)
+        elif code == R_PLAYERS_LIST:
+            cnt, i = _u32(body, i)
+            for _ in range(cnt):
+                name, i = _str(body, i)
+                lvl,  i = _u32(body, i)
+                players.append({"name": name, "level": lvl})
+        else:
+            break
+    return {"online": True, "players": {"online": online, "max": maxp, "peak": peak}, "list": players}
+
+
+class Command(BaseCommand):
+    help = "Benchmark the binary player-list parser (memoryview/Struct vs slicing) and fuzz it with truncated replies."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=5000, help="Players in the synthetic reply.")
+        parser.add_argument("--number", type=int, default=50, help="Parses per timing run.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timing runs (best is reported).")
+        parser.add_argument("--fuzz", type=int, default=0, help="Random truncated/corrupted replies to check (0 = skip).")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        players = synthetic_players(opts["players"], rng)
+        body = build_reply(players, max_players=opts["players"] * 2, peak=opts["players"] + 17)
+
+        expected = _parse_sliced(body)
+        if _parse_players_body(body) != expected:
+            raise CommandError("parsers disagree on the synthetic reply")
+
+        number, repeat = opts["number"], opts["repeat"]
+        t_old = min(timeit.repeat(lambda: _parse_sliced(body), number=number, repeat=repeat)) / number
+        t_new = min(timeit.repeat(lambda: _parse_players_body(body), number=number, repeat=repeat)) / number
+        self.stdout.write(f"{len(players)} players, {len(body)} bytes")
+        self.stdout.write(f"  sliced     {t_old * 1e3:8.3f} ms/parse")
+        self.stdout.write(f"  memoryview {t_new * 1e3:8.3f} ms/parse")
+        self.stdout.write(self.style.SUCCESS(f"speedup {t_old / t_new:.2f}x"))
+
+        if opts["fuzz"]:
+            self.fuzz(rng, opts["fuzz"])
+
+    def fuzz(self, rng: random.Random, cases: int) -> None:
+        """
+        Every prefix of a small reply, then random corruptions of random replies.
+        The parser must either return a well-formed dict whose list is a prefix of
+        the real one, or raise ValueError; anything else is a failure.
+        """
+        failures = 0
+        small = synthetic_players(12, rng)
+        body = build_reply(small)
+        full = [{"name": n, "level": lvl} for n, lvl in small]
+        for cut in range(len(body)):
+            failures += self._check(body[:cut], full, strict=True)
+
+        for _ in range(cases):
+            plist = synthetic_players(rng.randint(0, 40), rng)
+            b = bytearray(build_reply(plist))
+            mode = rng.choice(("cut", "flip", "count"))
+            if mode == "cut" and b:
+                b = b[:rng.randrange(len(b))]
+            elif mode == "flip" and b:
+                for _ in range(rng.randint(1, 4)):
+                    b[rng.randrange(len(b))] = rng.randrange(256)
+            else:
+                # lie about the list length (0x21 header sits after the 13-byte counts block)
+                struct.pack_into("<I", b, 14, rng.choice((len(plist) + 1, 0xFFFFFFFF, rng.randrange(1 << 20))))
+            full = [{"name": n, "level": lvl} for n, lvl in plist]
+            failures += self._check(bytes(b), full, strict=(mode != "flip"))
+
+        total = cases + len(body)
+        if failures:
+            raise CommandError(f"fuzz: {failures}/{total} cases misbehaved")
+        self.stdout.write(self.style.SUCCESS(f"fuzz: {total} truncated/corrupted replies handled"))
+
+    def _check(self, data: bytes, full: List[Dict[str, Any]], *, strict: bool) -> int:
+        try:
+            res = _parse_players_body(data)
+        except ValueError:
+            return 0
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"  {type(e).__name__}: {e} on {data[:32].hex()}..."))
+            return 1
+        ok = isinstance(res.get("list"), list) and all(
+            isinstance(p["name"], str) and isinstance(p["level"], int) for p in res["list"]
+        )
+        if ok and strict:
+            ok = res["list"] == full[:len(res["list"])]
+        if not ok:
+            self.stdout.write(self.style.ERROR(f"  bad result for {data[:32].hex()}...: {res}"))
+        return 0 if ok else 1
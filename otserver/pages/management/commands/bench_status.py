@@ -0,0 +1,174 @@
+# pages/management/commands/bench_status.py
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+
+from pages import status_snapshot
+from pages.server_status import aquery_ot_players, aquery_ot_status, query_ot_players, query_ot_status
+from pages.status_emulator import FAILURE_MODES, StatusEmulator
+
+TARGETS = ("status", "players", "astatus", "aplayers", "views")
+
+
+def _percentile(sorted_ms: List[float], pct: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    k = min(len(sorted_ms) - 1, max(0, round(pct / 100 * len(sorted_ms) + 0.5) - 1))
+    return sorted_ms[k]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark query_ot_status/query_ot_players (sync and asyncio) and the status views "
+        "against the status protocol emulator (or a real server with --host/--port)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", action="append", choices=TARGETS,
+                            help=f"What to drive (repeatable; default: all of {', '.join(TARGETS)}).")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per target.")
+        parser.add_argument("--concurrency", type=int, default=64, help="Threads (sync) / in-flight coroutines (async).")
+        parser.add_argument("--timeout", type=float, default=3.0)
+        parser.add_argument("--players", type=int, default=500, help="Players online in the emulator.")
+        parser.add_argument("--latency-ms", type=float, nargs=2, default=(0.0, 0.0), metavar=("MIN", "MAX"),
+                            help="Server-side latency per request, uniform in [MIN, MAX].")
+        parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests that fail.")
+        parser.add_argument("--failure-mode", choices=FAILURE_MODES, default="drop")
+        parser.add_argument("--rate-limit", type=float, default=2.0,
+                            help="Seconds between answered requests per IP with --failure-mode ratelimit.")
+        parser.add_argument("--view-mode", choices=("snapshot", "stale"), default="snapshot",
+                            help="views: read a published snapshot, or force every request stale (live fallback path).")
+        parser.add_argument("--host", help="Benchmark a real status server instead of the emulator.")
+        parser.add_argument("--port", type=int, default=7171)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        if opts["requests"] < 1 or opts["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive")
+        targets = opts["target"] or list(TARGETS)
+
+        if opts["host"]:
+            self.run_targets(targets, (opts["host"], opts["port"]), opts)
+            return
+
+        lo, hi = opts["latency_ms"]
+        emu = StatusEmulator(
+            players=opts["players"], latency=(lo / 1000, hi / 1000),
+            failure_rate=opts["failure_rate"], failure_mode=opts["failure_mode"],
+            rate_limit=opts["rate_limit"], seed=opts["seed"],
+        )
+        with emu:
+            self.stdout.write(f"emulator on 127.0.0.1:{emu.port}: {opts['players']} players, "
+                              f"latency {lo:g}-{hi:g} ms, {opts['failure_mode']} @ {opts['failure_rate']:g}")
+            self.run_targets(targets, ("127.0.0.1", emu.port), opts)
+        self.stdout.write(f"emulator served {emu.stats}")
+
+    def run_targets(self, targets: List[str], endpoint: Tuple[str, int], opts: Dict[str, Any]) -> None:
+        host, port = endpoint
+        timeout, n, conc = opts["timeout"], opts["requests"], opts["concurrency"]
+        self.stdout.write(f"{'target':<24} {'ok':>6} {'err':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+
+        if "status" in targets:
+            self.report("query_ot_status", *self.run_sync(
+                lambda: query_ot_status(host, port, timeout=timeout, retries=0), n, conc))
+        if "players" in targets:
+            self.report("query_ot_players", *self.run_sync(
+                lambda: query_ot_players(host, port, timeout=timeout, retries=0), n, conc))
+        if "astatus" in targets:
+            self.report("aquery_ot_status", *asyncio.run(self.run_async(
+                lambda: aquery_ot_status(host, port, timeout=timeout), n, conc)))
+        if "aplayers" in targets:
+            self.report("aquery_ot_players", *asyncio.run(self.run_async(
+                lambda: aquery_ot_players(host, port, timeout=timeout), n, conc)))
+        if "views" in targets:
+            self.run_views(endpoint, opts)
+
+    # ---------- drivers ----------
+
+    @staticmethod
+    def _ok(result: Any) -> bool:
+        # query_ot_status raises on failure; query_ot_players returns {"online": False, ...}
+        return not isinstance(result, dict) or result.get("online", True) is not False
+
+    def _timed(self, fn: Callable[[], Any]) -> Tuple[float, bool]:
+        t0 = time.perf_counter()
+        try:
+            ok = self._ok(fn())
+        except Exception:
+            ok = False
+        return (time.perf_counter() - t0) * 1000, ok
+
+    def run_sync(self, fn: Callable[[], Any], n: int, conc: int) -> Tuple[List[Tuple[float, bool]], float]:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=conc) as pool:
+            samples = list(pool.map(lambda _: self._timed(fn), range(n)))
+        return samples, time.perf_counter() - t0
+
+    async def run_async(self, fn: Callable[[], Any], n: int, conc: int) -> Tuple[List[Tuple[float, bool]], float]:
+        sem = asyncio.Semaphore(conc)
+
+        async def one():
+            async with sem:
+                t0 = time.perf_counter()
+                try:
+                    ok = self._ok(await fn())
+                except Exception:
+                    ok = False
+                return (time.perf_counter() - t0) * 1000, ok
+
+        t0 = time.perf_counter()
+        samples = await asyncio.gather(*(one() for _ in range(n)))
+        return list(samples), time.perf_counter() - t0
+
+    def run_views(self, endpoint: Tuple[str, int], opts: Dict[str, Any]) -> None:
+        """
+        server_status and client_status(cacheinfo) through RequestFactory (no middleware),
+        with OT_STATUS_HOST/PORT pointed at `endpoint`. "snapshot" publishes once, like
+        status_poller would; "stale" zeroes MAX_AGE so every request takes the SWR path.
+        """
+        from pages import views
+
+        host, port = endpoint
+        rf = RequestFactory()
+        n, conc = opts["requests"], opts["concurrency"]
+        # keep the Discord widget off the network
+        views.fetch_discord_online.invalidate()
+        from pages.swr import swr_set
+        swr_set(views.fetch_discord_online.key(), 0, 3600, 3600)
+
+        def status_view():
+            resp = views.server_status(rf.get("/server_status/"))
+            return json.loads(resp.content)
+
+        def client_view():
+            resp = views.client_status(rf.post("/client_status/", data=b'{"type":"cacheinfo"}',
+                                               content_type="application/json"))
+            return {"online": resp.status_code == 200 and json.loads(resp.content)["playersonline"] > 0}
+
+        saved_max_age = status_snapshot.MAX_AGE
+        with override_settings(OT_STATUS_HOST=host, OT_STATUS_PORT=port, OT_STATUS_TIMEOUT=opts["timeout"],
+                               OT_STATUS_RETRIES=0):
+            for kind in (status_snapshot.INFO, status_snapshot.PLAYERS):
+                status_snapshot.publish(kind, endpoint, status_snapshot._query_live(kind, endpoint))
+            if opts["view_mode"] == "stale":
+                status_snapshot.MAX_AGE = -status_snapshot.INFO_INTERVAL - 1
+            try:
+                label = opts["view_mode"]
+                self.report(f"view server_status/{label}", *self.run_sync(status_view, n, conc))
+                self.report(f"view client_status/{label}", *self.run_sync(client_view, n, conc))
+            finally:
+                status_snapshot.MAX_AGE = saved_max_age
+
+    # ---------- output ----------
+
+    def report(self, label: str, samples: List[Tuple[float, bool]], wall: float) -> None:
+        ms = sorted(t for t, _ in samples)
+        ok = sum(1 for _, good in samples if good)
+        line = (f"{label:<24} {ok:>6} {len(samples) - ok:>6} {len(samples) / wall:>9.0f} "
+                f"{_percentile(ms, 50):>9.2f} {_percentile(ms, 95):>9.2f} {_percentile(ms, 99):>9.2f}")
+        self.stdout.write(self.style.SUCCESS(line) if ok == len(samples) else self.style.WARNING(line))
@@ -0,0 +1,52 @@
+# pages/management/commands/build_updater_manifest.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pages import checksums
+from pages.updater_manifest import API_DIR, INDEX_PATH, ManifestIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Hash the updater assets under API_DIR and write the manifest index "
+        "(OT_UPDATER_INDEX_PATH), so web workers start with a warm manifest. Run at deploy time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rehash every file, not only changed ones.")
+        parser.add_argument("--workers", type=int, default=0, help="Hashing workers (0 = min(8, CPUs)).")
+        parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads.")
+        parser.add_argument("--top", type=int, default=10, help="Slowest files to list (-1 = all).")
+        parser.add_argument("--api-dir", default=str(API_DIR))
+
+    def handle(self, *args, **opts):
+        if INDEX_PATH is None:
+            self.stdout.write(self.style.WARNING("OT_UPDATER_INDEX_PATH is not set; nothing will be persisted."))
+        idx = ManifestIndex(opts["api_dir"], INDEX_PATH,
+                            workers=opts["workers"], processes=opts["processes"])
+        t0 = time.perf_counter()
+        try:
+            changed = idx.refresh(force=True, full=opts["full"])
+        except OSError as e:
+            raise CommandError(f"cannot scan {opts['api_dir']}: {e}")
+        wall = time.perf_counter() - t0
+
+        hashed = idx.last_hashed
+        total = sum(r.size for r in hashed)
+        slowest = sorted(hashed, key=lambda r: -r.seconds)
+        if opts["top"] >= 0:
+            slowest = slowest[:opts["top"]]
+        for r in slowest:
+            rel = r.path.relative_to(idx.api_dir).as_posix()
+            self.stdout.write(f"  {r.seconds * 1e3:8.2f} ms {r.size / 1024:10.1f} KiB {'mmap' if r.mmapped else 'read'}  "
+                              f"{r.crc}  {rel}")
+
+        workers = opts["workers"] or checksums.default_workers()
+        pool = "processes" if opts["processes"] else "threads"
+        self.stdout.write(
+            f"{len(idx.entries)} files in manifest, {len(hashed)} hashed ({total / 2**20:.1f} MiB) "
+            f"with {workers} {pool} in {wall:.3f}s"
+            + (f" = {total / 2**20 / wall:.0f} MiB/s" if hashed and wall else "")
+        )
+        self.stdout.write(self.style.SUCCESS("manifest updated" if changed else "manifest unchanged"))
@@ -0,0 +1,178 @@
+# pages/management/commands/ledger_compact.py
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.db import DB
+
+# Month keys are YEAR*100+MONTH (202405) so no DATE_FORMAT/'%' patterns end up in the SQL.
+MONTH_EXPR = "YEAR(FROM_UNIXTIME(created_at))*100 + MONTH(FROM_UNIXTIME(created_at))"
+LEDGER_COLS = "id, account_id, delta, kind, ref, note, created_at"
+
+
+def _month_start(months_back: int) -> int:
+    """Unix time of the first second (UTC) of the month `months_back` before the current one."""
+    now = datetime.now(timezone.utc)
+    y, m = now.year, now.month - months_back
+    while m <= 0:
+        y, m = y - 1, m + 12
+    return int(datetime(y, m, 1, tzinfo=timezone.utc).timestamp())
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll closed months of coins_ledger into coins_ledger_monthly, move the detail rows "
+        "to coins_ledger_archive in bounded batches, and verify SUM(delta) against "
+        "coins_wallet.balance incrementally from coins_ledger_checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=5000, help="Ledger ids per compaction transaction.")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Pause between batches (seconds), eases replica lag.")
+        parser.add_argument("--keep-months", type=int, default=0, help="Closed months to keep in coins_ledger as detail.")
+        parser.add_argument("--settle", type=int, default=60,
+                            help="Only checkpoint rows older than this many seconds (in-flight transactions).")
+        parser.add_argument("--full", action="store_true", help="Verify every wallet, not only accounts with new rows.")
+        parser.add_argument("--verify-only", action="store_true", help="Skip compaction.")
+        parser.add_argument("--no-verify", action="store_true", help="Skip verification.")
+
+    def handle(self, *args, **opts):
+        db = DB()
+        # FROM_UNIXTIME() uses the session zone; months are UTC months.
+        db.run("execute", "SET time_zone = '+00:00'")
+
+        mismatched = []
+        if not opts["no_verify"]:
+            mismatched = self.verify(db, settle=opts["settle"], full=opts["full"])
+        if not opts["verify_only"]:
+            self.compact(db, cutoff=_month_start(opts["keep_months"]),
+                         batch=max(1, opts["batch"]), pause=max(0.0, opts["sleep"]))
+        if mismatched:
+            raise CommandError(f"{len(mismatched)} wallet(s) disagree with their ledger: {mismatched[:20]}")
+
+    # ---------- compaction ----------
+
+    def compact(self, db: DB, *, cutoff: int, batch: int, pause: float) -> None:
+        lo = db.run("scalar", "SELECT MIN(id) FROM coins_ledger WHERE created_at < %s", [cutoff])
+        if lo is None:
+            self.stdout.write("Nothing to compact.")
+            return
+        top = int(db.run("scalar", "SELECT MAX(id) FROM coins_ledger") or 0)
+        lo = int(lo)
+        moved = batches = 0
+        while lo <= top:
+            hi = lo + batch
+            n, reached_open_month = db.atomic_retry(self._compact_range, db, lo, hi, cutoff)
+            moved += n
+            batches += 1
+            if reached_open_month:
+                break  # ids are append-only: everything past here is in an open month
+            lo = hi
+            if pause:
+                time.sleep(pause)
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {moved} ledger rows in {batches} batch(es) "
+            f"(before {datetime.fromtimestamp(cutoff, timezone.utc):%Y-%m})."
+        ))
+
+    @staticmethod
+    def _compact_range(db: DB, lo: int, hi: int, cutoff: int):
+        """One transaction: summarize, archive, delete the closed-month rows with lo <= id < hi."""
+        rng = "id >= %s AND id < %s AND created_at < %s"
+        args = [lo, hi, cutoff]
+        db.run("execute", f"""
+            INSERT INTO coins_ledger_monthly
+                   (account_id, month, delta_sum, credits, debits, entries, first_id, last_id)
+            SELECT account_id, {MONTH_EXPR} AS month,
+                   SUM(delta), SUM(GREATEST(delta, 0)), SUM(GREATEST(-delta, 0)), COUNT(*), MIN(id), MAX(id)
+              FROM coins_ledger
+             WHERE {rng}
+             GROUP BY account_id, month
+            ON DUPLICATE KEY UPDATE
+                   delta_sum = delta_sum + VALUES(delta_sum),
+                   credits   = credits + VALUES(credits),
+                   debits    = debits + VALUES(debits),
+                   entries   = entries + VALUES(entries),
+                   first_id  = LEAST(first_id, VALUES(first_id)),
+                   last_id   = GREATEST(last_id, VALUES(last_id))
+        """, args)
+        db.run("execute",
+               f"INSERT INTO coins_ledger_archive ({LEDGER_COLS}) SELECT {LEDGER_COLS} FROM coins_ledger WHERE {rng}",
+               args)
+        n = db.run("execute", f"DELETE FROM coins_ledger WHERE {rng}", args)
+        newer = db.run("scalar",
+                       "SELECT COUNT(*) FROM coins_ledger WHERE id >= %s AND id < %s AND created_at >= %s",
+                       [lo, hi, cutoff])
+        return n, bool(newer)
+
+    # ---------- verification ----------
+
+    def verify(self, db: DB, *, settle: int, full: bool):
+        """
+        coins_ledger_checkpoint holds, per account, SUM(delta) over every ledger row
+        (live + archive) with id <= last_id. Only rows past the previous watermark are
+        summed; the wallet is then compared with checkpoint + the rows too fresh to
+        checkpoint, all inside one consistent-read transaction.
+        """
+        with db.atomic():
+            watermark = int(db.run("scalar", "SELECT COALESCE(MAX(last_id), 0) FROM coins_ledger_checkpoint") or 0)
+            # newest id old enough that no transaction can still commit below it
+            settled = [
+                db.run("scalar", f"SELECT id FROM {t} WHERE created_at < %s ORDER BY id DESC LIMIT 1",
+                       [int(time.time()) - settle])
+                for t in ("coins_ledger", "coins_ledger_archive")
+            ]
+            hi = max([watermark] + [int(x) for x in settled if x is not None])
+
+            fresh = db.run("select", """
+                SELECT account_id, SUM(delta) AS s
+                  FROM (SELECT account_id, delta FROM coins_ledger WHERE id > %s AND id <= %s
+                        UNION ALL
+                        SELECT account_id, delta FROM coins_ledger_archive WHERE id > %s AND id <= %s) x
+                 GROUP BY account_id
+            """, [watermark, hi, watermark, hi])
+            if fresh:
+                now = int(time.time())
+                db.upsert_many(
+                    "coins_ledger_checkpoint",
+                    [(r["account_id"], int(r["s"] or 0), hi, now) for r in fresh],
+                    columns=("account_id", "ledger_sum", "last_id", "checked_at"),
+                    update_cols={
+                        "ledger_sum": "ledger_sum + VALUES(ledger_sum)",
+                        "last_id": "VALUES(last_id)",
+                        "checked_at": "VALUES(checked_at)",
+                    },
+                )
+
+            tail = db.run("select", """
+                SELECT account_id, SUM(delta) AS s FROM coins_ledger WHERE id > %s GROUP BY account_id
+            """, [hi])
+            tail_sum = {r["account_id"]: int(r["s"] or 0) for r in tail}
+
+            touched = sorted({r["account_id"] for r in fresh} | set(tail_sum))
+            sql = """
+                SELECT w.account_id, w.balance, COALESCE(c.ledger_sum, 0) AS ledger_sum
+                  FROM coins_wallet w
+             LEFT JOIN coins_ledger_checkpoint c ON c.account_id = w.account_id
+            """
+            if full:
+                rows = db.run("select", sql)
+            elif touched:
+                rows = db.run("select", sql + f" WHERE w.account_id IN ({', '.join(['%s'] * len(touched))})", touched)
+            else:
+                rows = []
+
+        mismatched = []
+        for r in rows:
+            expected = int(r["ledger_sum"]) + tail_sum.get(r["account_id"], 0)
+            if int(r["balance"]) != expected:
+                mismatched.append(r["account_id"])
+                self.stdout.write(self.style.WARNING(
+                    f"account {r['account_id']}: wallet {r['balance']} != ledger {expected}"
+                ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Checkpoint {watermark} -> {hi}: {len(fresh)} account(s) advanced, "
+            f"{len(rows)} wallet(s) checked, {len(mismatched)} mismatch(es)."
+        ))
+        return mismatched
@@ -0,0 +1,18 @@
+# pages/management/commands/refresh_schema.py
+from django.core.management.base import BaseCommand
+from pages.db import DB
+
+
+class Command(BaseCommand):
+    help = "Reload the cached OT schema snapshot and invalidate it in every worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alias", default=None, help="DB alias (defaults to OT_DB_ALIAS).")
+
+    def handle(self, *args, **opts):
+        db = DB(opts["alias"])
+        snap = db.refresh_schema()
+        cols = sum(len(c) for _, c in snap.tables.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Schema v{snap.version} for '{db.alias}': {len(snap.tables)} tables, {cols} columns."
+        ))
@@ -0,0 +1,107 @@
+# pages/management/commands/status_poller.py
+import asyncio
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from pages import online_history, presence, status_snapshot as snap
+from pages.db import DB
+from pages.server_status import aquery_ot_players, aquery_ot_status
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Poll the status port of every world (worlds table + OT_STATUS_HOST/PORT) on a fixed "
+        "interval, publish info/player lists to the shared cache (pages.status_snapshot) and "
+        "record players-online history (pages.online_history)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=snap.MIN_INTERVAL,
+                            help="Seconds between player-list polls (OT_STATUS_MIN_INTERVAL).")
+        parser.add_argument("--info-interval", type=float, default=snap.INFO_INTERVAL,
+                            help="Seconds between TSQP info polls (OT_STATUS_INFO_INTERVAL).")
+        parser.add_argument("--timeout", type=float, default=None, help="Per-query timeout (OT_STATUS_TIMEOUT).")
+        parser.add_argument("--once", action="store_true", help="Poll every endpoint once and exit.")
+
+    def handle(self, *args, **opts):
+        self.timeout = float(opts["timeout"] or getattr(settings, "OT_STATUS_TIMEOUT", 3.0))
+        self.interval = max(1.0, opts["interval"])
+        self.info_interval = max(self.interval, opts["info_interval"])
+        self.db = DB()
+        self.history = {}   # world key -> (OnlineHistory, minute last saved)
+        try:
+            asyncio.run(self.main(once=opts["once"]))
+        except KeyboardInterrupt:
+            pass
+
+    async def main(self, *, once: bool) -> None:
+        loop = asyncio.get_running_loop()
+        info_due = 0.0
+        while True:
+            started = loop.time()
+            endpoints = await asyncio.to_thread(self._endpoints)
+            with_info = started >= info_due
+            if with_info:
+                info_due = started + self.info_interval
+            # endpoints in parallel; the two queries to one endpoint one after the
+            # other, since TFS throttles status requests per source IP
+            results = await asyncio.gather(*(self.poll(ep, with_info) for ep in endpoints))
+            up = sum(1 for ok in results if ok)
+            log.info("status poll: %d/%d endpoints online in %.0f ms",
+                     up, len(endpoints), (loop.time() - started) * 1000.0)
+            if once:
+                self.stdout.write(self.style.SUCCESS(f"Polled {len(endpoints)} endpoint(s), {up} online."))
+                return
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    def _endpoints(self):
+        close_old_connections()
+        try:
+            return snap.endpoints(self.db)
+        finally:
+            close_old_connections()
+
+    def _publish_players(self, endpoint, data, ts: float) -> None:
+        snap.publish(snap.PLAYERS, endpoint, data, ts=ts)
+        close_old_connections()
+        try:
+            presence.publish(self.db, endpoint, data, ts=ts)
+        except Exception:
+            log.warning("presence update for %s:%s failed", *endpoint, exc_info=True)
+        if data.get("online"):
+            try:
+                self._record_history(endpoint, data, int(ts))
+            except Exception:
+                log.warning("online history update for %s:%s failed", *endpoint, exc_info=True)
+        close_old_connections()
+
+    def _record_history(self, endpoint, data, ts: int) -> None:
+        """Fold every poll into the rings; write the blob at most once a minute."""
+        key = online_history.world_key(endpoint)
+        if key not in self.history:
+            self.history[key] = (online_history.load(self.db, key), -1)
+        hist, saved_minute = self.history[key]
+        hist.add(ts, max(int((data.get("players") or {}).get("online") or 0), len(data.get("list") or ())))
+        if ts // 60 != saved_minute:
+            online_history.save(self.db, key, hist)
+            self.history[key] = (hist, ts // 60)
+
+    async def poll(self, endpoint, with_info: bool) -> bool:
+        host, port = endpoint
+        if with_info:
+            try:
+                data = await aquery_ot_status(host, port, self.timeout)
+            except Exception as e:
+                data = {"online": False, "error": str(e)}
+            await asyncio.to_thread(snap.publish, snap.INFO, endpoint, data, ts=time.time())
+        data = await aquery_ot_players(host, port, self.timeout)
+        if not data.get("online"):
+            log.warning("status poll %s:%s failed: %s", host, port, data.get("error"))
+        await asyncio.to_thread(self._publish_players, endpoint, data, time.time())
+        return bool(data.get("online"))
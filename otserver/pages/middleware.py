@@ -0,0 +1,85 @@
+# pages/middleware.py
+import logging
+import time
+
+from django.conf import settings
+
+from . import db as dbmod
+from . import profiling
+
+log = logging.getLogger(__name__)
+
+QUERY_BUDGET_COUNT = int(getattr(settings, "OT_QUERY_BUDGET_COUNT", 20))
+QUERY_BUDGET_MS = float(getattr(settings, "OT_QUERY_BUDGET_MS", 250.0))
+SERVER_TIMING = bool(getattr(settings, "OT_SERVER_TIMING", True))
+
+
+class QueryProfilerMiddleware:
+    """
+    Collects every DB statement issued while handling a request and reports:
+      - a Server-Timing header (db, each named span, app total)
+      - a warning log line when the request exceeds the query count/time budget
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = profiling.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            prof = profiling.stop(token)
+
+        if SERVER_TIMING and not response.has_header("Server-Timing"):
+            parts = [f'db;dur={prof.db_ms:.1f};desc="{prof.count} queries"']
+            parts += [f"{name};dur={ms:.1f}" for name, ms in prof.spans.items()]
+            parts.append(f"app;dur={prof.elapsed_ms:.1f}")
+            response["Server-Timing"] = ", ".join(parts)
+
+        if prof.count > QUERY_BUDGET_COUNT or prof.db_ms > QUERY_BUDGET_MS:
+            log.warning(
+                "query budget exceeded: %s %s -> %d queries, %.1f ms db, %.1f ms total, spans=%s, top=%s",
+                request.method, request.path, prof.count, prof.db_ms, prof.elapsed_ms,
+                {k: round(v, 1) for k, v in prof.spans.items()},
+                [(t["fingerprint"], t["calls"], round(t["ms"], 1), t["sql"][:120]) for t in prof.top(5)],
+            )
+        return response
+
+
+class ReadAfterWriteMiddleware:
+    """
+    Read-your-writes on top of the replica routing in pages.db:
+      - a request that writes is pinned to the primary for the rest of the request
+      - the response then carries a short-lived cookie, so the client's next
+        requests (e.g. the redirect after a bazaar bid) also read from the primary
+        for OT_DB_STICKY_SECONDS
+    The routing state is always scoped to the request (long-lived worker threads
+    must not carry one request's write into the next); the sticky cookie is only
+    used when a separate read alias is configured.
+    """
+    cookie_name = "ot_rw_pin"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = dbmod.OT_DB_READ_ALIAS != dbmod.OT_DB_ALIAS and dbmod.OT_DB_STICKY_SECONDS > 0
+
+    def __call__(self, request):
+        until = 0.0
+        if self.enabled:
+            try:
+                until = float(request.COOKIES.get(self.cookie_name) or 0)
+            except ValueError:
+                until = 0.0
+        tokens = dbmod.begin_request(until if until > time.time() else 0.0)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = dbmod.end_request(tokens)
+
+        if wrote and self.enabled:
+            secs = dbmod.OT_DB_STICKY_SECONDS
+            response.set_cookie(
+                self.cookie_name, str(int(time.time()) + secs),
+                max_age=secs, httponly=True, samesite="Lax",
+            )
+        return response
@@ -0,0 +1,148 @@
+# pages/online_history.py
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Optional, Tuple
+import logging
+import struct
+import sys
+import time
+
+# Players-online history per world in fixed-size rings, one per resolution tier.
+# Every sample is folded into all tiers as it arrives (min/max/sum/n per bucket),
+# so the hourly and daily series are ready-made and a chart never scans samples.
+# Persisted as one blob per world in `online_history` (status_poller writes it).
+
+log = logging.getLogger(__name__)
+
+TIERS: Dict[str, Tuple[int, int]] = {   # name -> (seconds per bucket, buckets kept)
+    "minute": (60, 1440),               # 24 hours
+    "hour": (3600, 24 * 60),            # 60 days
+    "day": (86400, 730),                # 2 years
+}
+_MAGIC = b"OTH1"
+_HEAD = struct.Struct("<4sB")
+_RING = struct.Struct("<IH")
+_MAX = 0xFFFF
+
+
+class Ring:
+    """`size` buckets of `step` seconds; a slot is live while its stamp matches the bucket number."""
+    __slots__ = ("step", "size", "stamp", "lo", "hi", "total", "n")
+
+    def __init__(self, step: int, size: int) -> None:
+        self.step, self.size = step, size
+        self.stamp = array("I", bytes(4 * size))   # ts // step of the bucket in the slot (0 = empty)
+        self.lo = array("H", bytes(2 * size))
+        self.hi = array("H", bytes(2 * size))
+        self.total = array("I", bytes(4 * size))
+        self.n = array("H", bytes(2 * size))
+
+    def add(self, ts: int, value: int) -> None:
+        b = ts // self.step
+        i = b % self.size
+        if self.stamp[i] != b:
+            self.stamp[i], self.lo[i], self.hi[i], self.total[i], self.n[i] = b, value, value, value, 1
+            return
+        if value < self.lo[i]:
+            self.lo[i] = value
+        if value > self.hi[i]:
+            self.hi[i] = value
+        self.total[i] += value
+        if self.n[i] < _MAX:
+            self.n[i] += 1
+
+    def series(self, now: int, buckets: Optional[int] = None) -> List[List[int]]:
+        """[[bucket start ts, min, max, avg], ...] oldest first, for the last `buckets` buckets that have data."""
+        last = now // self.step
+        count = min(self.size, buckets or self.size)
+        out = []
+        for b in range(last - count + 1, last + 1):
+            i = b % self.size
+            if self.stamp[i] == b and self.n[i]:
+                out.append([b * self.step, self.lo[i], self.hi[i], round(self.total[i] / self.n[i])])
+        return out
+
+    def _arrays(self):
+        return (self.stamp, self.lo, self.hi, self.total, self.n)
+
+
+class OnlineHistory:
+    def __init__(self) -> None:
+        self.rings: Dict[str, Ring] = {name: Ring(step, size) for name, (step, size) in TIERS.items()}
+        self.last_ts = 0
+
+    def add(self, ts: int, count: int) -> None:
+        value = max(0, min(_MAX, int(count)))
+        for ring in self.rings.values():
+            ring.add(int(ts), value)
+        self.last_ts = int(ts)
+
+    def series(self, tier: str, buckets: Optional[int] = None, now: Optional[int] = None) -> List[List[int]]:
+        return self.rings[tier].series(int(now or time.time()), buckets)
+
+    # ---------- persistence ----------
+
+    def to_bytes(self) -> bytes:
+        parts = [_HEAD.pack(_MAGIC, len(self.rings))]
+        for ring in self.rings.values():
+            parts.append(_RING.pack(ring.step, ring.size))
+            for arr in ring._arrays():
+                if sys.byteorder == "big":
+                    arr = array(arr.typecode, arr)
+                    arr.byteswap()
+                parts.append(arr.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "OnlineHistory":
+        """Rings whose step/size no longer match TIERS are dropped (start empty)."""
+        hist = cls()
+        magic, count = _HEAD.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("not an online history blob")
+        by_shape = {(r.step, r.size): r for r in hist.rings.values()}
+        pos = _HEAD.size
+        for _ in range(count):
+            step, size = _RING.unpack_from(data, pos)
+            pos += _RING.size
+            target = by_shape.get((step, size)) or Ring(step, size)
+            for arr in target._arrays():
+                nbytes = arr.itemsize * size
+                if pos + nbytes > len(data):
+                    raise ValueError("truncated online history blob")
+                fresh = array(arr.typecode)
+                fresh.frombytes(data[pos:pos + nbytes])
+                if sys.byteorder == "big":
+                    fresh.byteswap()
+                arr[:] = fresh
+                pos += nbytes
+        hist.last_ts = max((max(r.stamp) * r.step for r in hist.rings.values()), default=0)
+        return hist
+
+
+# ---------- storage (online_history table) ----------
+
+def world_key(endpoint: Tuple[str, int]) -> str:
+    host, port = endpoint
+    return f"{host}:{port}"
+
+
+def decode(blob: Optional[bytes], key: str) -> OnlineHistory:
+    """The stored history, or an empty one if there is none or it is unreadable (the next save replaces it)."""
+    if not blob:
+        return OnlineHistory()
+    try:
+        return OnlineHistory.from_bytes(bytes(blob))
+    except (ValueError, struct.error):
+        log.warning("online history for %s is corrupt; starting a new one", key, exc_info=True)
+        return OnlineHistory()
+
+
+def load(db, key: str) -> OnlineHistory:
+    return decode(db.run("scalar", "SELECT data FROM online_history WHERE world_key = %s", [key]), key)
+
+
+def save(db, key: str, hist: OnlineHistory) -> None:
+    db.upsert_many("online_history", [(key, hist.to_bytes(), int(time.time()))],
+                   columns=("world_key", "data", "updated_at"), update_cols=["data", "updated_at"])
+    db.invalidate(f"online_history:{key}")
@@ -0,0 +1,196 @@
+# pages/presence.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import status_snapshot
+from .db import DB
+from .status_snapshot import Endpoint
+
+log = logging.getLogger(__name__)
+
+# Who is online, per status endpoint (world), as sets for O(1) lookups:
+#   ot_presence:{host}:{port} -> {"ts", "source", "names": [casefolded], "ids": [player ids]}
+# Fed by the status snapshot (status_poller publishes it every tick), else by the
+# players_online table. Each process keeps its copy for OT_PRESENCE_LOCAL_TTL seconds.
+# Views that only know a player (not their world) ask everywhere(): the union over
+# every world's endpoint, like the old players_online check.
+
+LOCAL_TTL: float = float(getattr(settings, "OT_PRESENCE_LOCAL_TTL", 5))
+ENDPOINTS_TTL = 60.0   # how long the list of worlds' status endpoints is reused
+_KEY = "ot_presence:{host}:{port}"
+
+
+@dataclass(frozen=True)
+class Presence:
+    names: FrozenSet[str]     # casefolded
+    ids: FrozenSet[int]
+    ts: float                 # when the underlying status/players_online data was read
+    source: str               # "status" | "players_online" | "none"
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.ts)
+
+    def is_online(self, name: str) -> bool:
+        return bool(name) and name.casefold() in self.names
+
+    def online_many(self, ids: Iterable[Any]) -> FrozenSet[int]:
+        """The subset of `ids` that is online."""
+        return self.ids.intersection(int(i) for i in ids if i is not None)
+
+
+_local: Dict[Endpoint, Tuple[float, Presence]] = {}   # endpoint -> (checked_at, Presence)
+_local_lock = threading.Lock()                        # guards _local/_refreshing swaps only, never I/O
+_refreshing: Dict[Endpoint, threading.Lock] = {}      # endpoint -> single-flight refresh guard
+_endpoints_cache: Tuple[float, List[Endpoint]] = (0.0, [])
+_union: Optional[Tuple[Tuple[Presence, ...], Presence]] = None
+
+
+# ---------- building ----------
+
+def _ids_for_names(db, names: List[str]) -> List[int]:
+    ids: List[int] = []
+    for i in range(0, len(names), 500):
+        chunk = names[i:i + 500]
+        rows = db.run("select", f"SELECT id FROM players WHERE name IN ({','.join(['%s'] * len(chunk))})",
+                      chunk, row="tuple")
+        ids.extend(int(r[0]) for r in rows)
+    return ids
+
+
+def _from_players_online(db) -> Optional[Dict[str, Any]]:
+    if not db._table_exists("players_online"):
+        return None
+    rows = db.run("select", """
+        SELECT p.id, p.name
+          FROM players_online po
+          JOIN players p ON p.id = po.player_id
+    """, row="tuple")
+    return {
+        "ts": time.time(), "source": "players_online",
+        "names": [str(name).casefold() for _, name in rows],
+        "ids": [int(pid) for pid, _ in rows],
+    }
+
+
+def build(db, endpoint: Endpoint, status: Optional[Mapping[str, Any]] = None, *, ts: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Presence entry for `endpoint` from a query_ot_players() result (default: the
+    status snapshot); players_online when the status port gave us nothing.
+    """
+    if status is None:
+        entry = status_snapshot.read(status_snapshot.PLAYERS, endpoint)
+        if entry is None or time.time() - entry["ts"] >= status_snapshot.MAX_AGE:
+            status = status_snapshot.players(endpoint)   # live fallback, if enabled
+            ts = time.time()
+        else:
+            status, ts = entry["data"], entry["ts"]
+    if status.get("online"):
+        names = [p["name"] for p in status.get("list", []) if p.get("name")]
+        return {
+            "ts": ts or time.time(), "source": "status",
+            "names": [n.casefold() for n in names],
+            "ids": _ids_for_names(db, names) if names else [],
+        }
+    try:
+        fallback = _from_players_online(db)
+    except Exception:
+        log.warning("players_online lookup failed", exc_info=True)
+        fallback = None
+    return fallback or {"ts": time.time(), "source": "none", "names": [], "ids": []}
+
+
+def publish(db, endpoint: Endpoint, status: Optional[Mapping[str, Any]] = None, *, ts: Optional[float] = None) -> Dict[str, Any]:
+    entry = build(db, endpoint, status, ts=ts)
+    host, port = endpoint
+    cache.set(_KEY.format(host=host, port=port), entry, status_snapshot.KEEP)
+    return entry
+
+
+# ---------- lookups ----------
+
+def _guard(endpoint: Endpoint) -> threading.Lock:
+    with _local_lock:
+        return _refreshing.setdefault(endpoint, threading.Lock())
+
+
+def _load(endpoint: Endpoint, db) -> Presence:
+    host, port = endpoint
+    entry = cache.get(_KEY.format(host=host, port=port))
+    if entry is None or time.time() - entry["ts"] >= status_snapshot.MAX_AGE:
+        entry = publish(db or DB(), endpoint)
+    return Presence(
+        names=frozenset(entry["names"]), ids=frozenset(entry["ids"]),
+        ts=float(entry["ts"]), source=entry["source"],
+    )
+
+
+def get(endpoint: Optional[Endpoint] = None, *, db=None) -> Presence:
+    """
+    Current presence for `endpoint` (default: OT_STATUS_HOST/PORT). One thread per
+    endpoint refreshes an expired copy (possibly a live status query); the others
+    keep the previous copy meanwhile, and only a first load waits for it.
+    """
+    endpoint = endpoint or status_snapshot.default_endpoint()
+    hit = _local.get(endpoint)
+    if hit is not None and time.time() - hit[0] < LOCAL_TTL:
+        return hit[1]
+    guard = _guard(endpoint)
+    if not guard.acquire(blocking=hit is None):
+        return hit[1]
+    try:
+        hit = _local.get(endpoint)
+        if hit is not None and time.time() - hit[0] < LOCAL_TTL:
+            return hit[1]
+        pres = _load(endpoint, db)
+        with _local_lock:
+            _local[endpoint] = (time.time(), pres)
+        return pres
+    finally:
+        guard.release()
+
+
+def _endpoints(db=None) -> List[Endpoint]:
+    global _endpoints_cache
+    checked_at, eps = _endpoints_cache
+    if time.time() - checked_at >= ENDPOINTS_TTL:
+        eps = status_snapshot.endpoints(db or DB())
+        _endpoints_cache = (time.time(), eps)
+    return eps
+
+
+def everywhere(*, db=None) -> Presence:
+    """Presence across every status endpoint (all worlds), for views that don't know the world."""
+    global _union
+    parts = tuple(get(ep, db=db) for ep in _endpoints(db))
+    cached = _union
+    if cached is not None and len(cached[0]) == len(parts) and all(a is b for a, b in zip(cached[0], parts)):
+        return cached[1]
+    if len(parts) == 1:
+        pres = parts[0]
+    else:
+        pres = Presence(
+            names=frozenset().union(*(p.names for p in parts)),
+            ids=frozenset().union(*(p.ids for p in parts)),
+            ts=min((p.ts for p in parts), default=time.time()),
+            source=",".join(sorted({p.source for p in parts})) or "none",
+        )
+    _union = (parts, pres)
+    return pres
+
+
+def is_online(name: str, endpoint: Optional[Endpoint] = None) -> bool:
+    """Online on `endpoint`, or on any world when no endpoint is given."""
+    return (get(endpoint) if endpoint else everywhere()).is_online(name)
+
+
+def online_many(ids: Iterable[Any], endpoint: Optional[Endpoint] = None) -> FrozenSet[int]:
+    """The subset of `ids` online on `endpoint`, or on any world when no endpoint is given."""
+    return (get(endpoint) if endpoint else everywhere()).online_many(ids)
@@ -0,0 +1,118 @@
+# pages/profiling.py
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import hashlib
+import re
+import time
+
+# Per-request collector. DB._execute/_select/_scalar append to it; the
+# QueryProfilerMiddleware (pages/middleware.py) opens and reports it.
+
+
+@dataclass
+class QueryStat:
+    fingerprint: str
+    sql: str            # normalized statement (literals replaced by ?)
+    duration_ms: float
+    rows: int
+    retries: int
+    alias: str
+    error: bool = False
+
+
+@dataclass
+class RequestProfile:
+    started: float = field(default_factory=time.perf_counter)
+    queries: List[QueryStat] = field(default_factory=list)
+    spans: Dict[str, float] = field(default_factory=dict)   # name -> total ms (e.g. "status")
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_ms(self) -> float:
+        return sum(q.duration_ms for q in self.queries)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def top(self, n: int = 5) -> List[Dict[str, object]]:
+        """Fingerprints grouped and sorted by total time (heaviest first)."""
+        agg: Dict[str, Dict[str, object]] = {}
+        for q in self.queries:
+            a = agg.setdefault(q.fingerprint, {"fingerprint": q.fingerprint, "sql": q.sql, "calls": 0, "ms": 0.0, "rows": 0})
+            a["calls"] += 1
+            a["ms"] += q.duration_ms
+            a["rows"] += q.rows
+        return sorted(agg.values(), key=lambda a: a["ms"], reverse=True)[:n]
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("ot_request_profile", default=None)
+
+
+def start() -> object:
+    """Begin collecting for the current request/task; returns a token for stop()."""
+    return _current.set(RequestProfile())
+
+
+def stop(token) -> Optional[RequestProfile]:
+    prof = _current.get()
+    _current.reset(token)
+    return prof
+
+
+def current() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+# ---------- fingerprinting ----------
+
+_str_lit = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_num_lit = re.compile(r"\b\d+(?:\.\d+)?\b")
+_in_list = re.compile(r"\bIN\s*\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)", re.IGNORECASE)
+_spaces  = re.compile(r"\s+")
+
+def normalize(sql: str) -> str:
+    s = _str_lit.sub("?", sql)
+    s = _num_lit.sub("?", s)
+    s = _in_list.sub("IN (...)", s)
+    return _spaces.sub(" ", s).strip()
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(normalize(sql).encode("utf-8")).hexdigest()[:12]
+
+
+# ---------- recording ----------
+
+def record(sql: str, duration: float, rows: int, retries: int, alias: str, *, error: bool = False) -> None:
+    """Called by DB for every statement; no-op outside a profiled request."""
+    prof = _current.get()
+    if prof is None:
+        return
+    norm = normalize(sql)
+    prof.queries.append(QueryStat(
+        fingerprint=hashlib.sha1(norm.encode("utf-8")).hexdigest()[:12],
+        sql=norm[:300],
+        duration_ms=duration * 1000.0,
+        rows=max(0, int(rows or 0)),
+        retries=retries,
+        alias=alias,
+        error=error,
+    ))
+
+
+@contextmanager
+def span(name: str):
+    """Time a non-SQL step (e.g. a status-port round trip) into the request profile."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        prof = _current.get()
+        if prof is not None:
+            prof.spans[name] = prof.spans.get(name, 0.0) + (time.perf_counter() - t0) * 1000.0
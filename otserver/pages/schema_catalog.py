@@ -0,0 +1,146 @@
+# pages/schema_catalog.py
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+log = logging.getLogger(__name__)
+
+SCHEMA_TTL: int = int(getattr(settings, "OT_SCHEMA_TTL", 600))  # seconds
+_VERSION_KEY = "ot_schema_version:{alias}"
+_SNAPSHOT_KEY = "ot_schema_snapshot:{alias}:{version}"
+
+
+@dataclass(frozen=True)
+class SchemaSnapshot:
+    """
+    Immutable view of the OT database schema.
+      tables: lowercased table name -> (real table name, ordered column names)
+    Lookups are case-insensitive, like information_schema comparisons on MySQL.
+    """
+    tables: Dict[str, Tuple[str, Tuple[str, ...]]]
+    version: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    _colsets: Dict[str, frozenset] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for key, (_, cols) in self.tables.items():
+            self._colsets[key] = frozenset(c.lower() for c in cols)
+
+    def has_table(self, table: str) -> bool:
+        return table.lower() in self.tables
+
+    def columns(self, table: str) -> Tuple[str, ...]:
+        entry = self.tables.get(table.lower())
+        return entry[1] if entry else ()
+
+    def has_column(self, table: str, col: str) -> bool:
+        return col.lower() in self._colsets.get(table.lower(), frozenset())
+
+
+class SchemaCatalog:
+    """
+    Process-wide schema cache for one DB alias.
+
+    The snapshot is loaded with a single information_schema query, shared through
+    the Django cache (so sibling workers skip even that), and reused until either
+    the TTL expires or someone bumps the shared version (`refresh_schema` command).
+
+      catalog = SchemaCatalog.for_alias("default")
+      catalog.snapshot().has_column("players", "world_id")
+    """
+    _registry: Dict[str, "SchemaCatalog"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, alias: str, ttl: int = SCHEMA_TTL) -> None:
+        self.alias = alias
+        self.ttl = max(0, int(ttl))
+        self._snap: Optional[SchemaSnapshot] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_alias(cls, alias: str) -> "SchemaCatalog":
+        cat = cls._registry.get(alias)
+        if cat is None:
+            with cls._registry_lock:
+                cat = cls._registry.setdefault(alias, cls(alias))
+        return cat
+
+    # ---------- public ----------
+
+    def snapshot(self) -> SchemaSnapshot:
+        snap = self._snap
+        if snap is not None and (time.time() - snap.loaded_at) < self.ttl:
+            return snap
+        with self._lock:
+            snap = self._snap
+            if snap is not None and (time.time() - snap.loaded_at) < self.ttl:
+                return snap
+            version = self._shared_version()
+            # TTL expired but nobody bumped the version: just extend it.
+            if snap is not None and snap.version == version:
+                snap = SchemaSnapshot(snap.tables, version=version)
+            else:
+                snap = self._load(version)
+            self._snap = snap
+            return snap
+
+    def refresh(self) -> SchemaSnapshot:
+        """Reload from the database and invalidate every other process' copy."""
+        with self._lock:
+            version = self._bump_version()
+            snap = self._load(version, use_shared=False)
+            self._snap = snap
+            return snap
+
+    def invalidate(self) -> None:
+        """Drop the local copy only; next access revalidates against the shared version."""
+        self._snap = None
+
+    # ---------- internals ----------
+
+    def _shared_version(self) -> int:
+        try:
+            return int(cache.get(_VERSION_KEY.format(alias=self.alias)) or 0)
+        except Exception:
+            return 0
+
+    def _bump_version(self) -> int:
+        key = _VERSION_KEY.format(alias=self.alias)
+        try:
+            cache.add(key, 0, timeout=None)
+            return int(cache.incr(key))
+        except Exception:
+            log.warning("schema version bump failed for alias=%s", self.alias, exc_info=True)
+            return self._shared_version() + 1
+
+    def _load(self, version: int, *, use_shared: bool = True) -> SchemaSnapshot:
+        key = _SNAPSHOT_KEY.format(alias=self.alias, version=version)
+        tables = cache.get(key) if use_shared else None
+        if tables is None:
+            tables = self._query_tables()
+            cache.set(key, tables, timeout=max(self.ttl, 60) * 4)
+        return SchemaSnapshot(tables, version=version)
+
+    def _query_tables(self) -> Dict[str, Tuple[str, Tuple[str, ...]]]:
+        found: Dict[str, Tuple[str, list]] = {}
+        with connections[self.alias].cursor() as cur:
+            cur.execute(
+                "SELECT t.table_name, c.column_name "
+                "FROM information_schema.tables t "
+                "LEFT JOIN information_schema.columns c "
+                "ON c.table_schema = t.table_schema AND c.table_name = t.table_name "
+                "WHERE t.table_schema = DATABASE() "
+                "ORDER BY t.table_name, c.ordinal_position"
+            )
+            for table, col in cur.fetchall():
+                entry = found.setdefault(table.lower(), (table, []))
+                if col is not None:
+                    entry[1].append(col)
+        return {k: (name, tuple(cols)) for k, (name, cols) in found.items()}
@@ -1,9 +1,11 @@
 # pages/server_status.py
+import asyncio
 import socket
 import time
 import select
+import struct
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Optional
 
 # --- Status protocol constants ---
 # Client -> Server (binary status)
@@ -17,6 +19,11 @@ REQ_EXT_PLAYERS_INFO = 0x0020  # online list
 R_PLAYERS_COUNTS = 0x20  # [u32 online][u32 max][u32 peak]
 R_PLAYERS_LIST   = 0x21  # [u32 count] { [u16 len][name][u32 level] }*count
 
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_COUNTS = struct.Struct("<III")  # online, max, peak
+_MIN_ENTRY = _U16.size + _U32.size  # empty name + level
+
 
 # ----------------- low-level helpers -----------------
 
@@ -55,16 +62,84 @@ def _recv_until_idle(sock: socket.socket, deadline: float, idle: float = 0.25, c
                 break
     return bytes(data)
 
-def _u16(b: bytes, i: int) -> Tuple[int, int]:
-    return int.from_bytes(b[i:i+2], "little"), i + 2
+def _xml_from_raw(raw: bytes) -> bytes:
+    """Locate the TSQP document in an unframed (or oddly framed) status reply."""
+    # If starts with length, strip it
+    if len(raw) >= 2:
+        t2 = int.from_bytes(raw[:2], "little")
+        if 2 + t2 <= len(raw):
+            cand = raw[2:2 + t2]
+            if cand.startswith(b"<") or cand.startswith(b"<?xml"):
+                raw = cand
+
+    if not (raw.startswith(b"<") or raw.startswith(b"<?xml")):
+        i = raw.find(b"<?xml")
+        if i == -1:
+            i = raw.find(b"<tsqp")
+        if i != -1:
+            raw = raw[i:]
+    if not (raw.startswith(b"<") or raw.startswith(b"<?xml")):
+        raise RuntimeError("No XML found in response.")
+    return raw
+
+def _parse_players_body(body: bytes) -> Dict[str, Any]:
+    """
+    Parse the blocks of a binary status reply (0x20 counts, 0x21 list).
+    Reads fields in place from a memoryview (no per-field slices); a block cut
+    short raises ValueError instead of yielding zero-padded garbage.
+    """
+    online = maxp = peak = 0
+    players: List[Dict[str, Any]] = []
+    append = players.append
+    u16, u32 = _U16.unpack_from, _U32.unpack_from
+    i = 0
+    with memoryview(body) as mv:
+        n = len(mv)
+        try:
+            while i < n:
+                code = mv[i]; i += 1
+                if code == R_PLAYERS_COUNTS:      # 0x20
+                    online, maxp, peak = _COUNTS.unpack_from(mv, i)
+                    i += _COUNTS.size
+                elif code == R_PLAYERS_LIST:      # 0x21
+                    (cnt,) = u32(mv, i)
+                    i += 4
+                    if cnt * _MIN_ENTRY > n - i:
+                        raise ValueError(f"player list claims {cnt} entries, only {n - i} bytes left")
+                    for _ in range(cnt):
+                        (ln,) = u16(mv, i)
+                        i += 2
+                        end = i + ln
+                        if end > n:
+                            raise ValueError(f"player name runs past end of reply at byte {i}")
+                        name = str(mv[i:end], "utf-8", "ignore")
+                        (lvl,) = u32(mv, end)
+                        i = end + 4
+                        append({"name": name, "level": lvl})
+                else:
+                    break
+        except struct.error:
+            raise ValueError(f"status reply truncated at byte {i} of {n}") from None
+
+    return {
+        "online": True,
+        "players": {"online": online, "max": maxp, "peak": peak},
+        "list": players,
+    }
 
-def _u32(b: bytes, i: int) -> Tuple[int, int]:
-    return int.from_bytes(b[i:i+4], "little"), i + 4
+def _players_request() -> bytes:
+    flags = REQ_PLAYERS_INFO | REQ_EXT_PLAYERS_INFO
+    # NOTE: 0xFF is the ProtocolStatus selector byte.
+    body = bytes([0xFF, P_REQ]) + flags.to_bytes(2, "little")
+    return len(body).to_bytes(2, "little") + body
 
-def _str(b: bytes, i: int) -> Tuple[str, int]:
-    ln, i = _u16(b, i)
-    s = b[i:i+ln]; i += ln
-    return s.decode("utf-8", "ignore"), i
+def _players_offline(err: Optional[BaseException]) -> Dict[str, Any]:
+    return {
+        "online": False,
+        "error": str(err) if err else "Unknown error.",
+        "players": {"online": 0, "peak": 0},
+        "list": [],
+    }
 
 def _parse_tsqp_xml(xml_bytes: bytes) -> Dict[str, Any]:
     root = ET.fromstring(xml_bytes.decode("utf-8", "ignore"))
@@ -153,23 +228,7 @@ def query_ot_status(host: str, port: int, timeout: float = 5.0, retries: int = 1
                     if not raw:
                         raise RuntimeError("Empty response.")
 
-                    # If starts with length, strip it
-                    if len(raw) >= 2:
-                        t2 = int.from_bytes(raw[:2], "little")
-                        if 2 + t2 <= len(raw):
-                            cand = raw[2:2 + t2]
-                            if cand.startswith(b"<") or cand.startswith(b"<?xml"):
-                                raw = cand
-
-                    if not (raw.startswith(b"<") or raw.startswith(b"<?xml")):
-                        i = raw.find(b"<?xml")
-                        if i == -1:
-                            i = raw.find(b"<tsqp")
-                        if i != -1:
-                            raw = raw[i:]
-                    if not (raw.startswith(b"<") or raw.startswith(b"<?xml")):
-                        raise RuntimeError("No XML found in response.")
-                    xml_bytes = raw
+                    xml_bytes = _xml_from_raw(raw)
 
                 return _parse_tsqp_xml(xml_bytes)
 
@@ -190,11 +249,7 @@ def query_ot_players(host, port, timeout=5.0, retries=1, backoff=1.0):
       0x20: [u32 online][u32 max][u32 peak]
       0x21: [u32 count] { [u16 len][name][u32 level] } * count
     """
-    flags = REQ_PLAYERS_INFO | REQ_EXT_PLAYERS_INFO
-
-    # NOTE: 0xFF is the ProtocolStatus selector byte.
-    body   = bytes([0xFF, P_REQ]) + flags.to_bytes(2, "little")
-    packet = len(body).to_bytes(2, "little") + body
+    packet = _players_request()
 
     last_err = None
     for attempt in range(retries + 1):
@@ -219,37 +274,100 @@ def query_ot_players(host, port, timeout=5.0, retries=1, backoff=1.0):
                     raise RuntimeError("Truncated body.")
 
             # Parse blocks we requested
-            i = 0
-            online = maxp = peak = 0
-            players = []
-            while i < len(body):
-                code = body[i]; i += 1
-                if code == R_PLAYERS_COUNTS:      # 0x20
-                    online, i = _u32(body, i)
-                    maxp,  i = _u32(body, i)
-                    peak,  i = _u32(body, i)
-                elif code == R_PLAYERS_LIST:      # 0x21
-                    cnt, i = _u32(body, i)
-                    for _ in range(cnt):
-                        name, i = _str(body, i)
-                        lvl,  i = _u32(body, i)
-                        players.append({"name": name, "level": lvl})
-                else:
-                    break
-
-            return {
-                "online": True,
-                "players": {"online": online, "max": maxp, "peak": peak},
-                "list": players,
-            }
+            return _parse_players_body(body)
 
         except Exception as e:
             last_err = e
             continue
 
-    return {
-        "online": False,
-        "error": str(last_err) if last_err else "Unknown error.",
-        "players": {"online": 0, "peak": 0},
-        "list": [],
-    }
\ No newline at end of file
+    return _players_offline(last_err)
+
+
+# ----------------- asyncio variants (status_poller) -----------------
+# One attempt each, no retries: the poller's next tick is the retry.
+
+async def _aread_exact(reader: asyncio.StreamReader, n: int, deadline: float) -> bytes:
+    """Read exactly n bytes; fewer on timeout/close."""
+    remain = deadline - asyncio.get_running_loop().time()
+    if remain <= 0:
+        return b""
+    try:
+        return await asyncio.wait_for(reader.readexactly(n), remain)
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.TimeoutError:
+        return b""
+
+async def _aread_until_idle(reader: asyncio.StreamReader, deadline: float, idle: float = 0.25, cap: int = 1_048_576) -> bytes:
+    loop = asyncio.get_running_loop()
+    data = bytearray()
+    while len(data) < cap:
+        remain = deadline - loop.time()
+        if remain <= 0:
+            break
+        try:
+            chunk = await asyncio.wait_for(reader.read(8192), min(idle, remain))
+        except asyncio.TimeoutError:
+            break
+        if not chunk:
+            break
+        data.extend(chunk)
+    return bytes(data)
+
+async def _aexchange(host: str, port: int, packet: bytes, timeout: float, read):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + float(timeout)
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        writer.write(packet)
+        await writer.drain()
+        return await read(reader, deadline)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+async def aquery_ot_status(host: str, port: int, timeout: float = 5.0) -> Dict[str, Any]:
+    """asyncio query_ot_status(); raises on failure like the sync version."""
+    payload = b"\xFF\xFFinfo"
+
+    async def read(reader, deadline):
+        hdr = await _aread_exact(reader, 2, deadline)
+        body = b""
+        if len(hdr) == 2:
+            total = int.from_bytes(hdr, "little")
+            if 4 <= total <= 65535:
+                body = await _aread_exact(reader, total, deadline)
+                if len(body) == total:
+                    return body
+        raw = hdr + body + await _aread_until_idle(reader, deadline)
+        if not raw:
+            raise RuntimeError("Empty response.")
+        return _xml_from_raw(raw)
+
+    xml_bytes = await _aexchange(host, port, len(payload).to_bytes(2, "little") + payload, timeout, read)
+    return _parse_tsqp_xml(xml_bytes)
+
+async def aquery_ot_players(host: str, port: int, timeout: float = 5.0) -> Dict[str, Any]:
+    """asyncio query_ot_players(); returns the same offline dict on failure."""
+    async def read(reader, deadline):
+        hdr = await _aread_exact(reader, 2, deadline)
+        if len(hdr) != 2:
+            raise RuntimeError("No length header.")
+        total = int.from_bytes(hdr, "little")
+        if total < 1 or total > 65535:
+            raise RuntimeError("Bad length.")
+        body = await _aread_exact(reader, total, deadline)
+        if len(body) != total:
+            raise RuntimeError("Truncated body.")
+        return body
+
+    try:
+        return _parse_players_body(await _aexchange(host, port, _players_request(), timeout, read))
+    except Exception as e:
+        return _players_offline(e)
@@ -97,7 +97,7 @@ def build_inventory_tree(pid: int, root_slot: int = 3) -> Dict:
                {", " + attr_col  if attr_col  else ""}
           FROM {table}
          WHERE {pcol} = %s
-    """, [pid])
+    """, [pid], row="record")
 
     items = [db._encode_item(r, count_col, attr_col) for r in rows]
     children: Dict[int, List[Dict]] = {}
@@ -170,7 +170,7 @@ def build_depot(pid: int, depot_filter: Optional[int] = None) -> Dict:
     if attr_col:  select_cols.append(attr_col)
     if depot_col: select_cols.append(depot_col)
 
-    rows = db.run("select", f"SELECT {', '.join(select_cols)} FROM {table} WHERE {where}", args)
+    rows = db.run("select", f"SELECT {', '.join(select_cols)} FROM {table} WHERE {where}", args, row="record")
 
     items: List[Dict] = []
     lockers: Dict[Optional[int], List[Dict]] = {}
@@ -272,7 +272,7 @@ def _character_snapshot(pid: int) -> dict:
             if cnt_c: sel.append(cnt_c)
             if atr_c: sel.append(atr_c)
             if dep_c: sel.append(dep_c)
-            rows = db.run("select", f"SELECT {', '.join(sel)} FROM {depot_info} WHERE {pcol}=%s", [pid])
+            rows = db.run("select", f"SELECT {', '.join(sel)} FROM {depot_info} WHERE {pcol}=%s", [pid], row="record")
             items = []
             for r in rows:
                 it = db._encode_item(r, cnt_c, atr_c)
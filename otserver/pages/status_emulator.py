@@ -0,0 +1,219 @@
+# pages/status_emulator.py
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import random
+import struct
+import threading
+import time
+from xml.sax.saxutils import quoteattr
+
+from .server_status import R_PLAYERS_COUNTS, R_PLAYERS_LIST
+
+# Test support: an asyncio TCP server speaking the game server's status protocol,
+#   [u16 len][0xFF 0xFF "info"]       -> framed TSQP XML
+#   [u16 len][0xFF 0x01][u16 flags]   -> framed 0x20 counts + 0x21 player list
+# with a configurable player list, latency and failure modes, so server_status.py
+# and the status views can be benchmarked without a game server:
+#
+#   with StatusEmulator(players=900, latency=(0.002, 0.010)) as emu:
+#       query_ot_players("127.0.0.1", emu.port)
+
+FAILURE_MODES = ("drop", "truncate", "garbage", "stall", "ratelimit")
+#   drop      close without answering
+#   truncate  announce the full length, send half of it
+#   garbage   a frame of random bytes
+#   stall     never answer (client hits its timeout)
+#   ratelimit TFS-style: a second request from the same IP within `rate_limit` s is dropped
+
+
+def synthetic_players(n: int, rng: random.Random) -> List[Tuple[str, int]]:
+    syll = ["ka", "ro", "mi", "zen", "dor", "ath", "el", "ur", "vex", "qua", "lo", "is"]
+    out = []
+    for k in range(n):
+        name = "".join(rng.choice(syll) for _ in range(rng.randint(2, 5))).capitalize()
+        out.append((f"{name} {k}" if rng.random() < 0.3 else name, rng.randint(1, 2000)))
+    return out
+
+
+def build_reply(players: Sequence[Tuple[str, int]], *, max_players: int = 0, peak: int = 0) -> bytes:
+    """Body of a status reply (without the u16 frame length): 0x20 counts + 0x21 list."""
+    out = bytearray()
+    out.append(R_PLAYERS_COUNTS)
+    out += struct.pack("<III", len(players), max_players or len(players), peak or len(players))
+    out.append(R_PLAYERS_LIST)
+    out += struct.pack("<I", len(players))
+    for name, level in players:
+        raw = name.encode("utf-8")
+        out += struct.pack("<H", len(raw)) + raw + struct.pack("<I", level)
+    return bytes(out)
+
+
+def build_info_xml(*, online: int, max_players: int, peak: int, uptime: int, name: str = "Emulated") -> bytes:
+    return (
+        '<?xml version="1.0"?>\n<tsqp version="1.0">'
+        f'<serverinfo uptime="{uptime}" ip="127.0.0.1" servername={quoteattr(name)} port="7172" '
+        'location="" url="" server="TFS" version="1.4" client="10.98"/>'
+        '<owner name="" email=""/>'
+        f'<players online="{online}" max="{max_players}" peak="{peak}"/>'
+        '<monsters total="0"/><npcs total="0"/>'
+        '<rates experience="1" skill="1" loot="1" magic="1" spawn="1"/>'
+        '<map name="emulated" author="" width="2048" height="2048"/>'
+        '<motd>emulated status server</motd></tsqp>'
+    ).encode("utf-8")
+
+
+class StatusEmulator:
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        players: int = 500,
+        max_players: int = 0,
+        latency: Tuple[float, float] = (0.0, 0.0),
+        failure_rate: float = 0.0,
+        failure_mode: str = "drop",
+        rate_limit: float = 0.0,
+        seed: int = 1,
+    ) -> None:
+        if failure_mode not in FAILURE_MODES:
+            raise ValueError(f"failure_mode must be one of {FAILURE_MODES}")
+        self.host, self.port = host, port
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.rate_limit = rate_limit if failure_mode == "ratelimit" else 0.0
+        self.rng = random.Random(seed)
+        self.started = time.time()
+        self.stats: Dict[str, int] = {"info": 0, "players": 0, "failed": 0, "bad_request": 0}
+        self._last_seen: Dict[str, float] = {}
+        self.set_players(synthetic_players(players, self.rng), max_players=max_players)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def set_players(self, players: Sequence[Tuple[str, int]], *, max_players: int = 0) -> None:
+        """Swap the online list (replies are pre-encoded; later requests see the new one)."""
+        self.players = list(players)
+        self.max_players = max_players or max(1000, len(self.players))
+        self.peak = max(getattr(self, "peak", 0), len(self.players))
+        body = build_reply(self.players, max_players=self.max_players, peak=self.peak)
+        if len(body) > 0xFFFF:
+            raise ValueError(f"{len(self.players)} players do not fit one u16-framed reply")
+        self._players_frame = self._frame(body)
+
+    @staticmethod
+    def _frame(body: bytes) -> bytes:
+        return struct.pack("<H", len(body)) + body
+
+    # ---------- protocol ----------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            hdr = await reader.readexactly(2)
+            body = await reader.readexactly(struct.unpack("<H", hdr)[0])
+            if len(body) < 2 or body[0] != 0xFF:
+                self.stats["bad_request"] += 1
+                return
+            if body[1] == 0xFF and body[2:6] == b"info":
+                kind = "info"
+            elif body[1] == 0x01:
+                kind = "players"
+            else:
+                self.stats["bad_request"] += 1
+                return
+
+            lo, hi = self.latency
+            if hi > 0:
+                await asyncio.sleep(self.rng.uniform(lo, hi))
+            if self._fails(writer):
+                self.stats["failed"] += 1
+                await self._fail(writer)
+                return
+
+            if kind == "info":
+                frame = self._frame(build_info_xml(
+                    online=len(self.players), max_players=self.max_players, peak=self.peak,
+                    uptime=int(time.time() - self.started),
+                ))
+            else:
+                frame = self._players_frame
+            self.stats[kind] += 1
+            writer.write(frame)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _fails(self, writer: asyncio.StreamWriter) -> bool:
+        if self.rate_limit:
+            ip = (writer.get_extra_info("peername") or ("?",))[0]
+            now = time.monotonic()
+            last = self._last_seen.get(ip, 0.0)
+            self._last_seen[ip] = now
+            return now - last < self.rate_limit
+        return self.failure_rate > 0 and self.rng.random() < self.failure_rate
+
+    async def _fail(self, writer: asyncio.StreamWriter) -> None:
+        mode = self.failure_mode
+        if mode == "truncate":
+            writer.write(self._players_frame[: max(3, len(self._players_frame) // 2)])
+            await writer.drain()
+        elif mode == "garbage":
+            junk = bytes(self.rng.randrange(256) for _ in range(self.rng.randint(1, 64)))
+            writer.write(self._frame(junk))
+            await writer.drain()
+        elif mode == "stall":
+            await self._closing.wait()
+        # "drop" / "ratelimit": just close
+
+    # ---------- lifecycle ----------
+
+    async def serve(self) -> asyncio.AbstractServer:
+        """Start listening on the running loop (for asyncio callers)."""
+        self._closing = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    def start(self) -> "StatusEmulator":
+        """Run on a background thread with its own loop (for sync callers)."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.serve())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="status-emulator", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        loop, server = self._loop, self._server
+
+        async def shutdown():
+            server.close()
+            self._closing.set()   # releases stalled handlers
+            pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            await asyncio.gather(*pending, return_exceptions=True)
+            await server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(5)
+        loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "StatusEmulator":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
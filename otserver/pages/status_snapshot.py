@@ -0,0 +1,120 @@
+# pages/status_snapshot.py
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import profiling
+from .server_status import query_ot_status, query_ot_players
+from .swr import swr_get, swr_set
+
+log = logging.getLogger(__name__)
+
+# Game-server status as last seen by `manage.py status_poller`, one entry per
+# status endpoint (host, port) and kind ("info" = TSQP XML, "players" = binary list):
+#   ot_status:{kind}:{host}:{port} -> {"ts": unix time, "data": <query_ot_* result>}
+# Views read these and never open sockets, unless the entry is missing/stale
+# and OT_STATUS_LIVE_FALLBACK is on (deployments without the poller): then the
+# entry is a pages.swr stale-while-revalidate key and one request refreshes it.
+
+MIN_INTERVAL: int = int(getattr(settings, "OT_STATUS_MIN_INTERVAL", 15))   # poller: players refresh
+INFO_INTERVAL: int = int(getattr(settings, "OT_STATUS_INFO_INTERVAL", 60))  # poller: info refresh
+MAX_AGE: int = int(getattr(settings, "OT_STATUS_MAX_AGE", 45))            # players stale after; info gets +INFO_INTERVAL
+LIVE_FALLBACK: bool = bool(getattr(settings, "OT_STATUS_LIVE_FALLBACK", True))
+KEEP: int = max(MAX_AGE, INFO_INTERVAL) * 10  # stale entries still beat nothing
+
+INFO = "info"
+PLAYERS = "players"
+_KEY = "ot_status:{kind}:{host}:{port}"
+
+Endpoint = Tuple[str, int]
+
+
+def default_endpoint() -> Endpoint:
+    return str(settings.OT_STATUS_HOST), int(settings.OT_STATUS_PORT)
+
+
+def world_endpoint(w: Mapping[str, Any]) -> Endpoint:
+    """Status endpoint of a `worlds` row: ip (else OT_STATUS_HOST), status_port, else port, else OT_STATUS_PORT."""
+    host = w.get("ip") or settings.OT_STATUS_HOST
+    port = w.get("status_port") or w.get("port") or getattr(settings, "OT_STATUS_PORT", 7171)
+    return str(host), int(port)
+
+
+def endpoints(db) -> List[Endpoint]:
+    """Every endpoint a view may ask about: OT_STATUS_HOST/PORT plus one per world (deduplicated)."""
+    out = {default_endpoint(): None}
+    try:
+        cols = "id, ip, port" + (", status_port" if db._has_column("worlds", "status_port") else "")
+        for w in db.run("select", f"SELECT {cols} FROM worlds ORDER BY id") or []:
+            out.setdefault(world_endpoint(w), None)
+    except Exception:
+        log.debug("no worlds table; polling the default status endpoint only", exc_info=True)
+    return list(out)
+
+
+# ---------- read/write ----------
+
+def _max_age(kind: str) -> int:
+    return MAX_AGE + (INFO_INTERVAL if kind == INFO else 0)
+
+
+def publish(kind: str, endpoint: Endpoint, data: Dict[str, Any], *, ts: Optional[float] = None) -> None:
+    host, port = endpoint
+    swr_set(_KEY.format(kind=kind, host=host, port=port), data, _max_age(kind), KEEP, ts=ts)
+
+
+def read(kind: str, endpoint: Endpoint) -> Optional[Dict[str, Any]]:
+    """The raw entry ({"ts", "data"}) or None."""
+    host, port = endpoint
+    return cache.get(_KEY.format(kind=kind, host=host, port=port))
+
+
+def _offline(kind: str, error: str) -> Dict[str, Any]:
+    if kind == PLAYERS:
+        return {"online": False, "error": error, "players": {"online": 0, "peak": 0}, "list": []}
+    return {"online": False, "error": error}
+
+
+def _query_live(kind: str, endpoint: Endpoint) -> Dict[str, Any]:
+    host, port = endpoint
+    timeout = float(getattr(settings, "OT_STATUS_TIMEOUT", 3.0))
+    retries = int(getattr(settings, "OT_STATUS_RETRIES", 1))
+    backoff = float(getattr(settings, "OT_STATUS_RETRY_DELAY", 1.0))
+    with profiling.span("status"):
+        if kind == PLAYERS:
+            return query_ot_players(host, port, timeout, retries=retries, backoff=backoff)
+        try:
+            return query_ot_status(host, port, timeout=timeout, retries=retries, backoff=backoff)
+        except Exception as e:
+            return {"online": False, "error": str(e)}
+
+
+def get(kind: str, endpoint: Optional[Endpoint] = None) -> Dict[str, Any]:
+    """
+    Latest status for `endpoint` (default: OT_STATUS_HOST/PORT), in the shape of
+    query_ot_status() / query_ot_players() (offline dict instead of raising).
+    Stale or missing -> one request refreshes it live when OT_STATUS_LIVE_FALLBACK
+    is on; everyone else gets the stale copy (or waits for the first one).
+    """
+    endpoint = endpoint or default_endpoint()
+    host, port = endpoint
+    key = _KEY.format(kind=kind, host=host, port=port)
+    if LIVE_FALLBACK:
+        timeout = float(getattr(settings, "OT_STATUS_TIMEOUT", 3.0))
+        return swr_get(key, lambda: _query_live(kind, endpoint), _max_age(kind), KEEP,
+                       lock_timeout=timeout * 3 + 5)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry["data"]
+    return _offline(kind, "Status not available yet.")
+
+
+def info(endpoint: Optional[Endpoint] = None) -> Dict[str, Any]:
+    return get(INFO, endpoint)
+
+
+def players(endpoint: Optional[Endpoint] = None) -> Dict[str, Any]:
+    return get(PLAYERS, endpoint)
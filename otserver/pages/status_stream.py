@@ -0,0 +1,271 @@
+# pages/status_stream.py
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+import asyncio
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import status_snapshot
+from .status_snapshot import Endpoint
+
+log = logging.getLogger(__name__)
+
+# Server-Sent Events for the status showbox and the online page, served straight
+# from the ASGI callable (main/asgi.py) so an open stream costs a coroutine, not a
+# worker thread. Per process and per world, one Channel task reads the status
+# snapshot every OT_STATUS_STREAM_TICK seconds and fans the change out to every
+# subscriber as one pre-encoded event:
+#   event: snapshot  {"online", "players": counts, "uptime_sec", "list": [...], "ts"}
+#   event: delta     {"online", "players", "uptime_sec", "joined": [...], "left": [names], "levels": {name: lvl}, "ts"}
+# ?list=0 (the showbox) subscribes to counts/uptime only: no list, no joined/left.
+# Off unless OT_STATUS_STREAM_PATH is set, which only makes sense under ASGI: the
+# templates then open the stream; with it empty (WSGI/mod_wsgi) the JS just polls.
+
+STREAM_PATH: str = getattr(settings, "OT_STATUS_STREAM_PATH", "")
+TICK: float = float(getattr(settings, "OT_STATUS_STREAM_TICK", 1.0))
+KEEPALIVE: float = float(getattr(settings, "OT_STATUS_STREAM_KEEPALIVE", 15.0))
+MAX_CLIENTS: int = int(getattr(settings, "OT_STATUS_STREAM_MAX", 5000))
+QUEUE_SIZE = 16       # events buffered per client before it gets a fresh snapshot instead
+IDLE_GRACE = 30.0     # seconds a channel keeps running after its last subscriber left
+
+
+def _event(name: str, seq: int, data: Dict[str, Any]) -> bytes:
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return f"id: {seq}\nevent: {name}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def push(self, event: Optional[bytes]) -> None:
+        """Queue an event; a client that fell behind is reset to "send a snapshot" (None)."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class Channel:
+    """One world's stream in this process: the last state plus its subscribers."""
+
+    def __init__(self, endpoint: Endpoint, world_id: Optional[int], with_list: bool = True) -> None:
+        self.endpoint = endpoint
+        self.world_id = world_id
+        self.with_list = with_list
+        self.subscribers: Set[Subscriber] = set()
+        self.seq = 0
+        self.state: Dict[str, Any] = {"online": False, "players": {}, "uptime_sec": 0, "ts": 0.0}
+        self.by_name: Dict[str, Dict[str, Any]] = {}   # casefolded name -> enriched entry
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[bytes] = None
+
+    # ---------- subscribers ----------
+
+    def subscribe(self) -> Subscriber:
+        sub = Subscriber()
+        self.subscribers.add(sub)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self.subscribers.discard(sub)
+
+    def snapshot_event(self) -> bytes:
+        if self._snapshot is None:
+            data = {**self.state, "list": list(self.by_name.values())} if self.with_list else self.state
+            self._snapshot = _event("snapshot", self.seq, data)
+        return self._snapshot
+
+    def broadcast(self, event: bytes) -> None:
+        for sub in tuple(self.subscribers):
+            sub.push(event)
+
+    # ---------- polling the snapshot ----------
+
+    def _read(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return status_snapshot.players(self.endpoint), status_snapshot.info(self.endpoint)
+
+    def _enrich(self, players: List[dict]) -> List[dict]:
+        from .views import _enrich_online_players
+        close_old_connections()
+        try:
+            return _enrich_online_players(players, self.world_id)
+        finally:
+            close_old_connections()
+
+    async def run(self) -> None:
+        idle_since: Optional[float] = None
+        try:
+            while True:
+                if self.subscribers:
+                    idle_since = None
+                elif idle_since is None:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since > IDLE_GRACE:
+                    return
+                try:
+                    await self.refresh()
+                except Exception:
+                    log.warning("status stream refresh failed for %s:%s", *self.endpoint, exc_info=True)
+                self.ready.set()
+                await asyncio.sleep(TICK)
+        finally:
+            self.ready.set()
+
+    async def refresh(self) -> None:
+        players, info = await sync_to_async(self._read, thread_sensitive=False)()
+        online = bool(players.get("online"))
+        listed = {}
+        if online and self.with_list:
+            listed = {p["name"].casefold(): p for p in players.get("list", []) if p.get("name")}
+
+        joined = [p for key, p in listed.items() if key not in self.by_name]
+        left = [self.by_name[key]["name"] for key in self.by_name if key not in listed]
+        levels = {
+            p["name"]: p.get("level", 0) for key, p in listed.items()
+            if key in self.by_name and self.by_name[key].get("level") != p.get("level")
+        }
+        head = {
+            "online": online,
+            "players": players.get("players", {}),
+            "uptime_sec": int((info.get("server") or {}).get("uptime_sec", 0)) if info.get("online") else 0,
+        }
+        if not (joined or left or levels) and all(self.state.get(k) == v for k, v in head.items()):
+            return
+
+        if joined:
+            joined = await sync_to_async(self._enrich, thread_sensitive=False)(joined)
+        for name in left:
+            self.by_name.pop(name.casefold(), None)
+        for p in joined:
+            self.by_name[p["name"].casefold()] = p
+        for name, lvl in levels.items():
+            self.by_name[name.casefold()]["level"] = lvl
+
+        self.seq += 1
+        self.state = {**head, "ts": time.time()}
+        self._snapshot = None
+        data = {**self.state, "joined": joined, "left": left, "levels": levels} if self.with_list else self.state
+        self.broadcast(_event("delta", self.seq, data))
+
+
+class Broadcaster:
+    """Per-process registry of channels, keyed by (endpoint, world id, with_list)."""
+
+    def __init__(self) -> None:
+        self.channels: Dict[Tuple[Endpoint, Optional[int], bool], Channel] = {}
+
+    @property
+    def clients(self) -> int:
+        return sum(len(c.subscribers) for c in self.channels.values())
+
+    def channel(self, endpoint: Endpoint, world_id: Optional[int], with_list: bool = True) -> Channel:
+        key = (endpoint, world_id, with_list)
+        ch = self.channels.get(key)
+        if ch is None:
+            ch = self.channels[key] = Channel(endpoint, world_id, with_list)
+        return ch
+
+
+broadcaster = Broadcaster()
+
+
+def _resolve(world: Optional[str]) -> Tuple[Endpoint, Optional[int]]:
+    """No ?world= -> OT_STATUS_HOST/PORT (the showbox); else the online page's world."""
+    if not world:
+        return status_snapshot.default_endpoint(), None
+    from .views import _status_world
+    close_old_connections()
+    try:
+        endpoint, world_id, _ = _status_world(world)
+        return endpoint, world_id
+    finally:
+        close_old_connections()
+
+
+class StatusStreamApp:
+    """ASGI wrapper: serves STREAM_PATH itself, hands everything else to `app` (Django)."""
+
+    def __init__(self, app, path: str = STREAM_PATH) -> None:
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.path or scope["path"] != self.path:
+            return await self.app(scope, receive, send)
+        if scope["method"] != "GET":
+            return await self._plain(send, 405, b"Method Not Allowed")
+        if broadcaster.clients >= MAX_CLIENTS:
+            return await self._plain(send, 503, b"Too many listeners", [(b"retry-after", b"30")])
+
+        qs = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            endpoint, world_id = await sync_to_async(_resolve, thread_sensitive=False)((qs.get("world") or [""])[0])
+        except Exception:
+            log.warning("status stream: cannot resolve world", exc_info=True)
+            return await self._plain(send, 503, b"Status unavailable")
+        with_list = (qs.get("list") or ["1"])[0] != "0"
+        await self.stream(broadcaster.channel(endpoint, world_id, with_list), receive, send)
+
+    async def stream(self, channel: Channel, receive, send) -> None:
+        sub = channel.subscribe()
+
+        async def disconnected():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        gone = asyncio.ensure_future(disconnected())
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache, no-transform"),
+                (b"x-accel-buffering", b"no"),   # nginx: don't buffer the stream
+            ]})
+            ready = asyncio.ensure_future(channel.ready.wait())
+            await asyncio.wait({gone, ready}, return_when=asyncio.FIRST_COMPLETED)
+            ready.cancel()
+            if gone.done():
+                return
+            # the snapshot already covers anything queued so far
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+            await send({"type": "http.response.body", "body": b"retry: 5000\n\n" + channel.snapshot_event(),
+                        "more_body": True})
+            while True:
+                nxt = asyncio.ensure_future(sub.queue.get())
+                done, _ = await asyncio.wait({nxt, gone}, timeout=KEEPALIVE, return_when=asyncio.FIRST_COMPLETED)
+                if gone in done:
+                    nxt.cancel()
+                    return
+                if nxt in done:
+                    body = nxt.result()
+                    if body is None:   # fell behind: resync
+                        body = channel.snapshot_event()
+                else:
+                    nxt.cancel()
+                    body = b": ping\n\n"
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+        except OSError:
+            pass
+        finally:
+            gone.cancel()
+            channel.unsubscribe(sub)
+
+    @staticmethod
+    async def _plain(send, status: int, body: bytes, headers=()) -> None:
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"text/plain; charset=utf-8"), *headers]})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,132 @@
+# pages/swr.py
+from __future__ import annotations
+from functools import wraps
+from typing import Any, Callable, Optional, Union
+import logging
+import math
+import time
+
+from django.core.cache import cache
+
+log = logging.getLogger(__name__)
+
+# Stale-while-revalidate on the shared Django cache (CACHES, see settings.py):
+#   entry  {key}      -> {"ts": written at, "data": value}, kept ttl + stale_ttl seconds
+#   lock   {key}:lock -> cache.add() winner refreshes
+# Fresh (< ttl): served. Stale: the lock winner refreshes, everyone else gets
+# the stale value immediately. Missing: the lock winner computes, the rest wait.
+# "One refresher" holds only where cache.add() is atomic (redis, memcached).
+# On the file-based default it is has_key() + set(), so across processes a few
+# callers can win at once: duplicate refreshes, never wrong data.
+#
+#   @swr_cached("ot_discord_online", ttl=60, stale_ttl=3600)
+#   def fetch_discord_online(): ...
+#
+#   value = swr_get(f"ot_status:{kind}:{host}:{port}", lambda: query(...), ttl=45, stale_ttl=600)
+#   swr_set(key, value, ttl=45, stale_ttl=600)   # push from a producer (status_poller)
+
+
+def swr_set(key: str, value: Any, ttl: float, stale_ttl: float, *, ts: Optional[float] = None) -> None:
+    cache.set(key, {"ts": ts or time.time(), "data": value}, math.ceil(ttl + stale_ttl))
+
+
+class RefreshFailed(RuntimeError):
+    """A cold-miss refresh of the key failed moments ago; raised without calling fn() again."""
+
+
+def _refresh(key: str, fn: Callable[[], Any], ttl: float, stale_ttl: float, entry: Optional[dict],
+             error_ttl: float = 0) -> Any:
+    try:
+        value = fn()
+    except Exception as e:
+        if entry is None:
+            if error_ttl > 0:   # before the lock is released, so waiters see it
+                cache.set(f"{key}:error", repr(e), math.ceil(error_ttl))
+            raise
+        log.warning("swr refresh of %s failed; serving stale value", key, exc_info=True)
+        return entry["data"]
+    swr_set(key, value, ttl, stale_ttl)
+    return value
+
+
+def swr_get(
+    key: str,
+    fn: Callable[[], Any],
+    ttl: float,
+    stale_ttl: float,
+    *,
+    lock_timeout: float = 30.0,
+    wait: Optional[float] = None,
+    error_ttl: float = 5.0,
+) -> Any:
+    """
+    Cached value of fn() under `key`. `lock_timeout` bounds how long a crashed
+    refresher blocks others; on a cold miss, callers that lose the lock poll for
+    up to `wait` seconds (default lock_timeout), taking the lock over once it is
+    free, before computing it themselves. A failed cold-miss refresh is
+    remembered for `error_ttl` seconds: until then callers get RefreshFailed
+    instead of all calling fn() again.
+    """
+    entry = cache.get(key)
+    if entry is not None and time.time() - entry["ts"] < ttl:
+        return entry["data"]
+
+    lock = f"{key}:lock"
+    error = f"{key}:error"
+    if entry is None and error_ttl > 0:
+        failed = cache.get(error)
+        if failed is not None:
+            raise RefreshFailed(f"{key}: {failed}")
+
+    def locked() -> Any:
+        try:
+            return _refresh(key, fn, ttl, stale_ttl, entry, error_ttl)
+        finally:
+            cache.delete(lock)
+
+    if cache.add(lock, 1, math.ceil(lock_timeout)):
+        return locked()
+    if entry is not None:
+        return entry["data"]
+
+    deadline = time.time() + (lock_timeout if wait is None else wait)
+    while time.time() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["data"]
+        failed = cache.get(error) if error_ttl > 0 else None
+        if failed is not None:
+            raise RefreshFailed(f"{key}: {failed}")
+        if cache.add(lock, 1, math.ceil(lock_timeout)):   # the refresher is gone
+            return locked()
+    return _refresh(key, fn, ttl, stale_ttl, None, error_ttl)
+
+
+def swr_cached(
+    key: Union[str, Callable[..., str]],
+    ttl: float,
+    stale_ttl: float,
+    *,
+    lock_timeout: float = 30.0,
+    wait: Optional[float] = None,
+    error_ttl: float = 5.0,
+):
+    """
+    Decorator form of swr_get(). `key` is a str.format template filled with the
+    call's arguments ("ot_status:{0}:{1}") or a callable returning the key.
+    The wrapper gets .key(*args) and .invalidate(*args).
+    """
+    def make_key(*args, **kwargs) -> str:
+        return key(*args, **kwargs) if callable(key) else key.format(*args, **kwargs)
+
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            return swr_get(make_key(*args, **kwargs), lambda: fn(*args, **kwargs), ttl, stale_ttl,
+                           lock_timeout=lock_timeout, wait=wait, error_ttl=error_ttl)
+
+        wrapper.key = make_key
+        wrapper.invalidate = lambda *args, **kwargs: cache.delete(make_key(*args, **kwargs))
+        return wrapper
+    return deco
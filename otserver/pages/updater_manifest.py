@@ -0,0 +1,219 @@
+# pages/updater_manifest.py
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+from . import checksums
+
+log = logging.getLogger(__name__)
+
+# The OTClient update manifest (/api/, /api/updater.php) without hashing on request.
+# A per-process index maps every published file to its CRC32, keyed on the file's
+# (size, mtime_ns, inode); a rescan only stats the tree and rehashes what changed.
+# The index is mirrored to OT_UPDATER_INDEX_PATH so a fresh worker starts warm,
+# and the manifest JSON is kept pre-serialized per binary, so a request is a dict
+# lookup plus, at most every OT_UPDATER_RESCAN seconds, one stat walk.
+
+API_DIR = Path(getattr(settings, "OT_UPDATER_API_DIR", "/srv/django_otwebsite/otserver/api")).resolve()
+FILES_AND_DIRS = ["init.lua", "data", "modules", "mods", "layouts"]
+BASE_URL = "https://retrowarot.com/api/"
+MANUAL_VERSION = "1.0.0"  # 🔧 Increase this whenever you want clients to re-update
+
+BINARIES = {
+    "WIN32-WGL":       "Retrowar_gl.exe",
+    "WIN32-EGL":       "Retrowar_dx.exe",
+    "WIN32-WGL-GCC":   "Retrowar_gcc_gl.exe",
+    "WIN32-EGL-GCC":   "Retrowar_gcc_dx.exe",
+    "X11-GLX":         "Retrowar_linux",
+    "X11-EGL":         "Retrowar_linux",
+    "ANDROID-EGL":     "",
+    "ANDROID64-EGL":   "",
+}
+
+URL_UNSAFE = re.compile(r"[ \t\(\)]")  # space, tab, parentheses
+
+RESCAN: float = float(getattr(settings, "OT_UPDATER_RESCAN", 5))
+INDEX_PATH: Optional[str] = getattr(settings, "OT_UPDATER_INDEX_PATH", None)
+HASH_WORKERS: int = int(getattr(settings, "OT_UPDATER_HASH_WORKERS", 0))   # 0 = checksums.default_workers()
+_INDEX_FORMAT = 1
+
+def _scan_dir(path: str, prefix: str) -> Iterator[Tuple[str, os.stat_result]]:
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            rel = prefix + entry.name
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():   # like os.walk: no descent into linked dirs
+                        yield from _scan_dir(entry.path, rel + "/")
+                elif not URL_UNSAFE.search(rel):
+                    yield rel, entry.stat()
+            except OSError:   # vanished mid-walk
+                continue
+
+
+def walk(api_dir: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """(relative posix path, stat) of every file the manifest publishes."""
+    for top in FILES_AND_DIRS:
+        start = api_dir / top
+        if start.is_file():
+            yield top, start.stat()
+        elif start.is_dir():
+            yield from _scan_dir(str(start), top + "/")
+
+
+class ManifestIndex:
+    """rel path -> (size, mtime_ns, inode, crc) for one API_DIR, plus the serialized manifests."""
+
+    def __init__(self, api_dir: Path = API_DIR, index_path: Optional[str] = INDEX_PATH, *,
+                 rescan: float = RESCAN, workers: int = HASH_WORKERS, processes: bool = False) -> None:
+        self.api_dir = Path(api_dir)
+        self.index_path = Path(index_path) if index_path else None
+        self.rescan = rescan
+        self.workers = workers
+        self.processes = processes
+        self.last_hashed: List[checksums.FileChecksum] = []
+        self.entries: Dict[str, Tuple[int, int, int, str]] = {}
+        self.checked_at = 0.0
+        self.generation = 0
+        self._manifests: Dict[str, bytes] = {}   # binary name ("" = none) -> JSON bytes
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    # ---------- scanning ----------
+
+    def refresh(self, *, force: bool = False, full: bool = False) -> bool:
+        """
+        Stat the tree and rehash new/changed files (`full`: every file). Returns
+        True if the manifest changed. Without `force`, at most once per `rescan`
+        seconds; while one thread rescans, the others keep serving the previous manifest.
+        """
+        if not force and time.monotonic() - self.checked_at < self.rescan and self._loaded:
+            return False
+        if not self._lock.acquire(blocking=force or not self._loaded):
+            return False
+        try:
+            if not force and time.monotonic() - self.checked_at < self.rescan and self._loaded:
+                return False
+            if not self._loaded:
+                self._load()
+            changed = self._scan(full)
+            self.checked_at = time.monotonic()
+            return changed
+        finally:
+            self._lock.release()
+
+    def _scan(self, full: bool = False) -> bool:
+        seen = set()
+        todo: List[Tuple[str, Tuple[int, int, int]]] = []
+        for rel, st in walk(self.api_dir):
+            seen.add(rel)
+            key = (st.st_size, st.st_mtime_ns, st.st_ino)
+            old = self.entries.get(rel)
+            if full or old is None or old[:3] != key:
+                todo.append((rel, key))
+        gone = self.entries.keys() - seen
+
+        fresh: Dict[str, Tuple[int, int, int, str]] = {}
+        self.last_hashed = []
+        if todo:
+            try:
+                self.last_hashed = checksums.checksum_many(
+                    [self.api_dir / rel for rel, _ in todo], sizes=[key[0] for _, key in todo],
+                    workers=self.workers, processes=self.processes,
+                )
+            except OSError:   # something changed under us; the next rescan picks it up
+                log.warning("updater: hashing failed, keeping the previous manifest", exc_info=True)
+                return False
+            for (rel, key), res in zip(todo, self.last_hashed):
+                if full and self.entries.get(rel) == (*key, res.crc):
+                    continue
+                fresh[rel] = (*key, res.crc)
+        if not fresh and not gone:
+            return False
+        self.apply(fresh, gone)
+        return True
+
+    def apply(self, fresh: Dict[str, Tuple[int, int, int, str]], gone=()) -> None:
+        """Swap in new entries (readers see the old or the new dict, never a half-built one)."""
+        entries = {rel: e for rel, e in self.entries.items() if rel not in gone}
+        entries.update(fresh)
+        self.entries = entries
+        self._manifests = {}
+        self.generation += 1
+        log.info("updater: manifest now %d files (%d rehashed, %d removed)", len(entries), len(fresh), len(gone))
+        self._save()
+
+    # ---------- on-disk copy ----------
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.index_path or not self.index_path.is_file():
+            return
+        try:
+            data = json.loads(self.index_path.read_bytes())
+            if data.get("format") != _INDEX_FORMAT or data.get("api_dir") != str(self.api_dir):
+                return
+            self.entries = {rel: tuple(e) for rel, e in data["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            log.warning("updater: ignoring unreadable index %s", self.index_path, exc_info=True)
+
+    def _save(self) -> None:
+        if not self.index_path:
+            return
+        tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"format": _INDEX_FORMAT, "api_dir": str(self.api_dir),
+                                       "files": self.entries}, separators=(",", ":")))
+            os.replace(tmp, self.index_path)
+        except OSError:
+            log.warning("updater: cannot write index %s", self.index_path, exc_info=True)
+
+    # ---------- manifests ----------
+
+    def manifest(self, binary: str = "") -> Dict[str, Any]:
+        entries = self.entries
+        manifest: Dict[str, Any] = {
+            "url": BASE_URL,
+            "files": {rel: e[3] for rel, e in sorted(entries.items())},
+            "keepFiles": True,
+            "version": MANUAL_VERSION,  # 🧩 Added manual version
+        }
+        if binary:
+            found = [rel for rel in manifest["files"] if rel.endswith("/" + binary)]
+            if found:
+                manifest["binary"] = {"file": found[-1], "checksum": manifest["files"][found[-1]]}
+        return manifest
+
+    def manifest_bytes(self, platform: Optional[str] = None) -> bytes:
+        """The manifest JSON for an OTClient platform string, serialized once per change."""
+        self.refresh()
+        binary = BINARIES.get(platform or "", "") or ""
+        manifests = self._manifests
+        body = manifests.get(binary)
+        if body is None:
+            body = json.dumps(self.manifest(binary), indent=2).encode("utf-8")
+            manifests[binary] = body
+        return body
+
+    def checksum(self, rel: str, st: os.stat_result) -> Optional[str]:
+        """The indexed CRC of `rel`, if the index entry still matches this stat of it."""
+        entry = self.entries.get(rel)
+        if entry is not None and entry[:3] == (st.st_size, st.st_mtime_ns, st.st_ino):
+            return entry[3]
+        return None
+
+
+index = ManifestIndex()
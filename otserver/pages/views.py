@@ -4,7 +4,6 @@ from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
 from django.shortcuts import render, redirect
 from django.conf import settings
-from django.core.cache import cache
 from django.http import JsonResponse, Http404, HttpResponseBadRequest, HttpResponse
 from django.utils.html import escape
 from django.urls import reverse
@@ -27,8 +26,10 @@ import requests
 
 from typing import Dict, List, Optional
 from .forms import EmailUpdateForm, SignUpForm, CreateCharacterForm, VOCATION_CHOICES
-from .server_status import query_ot_status, query_ot_players
+from . import online_history, presence, status_snapshot
 from .db import DB
+from .swr import swr_cached
+from . import profiling
 from .items_service import SLOT_NAMES
 from urllib.parse import urlencode
 from .auth_backends import OT_PASSWORD_TYPE, OT_ACCOUNT_TABLE, OT_PASSWORD_COL, OT_EMAIL_COL, OT_BLOCKED_COL
@@ -37,7 +38,8 @@ User = get_user_model()
 log = logging.getLogger(__name__)
 
 db = DB(retries=2)
-OT_DB_ALIAS = getattr(settings, "OT_DB_ALIAS", "retrowar")  # or "otserv" if you use a 2nd DB
+primary_db = DB(db.alias, retries=2)   # reads on the primary too (read_alias = alias)
+OT_DB_ALIAS = getattr(settings, "OT_DB_ALIAS", "default")
 OT_BLOCKED_COL = None
 PLAYERS_TBL  = getattr(settings, "OT_PLAYERS_TABLE", "players")
 ACC_COL      = getattr(settings, "OT_PLAYERS_ACCOUNT_COL", "account_id")
@@ -91,15 +93,16 @@ def account_manage(request):
                 FROM players
                 WHERE account_id = %s
             ORDER BY name ASC
-        """, [acc_id])
+        """, [acc_id], cache_ttl=60, tags=(f"account:{acc_id}",))
+        online = presence.online_many(c["id"] for c in characters)
         for c in characters:
-            c["online"] = 0
+            c["online"] = int(c["id"] in online)
 
     coins = db.run("select", """
             SELECT coins
                 FROM accounts
                 WHERE id = %s
-        """, [acc_id])
+        """, [acc_id], cache_ttl=60, tags=(f"wallet:{acc_id}",))
     return render(request, "pages/account_manage.html", {
         "email_form": email_form,
         "characters": characters,
@@ -151,7 +154,8 @@ def highscores(request):
             selected_world_id = None
 
     # load worlds for sidebar
-    worlds = db.run("select", "SELECT id, name FROM worlds ORDER BY id", {}) or []
+    worlds = db.run("select", "SELECT id, name FROM worlds ORDER BY id", {},
+                    cache_ttl=300, tags=("worlds",)) or []
 
     # --- base query (now with WHERE that we build up) ---
     base_sql = """
@@ -178,24 +182,46 @@ def highscores(request):
     # order
     order_by = f"{SKILL_COLUMNS[selected_skill]} DESC, p.name ASC"
 
-    rows, meta = db.run(
-        "paginate",
-        base_sql,
-        params,
-        order_by=order_by,
-        page=page,
-        per_page=25,
-    )
+    # Default and Next/Prev use keyset cursors (constant cost at any depth, and only
+    # a planner estimate for the page count); explicit ?page=N (numbered/First/Last
+    # links, old URLs) uses offsets.
+    cursor = request.GET.get("cursor")
+    if cursor or "page" not in request.GET:
+        rows, meta = db.run(
+            "seek",
+            base_sql,
+            params,
+            keys=(f"{SKILL_COLUMNS[selected_skill]} DESC", "p.name ASC"),
+            cursor=cursor,
+            per_page=25,
+            with_total="estimate",
+            count_ttl=60,
+            cache_ttl=30,
+            tags=("players",),
+        )
+    else:
+        rows, meta = db.run(
+            "paginate",
+            base_sql,
+            params,
+            order_by=order_by,
+            page=page,
+            per_page=25,
+            count_ttl=60,
+            cache_ttl=30,
+            tags=("players",),
+        )
 
     # pager window
     window = 2
     start = max(1, meta["page"] - window)
-    end = min(meta["total_pages"], meta["page"] + window)
+    end = min(meta["total_pages"] or meta["page"] + meta["has_next"], meta["page"] + window)
     page_range = range(start, end + 1)
 
-    # build querystring minus page
+    # build querystring minus page/cursor
     q = request.GET.copy()
     q.pop("page", None)
+    q.pop("cursor", None)
     querystring = q.urlencode()
 
     # helpful label for template title
@@ -216,6 +242,8 @@ def highscores(request):
         "has_prev": meta["has_prev"],
         "has_next": meta["has_next"],
         "start_index": meta["start_index"],
+        "next_cursor": meta.get("next_cursor"),
+        "prev_cursor": meta.get("prev_cursor"),
         "querystring": querystring,
 
         # filters panel
@@ -232,36 +260,8 @@ def highscores(request):
 
 @require_GET
 def server_status(request):
-    host = settings.OT_STATUS_HOST
-    port = int(settings.OT_STATUS_PORT)
-    timeout = float(getattr(settings, "OT_STATUS_TIMEOUT", 3.0))
-    min_interval = int(getattr(settings, "OT_STATUS_MIN_INTERVAL", 15))  # seconds
-    retries = int(getattr(settings, "OT_STATUS_RETRIES", 1))
-    backoff = float(getattr(settings, "OT_STATUS_RETRY_DELAY", 1.0))
-
-    now = time.time()
-    last_ts = cache.get("ot_status_last_ts", 0.0)
-    cached = cache.get("ot_status_json")
-
-    if cached and (now - last_ts) < min_interval:
-        return JsonResponse(cached)
-
-    # single-flight guard (5s)
-    if not cache.add("ot_status_lock", "1", timeout=5):
-        # someone else is querying, serve whatever we have
-        if cached:
-            return JsonResponse(cached)
-
-    try:
-        try:
-            data = query_ot_status(host, port, timeout=timeout, retries=retries, backoff=backoff)
-        except Exception as e:
-            data = {"online": False, "error": str(e)}
-        cache.set("ot_status_json", data, 120)
-        cache.set("ot_status_last_ts", time.time(), 120)
-        return JsonResponse(data)
-    finally:
-        cache.delete("ot_status_lock")
+    # kept fresh by `manage.py status_poller`; see pages/status_snapshot.py
+    return JsonResponse(status_snapshot.info())
 
 
 
@@ -275,16 +275,11 @@ def _fmt_uptime(secs: int) -> str:
     return f"{m}m"
 
 def server_info(request):
-    try:
-        data = query_ot_status(
-            settings.OT_STATUS_HOST,
-            settings.OT_STATUS_PORT,
-            getattr(settings, "OT_STATUS_TIMEOUT", 5.0),
-            retries=1, backoff=1.2,
-        )
+    data = status_snapshot.info()
+    if data.get("online"):
         uptime_human = _fmt_uptime(data["server"].get("uptime_sec", 0))
-    except Exception as e:
-        data = {"online": False, "error": str(e), "players": {"online": 0, "max": 0, "peak": 0},
+    else:
+        data = {"online": False, "error": data.get("error", ""), "players": {"online": 0, "max": 0, "peak": 0},
                 "server": {"uptime_sec": 0}, "rates": {}, "map": {}, "motd": ""}
         uptime_human = "—"
 
@@ -295,130 +290,125 @@ def server_info(request):
 
 
 
-def server_players(request):
-    # 1) Pick world (default = first world)
+def _enrich_online_players(players: List[dict], world_id: Optional[int] = None) -> List[dict]:
+    """Add outfit/country columns from the DB to status-port player entries (updated in place)."""
+    names = [p.get("name") for p in players if p.get("name")]
+    if not names:
+        return players
+    # Dedup while preserving order
+    uniq = list({n: None for n in names}.keys())
+
+    # Detect FK to accounts (account_id vs accountid)
+    acc_fk = "account_id" if db._has_column("players", "account_id") else ("accountid" if db._has_column("players", "accountid") else None)
+    if not acc_fk:
+        raise RuntimeError("players table has no account FK column (account_id/accountid)")
+
+    # Helper: if column exists use it, else constant alias
+    def col_or_zero(tbl, col, alias=None):
+        alias = alias or col
+        return (f"{tbl}.{col} AS {alias}") if db._has_column("players", col) else (f"0 AS {alias}")
+
+    sel_looktype   = col_or_zero("p", "looktype")
+    sel_lookaddons = col_or_zero("p", "lookaddons")
+    sel_lookhead   = col_or_zero("p", "lookhead")
+    sel_lookbody   = col_or_zero("p", "lookbody")
+    sel_looklegs   = col_or_zero("p", "looklegs")
+    sel_lookfeet   = col_or_zero("p", "lookfeet")
+
+    # Mount column varies or may be absent; try common aliases
+    if db._has_column("players", "lookmount"):
+        sel_lookmount = "p.lookmount AS lookmount"
+    elif db._has_column("players", "mount"):
+        sel_lookmount = "p.mount AS lookmount"
+    elif db._has_column("players", "lookmountid"):
+        sel_lookmount = "p.lookmountid AS lookmount"
+    else:
+        sel_lookmount = "0 AS lookmount"
+
+    # If schema supports multi-world, include it in WHERE
+    has_world = db._has_column("players", "world_id")
+
+    def chunks(seq, n=500):
+        for i in range(0, len(seq), n):
+            yield seq[i:i+n]
+
+    rows = []
+    for batch in chunks(uniq, 500):
+        placeholders = ",".join(["%s"] * len(batch))
+        sql = f"""
+            SELECT
+                p.name,
+                p.level,
+                {sel_looktype},
+                {sel_lookaddons},
+                {sel_lookhead},
+                {sel_lookbody},
+                {sel_looklegs},
+                {sel_lookfeet},
+                {sel_lookmount},
+                TRIM(COALESCE(a.country, '')) AS country
+            FROM players p
+            LEFT JOIN accounts a ON a.id = p.{acc_fk}
+            WHERE p.name IN ({placeholders})
+        """
+        params = list(batch)
+        # add world filter if available/selected
+        if has_world and world_id is not None:
+            sql += " AND p.world_id = %s"
+            params.append(int(world_id))
+
+        rows.extend(db.run("select", sql, params) or [])
+
+    by_name = {r["name"]: r for r in rows}
+
+    enriched = []
+    for p in players:
+        row = by_name.get(p.get("name"))
+        if row:
+            p.update({
+                "looktype":   int(row.get("looktype", 0)),
+                "lookaddons": int(row.get("lookaddons", 0)),
+                "lookhead":   int(row.get("lookhead", 0)),
+                "lookbody":   int(row.get("lookbody", 0)),
+                "looklegs":   int(row.get("looklegs", 0)),
+                "lookfeet":   int(row.get("lookfeet", 0)),
+                "lookmount":  int(row.get("lookmount", 0)),
+                "country":    (row.get("country") or "").strip(),
+                "level":      row.get("level", p.get("level", 0)),
+            })
+        enriched.append(p)
+    return enriched
+
+
+def _status_world(world_param=None):
+    """(status endpoint, world id, {"id", "name"}) for ?world=<id>; default = first world."""
     worlds = db.run("select", "SELECT id, name, ip, port"
                              + (", status_port" if db._has_column("worlds", "status_port") else "")
-                             + " FROM worlds ORDER BY id", {}) or []
-    if worlds:
-        world_param = request.GET.get("world")
-        try:
-            selected_world_id = int(world_param) if world_param else int(worlds[0]["id"])
-        except (TypeError, ValueError):
-            selected_world_id = int(worlds[0]["id"])
-
-        # find world row (fallback to first)
-        w = next((w for w in worlds if int(w["id"]) == selected_world_id), worlds[0])
-        host = w.get("ip") or settings.OT_STATUS_HOST
-        # prefer an explicit status_port column; else try 'port'; else settings
-        status_port = (
-            w.get("status_port")
-            or w.get("port")
-            or getattr(settings, "OT_STATUS_PORT", 7171)
-        )
-        selected_world_meta = {"id": int(w["id"]), "name": w.get("name")}
-    else:
+                             + " FROM worlds ORDER BY id", {},
+                    cache_ttl=300, tags=("worlds",)) or []
+    if not worlds:
         # no worlds table/rows → legacy single-world
-        host = settings.OT_STATUS_HOST
-        status_port = settings.OT_STATUS_PORT
-        selected_world_id = None
-        selected_world_meta = None
-
-    print(status_port)
-    # 2) Query live players for that world
-    data = query_ot_players(
-        host,
-        int(status_port),
-        getattr(settings, "OT_STATUS_TIMEOUT", 5.0),
-        retries=1, backoff=1.0,
-    ) or {"online": False, "list": []}
+        return status_snapshot.default_endpoint(), None, None
+    try:
+        selected_world_id = int(world_param) if world_param else int(worlds[0]["id"])
+    except (TypeError, ValueError):
+        selected_world_id = int(worlds[0]["id"])
+
+    # find world row (fallback to first)
+    w = next((w for w in worlds if int(w["id"]) == selected_world_id), worlds[0])
+    # prefer an explicit status_port column; else try 'port'; else settings
+    return status_snapshot.world_endpoint(w), int(w["id"]), {"id": int(w["id"]), "name": w.get("name")}
+
+
+def server_players(request):
+    # 1) Pick world (default = first world)
+    endpoint, selected_world_id, selected_world_meta = _status_world(request.GET.get("world"))
+
+    # 2) Live players for that world (status_poller snapshot)
+    data = status_snapshot.players(endpoint)
 
     # 3) Enrich with DB (outfit, country, etc.)
-    names = [p.get("name") for p in data.get("list", []) if p.get("name")]
-    if names:
-        # Dedup while preserving order
-        uniq = list({n: None for n in names}.keys())
-
-        # Detect FK to accounts (account_id vs accountid)
-        acc_fk = "account_id" if db._has_column("players", "account_id") else ("accountid" if db._has_column("players", "accountid") else None)
-        if not acc_fk:
-            raise RuntimeError("players table has no account FK column (account_id/accountid)")
-
-        # Helper: if column exists use it, else constant alias
-        def col_or_zero(tbl, col, alias=None):
-            alias = alias or col
-            return (f"{tbl}.{col} AS {alias}") if db._has_column("players", col) else (f"0 AS {alias}")
-
-        sel_looktype   = col_or_zero("p", "looktype")
-        sel_lookaddons = col_or_zero("p", "lookaddons")
-        sel_lookhead   = col_or_zero("p", "lookhead")
-        sel_lookbody   = col_or_zero("p", "lookbody")
-        sel_looklegs   = col_or_zero("p", "looklegs")
-        sel_lookfeet   = col_or_zero("p", "lookfeet")
-
-        # Mount column varies or may be absent; try common aliases
-        if db._has_column("players", "lookmount"):
-            sel_lookmount = "p.lookmount AS lookmount"
-        elif db._has_column("players", "mount"):
-            sel_lookmount = "p.mount AS lookmount"
-        elif db._has_column("players", "lookmountid"):
-            sel_lookmount = "p.lookmountid AS lookmount"
-        else:
-            sel_lookmount = "0 AS lookmount"
-
-        # If schema supports multi-world, include it in WHERE
-        has_world = db._has_column("players", "world_id")
-
-        def chunks(seq, n=500):
-            for i in range(0, len(seq), n):
-                yield seq[i:i+n]
-
-        rows = []
-        for batch in chunks(uniq, 500):
-            placeholders = ",".join(["%s"] * len(batch))
-            sql = f"""
-                SELECT
-                    p.name,
-                    p.level,
-                    {sel_looktype},
-                    {sel_lookaddons},
-                    {sel_lookhead},
-                    {sel_lookbody},
-                    {sel_looklegs},
-                    {sel_lookfeet},
-                    {sel_lookmount},
-                    TRIM(COALESCE(a.country, '')) AS country
-                FROM players p
-                LEFT JOIN accounts a ON a.id = p.{acc_fk}
-                WHERE p.name IN ({placeholders})
-            """
-            params = list(batch)
-            # add world filter if available/selected
-            if has_world and selected_world_id is not None:
-                sql += " AND p.world_id = %s"
-                params.append(int(selected_world_id))
-
-            rows.extend(db.run("select", sql, params) or [])
-
-        by_name = {r["name"]: r for r in rows}
-
-        enriched = []
-        for p in data.get("list", []):
-            row = by_name.get(p.get("name"))
-            if row:
-                p.update({
-                    "looktype":   int(row.get("looktype", 0)),
-                    "lookaddons": int(row.get("lookaddons", 0)),
-                    "lookhead":   int(row.get("lookhead", 0)),
-                    "lookbody":   int(row.get("lookbody", 0)),
-                    "looklegs":   int(row.get("looklegs", 0)),
-                    "lookfeet":   int(row.get("lookfeet", 0)),
-                    "lookmount":  int(row.get("lookmount", 0)),
-                    "country":    (row.get("country") or "").strip(),
-                    "level":      row.get("level", p.get("level", 0)),
-                })
-            enriched.append(p)
-        data["list"] = enriched
+    data["list"] = _enrich_online_players(data.get("list", []), selected_world_id)
 
     # 4) Attach world meta so the frontend can display it if desired
     if selected_world_meta:
@@ -426,9 +416,42 @@ def server_players(request):
 
     return JsonResponse(data)
 
+@require_GET
+def online_history_json(request):
+    """
+    Players-online chart data: ?world=<id>&tier=minute|hour|day&buckets=N
+    -> {"points": [[bucket start, min, max, avg], ...]} from the pre-aggregated rings.
+    """
+    tier = request.GET.get("tier", "hour")
+    if tier not in online_history.TIERS:
+        return HttpResponseBadRequest("tier must be one of: " + ", ".join(online_history.TIERS))
+    raw_buckets = request.GET.get("buckets")
+    try:
+        buckets = max(1, int(raw_buckets)) if raw_buckets else None
+    except ValueError:
+        return HttpResponseBadRequest("buckets must be an integer")
+
+    endpoint, world_id, world_meta = _status_world(request.GET.get("world"))
+    key = online_history.world_key(endpoint)
+    blob = db.run("scalar", "SELECT data FROM online_history WHERE world_key = %s", [key],
+                  cache_ttl=60, tags=(f"online_history:{key}",))
+    hist = online_history.decode(blob, key)
+    step, _ = online_history.TIERS[tier]
+    response = JsonResponse({
+        "world": world_meta,
+        "tier": tier,
+        "step": step,
+        "points": hist.series(tier, buckets),
+    })
+    response["Cache-Control"] = "public, max-age=60"
+    return response
+
+
+@swr_cached("ot_discord_online", ttl=60, stale_ttl=3600, lock_timeout=10)
 def fetch_discord_online():
     url = f"https://discord.com/api/guilds/963169032138280970/widget.json"
-    r = requests.get(url, timeout=5)
+    with profiling.span("discord"):
+        r = requests.get(url, timeout=5)
     r.raise_for_status()
     data = r.json()
     return int(data.get("presence_count", 0))
@@ -459,12 +482,7 @@ def client_status(request):
 
     req_type = (body.get("type") or "").lower()
 
-    online_data = query_ot_players(
-        settings.OT_STATUS_HOST,
-        int(settings.OT_STATUS_PORT),
-        getattr(settings, "OT_STATUS_TIMEOUT", 5.0),
-        retries=1, backoff=1.0,
-    ) or {"online": False, "list": []}
+    online_data = status_snapshot.players()
 
     playersonline = len(online_data.get("list", [])) if online_data.get("online") else 0
     if req_type == "cacheinfo":
@@ -504,7 +522,8 @@ def client_status(request):
     return raw_json_response({"errorMessage": f"Unknown type '{req_type}'", "errorCode": 422}, 422)
 
 def online_list(request):
-    worlds = db.run("select", "SELECT id, name FROM worlds ORDER BY id", {}) or []
+    worlds = db.run("select", "SELECT id, name FROM worlds ORDER BY id", {},
+                    cache_ttl=300, tags=("worlds",)) or []
     world_param = request.GET.get("world")
     try:
         selected_world_id = int(world_param) if world_param else (int(worlds[0]["id"]) if worlds else None)
@@ -552,27 +571,20 @@ def search_character(request):
 
 
 def character_detail(request, name: str):
-    # Basic character + account fields (tweak columns to match your schema)
-    p = db.run(
-        "select_one",
-        """
-        SELECT p.*,
-               a.premdays, a.created AS account_created, a.country
-          FROM players p
-     LEFT JOIN accounts a ON a.id = p.account_id
-         WHERE p.name = :name
-         LIMIT 1
-        """,
-        {"name": name},
-    )
-    if not p:
-        raise Http404("Character not found")
-
-    # (Optional) Guild info — adapt table/columns if you have them
-    try:
-        guild = db.run(
-            "select_one",
-            """
+    # The lookups below are independent: run them concurrently (one round trip
+    # of latency instead of four). All of them key on the name, not on p.id.
+    res = db.gather({
+        # Basic character + account fields (tweak columns to match your schema)
+        "p": ("select_one", """
+            SELECT p.*,
+                   a.premdays, a.created AS account_created, a.country
+              FROM players p
+         LEFT JOIN accounts a ON a.id = p.account_id
+             WHERE p.name = :name
+             LIMIT 1
+            """, {"name": name}),
+        # (Optional) Guild info — adapt table/columns if you have them
+        "guild": ("select_one", """
             SELECT g.name AS guild_name, r.name AS rank_name
               FROM guild_membership gm
               JOIN guilds g ON g.id = gm.guild_id
@@ -581,59 +593,43 @@ def character_detail(request, name: str):
                    SELECT id FROM players WHERE name = :name LIMIT 1
              )
              LIMIT 1
-            """,
-            {"name": name},
-        )
-    except Exception:
-        guild = None
-
-    # Recent deaths (ignore if table absent)
-    try:
-        deaths = db.run(
-            "select",
-            """
+            """, {"name": name}),
+        # Recent deaths (ignore if table absent)
+        "deaths": ("select", """
             SELECT d.time, d.level, d.killed_by
               FROM player_deaths d
               JOIN players pp ON pp.id = d.player_id
              WHERE pp.name = :name
           ORDER BY d.time DESC
              LIMIT 10
-            """,
-            {"name": name},
-        )
-    except Exception:
-        deaths = []
-
-    account_chars = db.run(
-        "select",
-        "SELECT name, level, vocation FROM players "
-        "WHERE account_id=:aid AND deleted=0 ORDER BY name",
-        {"aid": p["account_id"]}
-    )
+            """, {"name": name}),
+        "account_chars": ("select", """
+            SELECT name, level, vocation FROM players
+             WHERE account_id = (SELECT account_id FROM players WHERE name = :name LIMIT 1)
+               AND deleted = 0
+          ORDER BY name
+            """, {"name": name}),
+    }, return_exceptions=True)
+
+    p = res["p"]
+    if isinstance(p, Exception):
+        raise p
+    if not p:
+        raise Http404("Character not found")
+    guild = None if isinstance(res["guild"], Exception) else res["guild"]
+    deaths = [] if isinstance(res["deaths"], Exception) else res["deaths"]
+    account_chars = res["account_chars"]
+    if isinstance(account_chars, Exception):
+        raise account_chars
 
-    online_names = set()
-    try:
-        live = query_ot_players(settings.OT_STATUS_HOST,
-                                settings.OT_STATUS_PORT,
-                                getattr(settings, "OT_STATUS_TIMEOUT", 3.0))
-        if live.get("online"):
-            # normalize for safe comparison
-            online_names = {row["name"].casefold() for row in live.get("list", [])}
-    except Exception:
-        # optional: keep a tiny DB fallback (or remove to rely ONLY on live)
-        rows = db.run(
-            "select",
-            "SELECT name FROM players WHERE account_id=:aid AND lastlogin > lastlogout",
-            {"aid": p["account_id"]}
-        )
-        online_names = {r["name"].casefold() for r in rows}
+    pres = presence.everywhere()
 
     # annotate account list
     for c in account_chars:
-        c["online"] = (c["name"].casefold() in online_names)
+        c["online"] = pres.is_online(c["name"])
 
     # header badge for this character
-    online = (p["name"].casefold() in online_names)
+    online = pres.is_online(p["name"])
 
     # Skills (map your column names)
     skills = [
@@ -678,7 +674,7 @@ def character_inventory(request, name):
                {", " + attr_col  if attr_col  else ""}
           FROM {table}
          WHERE {pcol} = :pid
-    """, {"pid": pid})
+    """, {"pid": pid}, row="record")
 
     # normalize + index
     items: List[Dict] = [db._encode_item(r, count_col, attr_col) for r in rows]
@@ -851,7 +847,7 @@ def character_depot(request, name):
 
     rows = db.run("select",
         f"SELECT {', '.join(select_cols)} FROM {table} WHERE {where}",
-        args
+        args, row="record"
     )
 
     # Normalize and index
@@ -905,8 +901,12 @@ def _table_exists(table):
         return False
 
 def _is_player_online(pid: int) -> bool:
+    """
+    Guard for edit/delete/bazaar: the game server's own players_online row, read on
+    the primary. pages.presence is for display only (it can be a minute behind).
+    """
     if _table_exists("players_online"):
-        return bool(db.run("scalar", "SELECT 1 FROM players_online WHERE player_id=%s", [pid]))
+        return bool(primary_db.run("scalar", "SELECT 1 FROM players_online WHERE player_id=%s", [pid]))
     return False
 
 @login_required
@@ -935,6 +935,7 @@ def account_character_edit(request, pid: int):
         db.run("execute",
                "UPDATE players SET comment=%s, hidden=%s WHERE id=%s",
                [comment, hidden, pid])
+        db.invalidate("players", f"account:{acc_id}")
         return redirect("account_manage")
 
     # GET -> show form
@@ -967,6 +968,7 @@ def account_character_delete(request, pid: int):
         db.run("execute",
                "UPDATE players SET deleted=1, deletion=%s WHERE id=%s",
                [now, pid])
+        db.invalidate("players", "guilds", "houses", f"account:{acc_id}")
         return redirect("account_manage")
 
     # If someone GETs this URL, just show a tiny confirm template
@@ -1182,9 +1184,15 @@ def last_kills(request):
     if pvp_only:
         where.append("(d.is_player = 1)")
 
+    # Keyset paging needs a total order, i.e. the deaths PK: a player can die more
+    # than once in the same second, at the same level. Tables without an id column
+    # always page by offset.
+    has_id = "id" in set(db._columns(table))
+    order_keys = ["d.time DESC", "d.player_id DESC"] + (["d.id DESC"] if has_id else ["d.level DESC"])
+
     base_sql = f"""
         SELECT
-            d.player_id, d.time, d.level,
+            {"d.id, " if has_id else ""}d.player_id, d.time, d.level,
             d.killed_by, d.is_player,
             d.mostdamage_by, d.mostdamage_is_player,
             d.unjustified, d.mostdamage_unjustified,
@@ -1194,18 +1202,36 @@ def last_kills(request):
         WHERE {" AND ".join(where)}
     """
 
-    rows, page_meta = db.run(
-        "paginate",
-        base_sql,
-        params,
-        order_by="d.time DESC",
-        page=page,
-        per_page=50,
-    )
+    # Default and Next/Prev use keyset cursors (page count from the planner estimate);
+    # explicit ?page=N (First/Last) uses offsets.
+    cursor = request.GET.get("cursor")
+    if has_id and (cursor or "page" not in request.GET):
+        rows, page_meta = db.run(
+            "seek",
+            base_sql,
+            params,
+            keys=order_keys,
+            cursor=cursor,
+            per_page=50,
+            with_total="estimate",
+            count_ttl=30,
+        )
+    else:
+        rows, page_meta = db.run(
+            "paginate",
+            base_sql,
+            params,
+            order_by=", ".join(order_keys),
+            page=page,
+            per_page=50,
+            count_ttl=30,
+            approx_over=100_000,
+        )
 
-    # Build querystring for pager without page=
+    # Build querystring for pager without page=/cursor=
     qs = request.GET.copy()
     qs.pop("page", None)
+    qs.pop("cursor", None)
     querystring = urlencode(qs, doseq=True)
 
     ctx = {
@@ -1227,13 +1253,6 @@ def team(request):
     staff_rows = []
     grp_col_players = "group_id" if db._table_exists("players") and "group_id" in set(db._columns("players")) else None
     has_accounts   = db._table_exists("accounts")
-    online_set     = set()
-    # Online set (optional)
-    if db._table_exists("players_online"):
-        try:
-            online_set = {r["player_id"] for r in db.run("select", "SELECT player_id FROM players_online")}
-        except Exception:
-            online_set = set()
 
     if grp_col_players:
         staff_rows = db.run("select", f"""
@@ -1241,7 +1260,7 @@ def team(request):
               FROM players P
              WHERE {grp_col_players} >= 2  -- 2=GM, 3+=ADM (common OTS defaults)
              ORDER BY {grp_col_players} DESC, level DESC, name ASC
-        """)
+        """, cache_ttl=120, tags=("players",))
     elif has_accounts:
         staff_rows = db.run("select", """
             SELECT p.id, p.name, p.level, p.vocation, p.sex, a.country,
@@ -1251,7 +1270,7 @@ def team(request):
               JOIN accounts a ON a.id = p.account_id
              WHERE COALESCE(a.group_id, a.type, 1) >= 2
              ORDER BY COALESCE(a.group_id, a.type, 1) DESC, p.level DESC, p.name ASC
-        """)
+        """, cache_ttl=120, tags=("players", "accounts"))
     else:
         staff_rows = []
 
@@ -1261,6 +1280,7 @@ def team(request):
         if g >= 3: return "ADM"
         if g == 2: return "GM"
         return "Player"
+    online_set = presence.online_many(r.get("id") for r in staff_rows)
     for r in staff_rows:
         r["role"] = role_from_grp(r.get(f"{grp_col_players}"))
         r["online"] = r.get("id") in online_set
@@ -1296,9 +1316,7 @@ def rules(request):
 
 def _players_columns():
     """Return set of column names present on the players table."""
-    with connections[OT_DB_ALIAS].cursor() as cur:
-        cur.execute(f"SHOW COLUMNS FROM {PLAYERS_TBL}")
-        return {row[0] for row in cur.fetchall()}
+    return set(db._columns(PLAYERS_TBL))
 
 @login_required
 def account_character_create(request):
@@ -1501,6 +1519,7 @@ def account_character_create(request):
             with db.atomic():
                 # Use db.insert which builds the SQL and arguments safely
                 db.insert(PLAYERS_TBL, data)
+                db.invalidate("players", f"account:{ot_account_id}")
         except Exception:
             log.exception("Failed to insert character '%s' for account %s", name, ot_account_id)
             messages.error(request, "Couldn’t create your character. Please try again.")
@@ -71,7 +71,7 @@ def _gather_bans() -> List[Dict[str, Any]]:
         if c_reason:  sel.append(f"{c_reason} AS reason")
         if c_admin:   sel.append(f"{c_admin} AS banned_by")
 
-        rows = db.run("select", f"SELECT {', '.join(sel)} FROM account_bans")
+        rows = db.run("select", f"SELECT {', '.join(sel)} FROM account_bans", row="record")
         for r in rows:
             issued = int(r.get("issued_at") or 0)
             expires = int(r.get("expires_at") or 0)
@@ -104,7 +104,7 @@ def _gather_bans() -> List[Dict[str, Any]]:
         if c_reason:  sel.append(f"{c_reason} AS reason")
         if c_admin:   sel.append(f"{c_admin} AS banned_by")
 
-        rows = db.run("select", f"SELECT {', '.join(sel)} FROM ip_bans")
+        rows = db.run("select", f"SELECT {', '.join(sel)} FROM ip_bans", row="record")
         for r in rows:
             issued = int(r.get("issued_at") or 0)
             expires = int(r.get("expires_at") or 0)
@@ -143,7 +143,7 @@ def _gather_bans() -> List[Dict[str, Any]]:
         if c_admin:   sel.append(f"{c_admin} AS banned_by")
 
         if sel:
-            rows = db.run("select", f"SELECT {', '.join(sel)} FROM bans")
+            rows = db.run("select", f"SELECT {', '.join(sel)} FROM bans", row="record")
             for r in rows:
                 t = int(r.get(c_type) or 0)
                 val = r.get(c_value)
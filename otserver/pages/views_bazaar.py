@@ -45,7 +45,8 @@ def bazaar_list(request):
        WHERE {" AND ".join(where)}
     """
     page = int(q.get("page", "1") or 1)
-    rows, meta = db.run("paginate", base, args, order_by=order_sql, page=page, per_page=20)
+    rows, meta = db.run("paginate", base, args, order_by=order_sql, page=page, per_page=20, count_ttl=15,
+                        cache_ttl=15, tags=("bazaar",))
 
     return render(request, "pages/bazaar_list.html", {
         "offers": rows,
@@ -55,14 +56,15 @@ def bazaar_list(request):
     })
 
 def bazaar_offer(request, offer_id: int):
-    offer = db.run("select_one", "SELECT * FROM bazaar_offers WHERE id=%s", [offer_id])
+    offer = db.run("select_one", "SELECT * FROM bazaar_offers WHERE id=%s", [offer_id],
+                   cache_ttl=30, tags=(f"bazaar:{offer_id}",))
     if not offer:
         raise Http404("Offer not found")
 
     # bids
     bids = db.run("select",
         "SELECT bidder_account_id, amount, created_at FROM bazaar_bids WHERE offer_id=%s ORDER BY amount DESC, id DESC",
-        [offer_id]
+        [offer_id], cache_ttl=30, tags=(f"bazaar:{offer_id}",)
     )
 
     return render(request, "pages/bazaar_offer.html", {
@@ -74,6 +76,20 @@ def bazaar_offer(request, offer_id: int):
 FEE_BPS = getattr(settings, "BAZAAR_FEE_BPS", 100)  # 100 = 1%
 FEE_ACCT = getattr(settings, "BAZAAR_FEE_ACCOUNT_ID", 1)
 
+def _lock_active_offer(offer_id: int, now: int):
+    """
+    The offer row, locked for the rest of the transaction. Read inside the retried
+    unit (on the primary), so a replay after a deadlock re-checks the current bid
+    and status instead of acting on the snapshot that lost the race.
+    """
+    offer = db.run("select_one",
+                   "SELECT * FROM bazaar_offers WHERE id=%s AND status='active' FOR UPDATE", [offer_id])
+    if not offer:
+        raise ValueError("Offer is no longer active.")
+    if now >= offer["end_time"]:
+        raise ValueError("Auction ended.")
+    return offer
+
 @login_required
 @require_POST
 def bazaar_bid(request, offer_id: int):
@@ -83,61 +99,64 @@ def bazaar_bid(request, offer_id: int):
     except ValueError:
         return HttpResponseBadRequest("Bad amount.")
 
-    offer = db.run("select_one", "SELECT * FROM bazaar_offers WHERE id=%s AND status='active'", [offer_id])
-    if not offer:
-        raise Http404("Offer not found")
-
-    now = _now()
-    if now >= offer["end_time"]:
-        return HttpResponseBadRequest("Auction ended.")
-
     bidder_acc = getattr(getattr(request.user, "profile", None), "ot_account_id", None)
     if not bidder_acc:
         return HttpResponseBadRequest("No linked OT account.")
 
     # BUYOUT path
     if action == "buyout":
-        if not offer["buyout"]:
-            return HttpResponseBadRequest("Buyout not available.")
         # you must have >= buyout coins
+        def buyout():
+            now = _now()
+            offer = _lock_active_offer(offer_id, now)
+            if not offer["buyout"]:
+                raise ValueError("Buyout not available.")
+            # release previous hold if any
+            active = db.hold_get_active(offer_id)
+            if active:
+                db.hold_release(active["id"])
+            # create hold for full buyout
+            hid = db.hold_create(offer_id, bidder_acc, int(offer["buyout"]))
+            # settle immediately to seller (fee applied)
+            db.hold_settle_to_seller(hid, int(offer["seller_account_id"]), fee_bps=FEE_BPS, fee_account_id=FEE_ACCT)
+            # finalize offer
+            db.run("execute",
+                "UPDATE bazaar_offers SET status='sold', current_bid=%s, current_bidder_account_id=%s, updated_at=%s, end_time=%s WHERE id=%s",
+                [offer["buyout"], bidder_acc, now, now, offer_id])
+            db.invalidate("bazaar", f"bazaar:{offer_id}")
+
         try:
-            with db.atomic():
-                # release previous hold if any
-                active = db.hold_get_active(offer_id)
-                if active:
-                    db.hold_release(active["id"])
-                # create hold for full buyout
-                hid = db.hold_create(offer_id, bidder_acc, int(offer["buyout"]))
-                # settle immediately to seller (fee applied)
-                db.hold_settle_to_seller(hid, int(offer["seller_account_id"]), fee_bps=FEE_BPS, fee_account_id=FEE_ACCT)
-                # finalize offer
-                db.run("execute",
-                    "UPDATE bazaar_offers SET status='sold', current_bid=%s, current_bidder_account_id=%s, updated_at=%s, end_time=%s WHERE id=%s",
-                    [offer["buyout"], bidder_acc, now, now, offer_id])
+            # replayed as a whole if InnoDB picks it as a deadlock victim
+            db.atomic_retry(buyout)
         except ValueError as e:
             return HttpResponseBadRequest(str(e))
         return redirect("bazaar_offer", offer_id=offer_id)
 
     # BID path
-    min_allowed = max(offer["min_bid"], (offer["current_bid"] or 0) + 1)
-    if amount < min_allowed:
-        return HttpResponseBadRequest(f"Bid must be ≥ {min_allowed} coins")
+    def place_bid():
+        now = _now()
+        offer = _lock_active_offer(offer_id, now)
+        min_allowed = max(offer["min_bid"], (offer["current_bid"] or 0) + 1)
+        if amount < min_allowed:
+            raise ValueError(f"Bid must be ≥ {min_allowed} coins")
+
+        # release previous hold (previous highest bidder)
+        active = db.hold_get_active(offer_id)
+        if active:
+            db.hold_release(active["id"])
+
+        # place new bid & hold bidder's coins
+        hid = db.hold_create(offer_id, bidder_acc, amount)
+        db.run("execute",
+               "INSERT INTO bazaar_bids (offer_id, bidder_account_id, amount, created_at) VALUES (%s,%s,%s,%s)",
+               [offer_id, bidder_acc, amount, now])
+        db.run("execute",
+               "UPDATE bazaar_offers SET current_bid=%s, current_bidder_account_id=%s, updated_at=%s WHERE id=%s",
+               [amount, bidder_acc, now, offer_id])
+        db.invalidate("bazaar", f"bazaar:{offer_id}")
 
     try:
-        with db.atomic():
-            # release previous hold (previous highest bidder)
-            active = db.hold_get_active(offer_id)
-            if active:
-                db.hold_release(active["id"])
-
-            # place new bid & hold bidder's coins
-            hid = db.hold_create(offer_id, bidder_acc, amount)
-            db.run("execute",
-                   "INSERT INTO bazaar_bids (offer_id, bidder_account_id, amount, created_at) VALUES (%s,%s,%s,%s)",
-                   [offer_id, bidder_acc, amount, now])
-            db.run("execute",
-                   "UPDATE bazaar_offers SET current_bid=%s, current_bidder_account_id=%s, updated_at=%s WHERE id=%s",
-                   [amount, bidder_acc, now, offer_id])
+        db.atomic_retry(place_bid)
     except ValueError as e:
         return HttpResponseBadRequest(str(e))
 
@@ -173,37 +192,41 @@ def bazaar_sell(request):
         except ValueError as e:
             return HttpResponseBadRequest(str(e))
 
-        # verify ownership + offline
-        owner = db.run("scalar", "SELECT account_id FROM players WHERE id=%s", [pid])
-        if not owner or int(owner) != int(acc_id):
-            return HttpResponseBadRequest("Not your character.")
-        if _is_player_online(pid):
-            return HttpResponseBadRequest("Character must be offline.")
-
-        # snapshot & base data
-        p = db.run("select_one", "SELECT * FROM players WHERE id=%s", [pid])
-        if not p:
-            return HttpResponseBadRequest("Character not found.")
-        snap = _character_snapshot(pid)
-        now  = _now()
-        end  = now + hours * 3600
-
-        db.run("execute", """
-          INSERT INTO bazaar_offers
-          (player_id, player_name, seller_account_id, status,
-           start_time, end_time, min_bid, buyout, current_bid,
-           level, vocation, sex, looktype, lookhead, lookbody, looklegs, lookfeet,
-           equipment_json, inventory_json, depot_json, comment, created_at, updated_at)
-          VALUES
-          (%s,%s,%s,'active',%s,%s,%s,%s,NULL,
-           %s,%s,%s,%s,%s,%s,%s,%s,
-           %s,%s,%s,%s,%s,%s)
-        """, [
-           p["id"], p["name"], acc_id, now, end, min_bid, (buyout or None),
-           p["level"], p["vocation"], p["sex"], p["looktype"], p["lookhead"], p["lookbody"], p["looklegs"], p["lookfeet"],
-           db.json(snap["equipment"]), db.json(snap["inventory"]), db.json(snap["depot"]),
-           (request.POST.get("comment") or "").strip(), now, now
-        ])
+        # reads that decide the write run on the primary (atomic() routes them there),
+        # with the character row locked until the offer is in
+        with db.atomic():
+            # verify ownership + offline
+            owner = db.run("scalar", "SELECT account_id FROM players WHERE id=%s FOR UPDATE", [pid])
+            if not owner or int(owner) != int(acc_id):
+                return HttpResponseBadRequest("Not your character.")
+            if _is_player_online(pid):
+                return HttpResponseBadRequest("Character must be offline.")
+
+            # snapshot & base data
+            p = db.run("select_one", "SELECT * FROM players WHERE id=%s", [pid])
+            if not p:
+                return HttpResponseBadRequest("Character not found.")
+            snap = _character_snapshot(pid)
+            now  = _now()
+            end  = now + hours * 3600
+
+            db.run("execute", """
+              INSERT INTO bazaar_offers
+              (player_id, player_name, seller_account_id, status,
+               start_time, end_time, min_bid, buyout, current_bid,
+               level, vocation, sex, looktype, lookhead, lookbody, looklegs, lookfeet,
+               equipment_json, inventory_json, depot_json, comment, created_at, updated_at)
+              VALUES
+              (%s,%s,%s,'active',%s,%s,%s,%s,NULL,
+               %s,%s,%s,%s,%s,%s,%s,%s,
+               %s,%s,%s,%s,%s,%s)
+            """, [
+               p["id"], p["name"], acc_id, now, end, min_bid, (buyout or None),
+               p["level"], p["vocation"], p["sex"], p["looktype"], p["lookhead"], p["lookbody"], p["looklegs"], p["lookfeet"],
+               db.json(snap["equipment"]), db.json(snap["inventory"]), db.json(snap["depot"]),
+               (request.POST.get("comment") or "").strip(), now, now
+            ])
+        db.invalidate("bazaar")
 
         return redirect("bazaar_list")
 
@@ -3,6 +3,7 @@ from urllib.parse import unquote
 from django.shortcuts import render
 from django.http import Http404
 from .db import DB
+from . import presence
 
 db = DB()
 
@@ -67,35 +68,29 @@ def _guild_member_counts(bind):
     """Return {guild_id: member_count} for the detected schema."""
     mode = bind["mode"]
     if mode == "by_rank":
-        return {
-            r["guild_id"]: r["ct"]
-            for r in db.run("select", f"""
-                SELECT gr.{bind['gr_guild']} AS guild_id, COUNT(*) AS ct
-                  FROM players p
-                  JOIN guild_ranks gr ON p.{bind['p_rank']} = gr.{bind['gr_id']}
-                 GROUP BY gr.{bind['gr_guild']}
-            """)
-        }
-    if mode == "players_guild_id":
-        return {
-            r["guild_id"]: r["ct"]
-            for r in db.run("select", f"""
-                SELECT {bind['p_guild']} AS guild_id, COUNT(*) AS ct
-                  FROM players
-                 WHERE {bind['p_guild']} IS NOT NULL AND {bind['p_guild']} <> 0
-                 GROUP BY {bind['p_guild']}
-            """)
-        }
-    if mode == "membership":
-        return {
-            r["guild_id"]: r["ct"]
-            for r in db.run("select", f"""
-                SELECT {bind['m_guild']} AS guild_id, COUNT(*) AS ct
-                  FROM guild_membership
-                 GROUP BY {bind['m_guild']}
-            """)
-        }
-    return {}
+        sql = f"""
+            SELECT gr.{bind['gr_guild']} AS guild_id, COUNT(*) AS ct
+              FROM players p
+              JOIN guild_ranks gr ON p.{bind['p_rank']} = gr.{bind['gr_id']}
+             GROUP BY gr.{bind['gr_guild']}
+        """
+    elif mode == "players_guild_id":
+        sql = f"""
+            SELECT {bind['p_guild']} AS guild_id, COUNT(*) AS ct
+              FROM players
+             WHERE {bind['p_guild']} IS NOT NULL AND {bind['p_guild']} <> 0
+             GROUP BY {bind['p_guild']}
+        """
+    elif mode == "membership":
+        sql = f"""
+            SELECT {bind['m_guild']} AS guild_id, COUNT(*) AS ct
+              FROM guild_membership
+             GROUP BY {bind['m_guild']}
+        """
+    else:
+        return {}
+    cols = db.run("select", sql, row="columns", cache_ttl=120, tags=("guilds", "players"))
+    return dict(zip(cols["guild_id"], cols["ct"]))
 
 def _guild_leaders(bind, guild_ids):
     """Return {guild_id: leader_name} via owner_id or highest rank."""
@@ -110,7 +105,7 @@ def _guild_leaders(bind, guild_ids):
             f"SELECT g.id AS gid, p.name AS leader "
             f"FROM guilds g LEFT JOIN players p ON p.id = g.{bind['g_owner']} "
             f"WHERE g.id IN ({', '.join(['%s']*len(guild_ids))})",
-            guild_ids,
+            guild_ids, cache_ttl=120, tags=("guilds", "players"),
         )
         for r in owners:
             if r.get("leader"):
@@ -150,7 +145,7 @@ def _guild_leaders(bind, guild_ids):
             """
         if q:
             got = set()
-            for r in db.run("select", q, missing):
+            for r in db.run("select", q, missing, cache_ttl=120, tags=("guilds", "players")):
                 gid = r["gid"]
                 if gid not in leaders:
                     leaders[gid] = r["name"]
@@ -172,7 +167,7 @@ def guild_list(request):
                {bind['g_motd']} AS motd
           FROM guilds
          ORDER BY name ASC
-    """)
+    """, cache_ttl=120, tags=("guilds",))
 
     ids = [g["id"] for g in base]
     counts = _guild_member_counts(bind)
@@ -215,11 +210,9 @@ def guild_detail(request, name):
         members = db.run("select", f"""
             SELECT p.id, p.name, p.level, p.vocation, p.sex,
                    gr.{bind['gr_name']} AS rank_name,
-                   gr.{bind['gr_level']} AS rank_level,
-                   CASE WHEN po.player_id IS NULL THEN 0 ELSE 1 END AS is_online
+                   gr.{bind['gr_level']} AS rank_level
               FROM players p
               JOIN guild_ranks gr ON p.{bind['p_rank']} = gr.{bind['gr_id']}
-              LEFT JOIN players_online po ON po.player_id = p.id
              WHERE gr.{bind['gr_guild']} = %s
              ORDER BY gr.{bind['gr_level']} ASC, p.level DESC, p.name ASC
         """, [gid])
@@ -227,11 +220,9 @@ def guild_detail(request, name):
         members = db.run("select", f"""
             SELECT p.id, p.name, p.level, p.vocation, p.sex,
                    COALESCE(gr.{bind['gr_name']}, 'Member') AS rank_name,
-                   COALESCE(gr.{bind['gr_level']}, 3) AS rank_level,
-                   CASE WHEN po.player_id IS NULL THEN 0 ELSE 1 END AS is_online
+                   COALESCE(gr.{bind['gr_level']}, 3) AS rank_level
               FROM players p
               LEFT JOIN guild_ranks gr ON {("p."+bind['p_rank']) if bind.get('p_rank') else "NULL"} = gr.{bind['gr_id']}
-              LEFT JOIN players_online po ON po.player_id = p.id
              WHERE p.{bind['p_guild']} = %s
              ORDER BY COALESCE(gr.{bind['gr_level']}, 3) ASC, p.level DESC, p.name ASC
         """, [gid])
@@ -239,18 +230,20 @@ def guild_detail(request, name):
         members = db.run("select", f"""
             SELECT p.id, p.name, p.level, p.vocation, p.sex,
                    COALESCE(gr.{bind['gr_name']}, 'Member') AS rank_name,
-                   COALESCE(gr.{bind['gr_level']}, 3) AS rank_level,
-                   CASE WHEN po.player_id IS NULL THEN 0 ELSE 1 END AS is_online
+                   COALESCE(gr.{bind['gr_level']}, 3) AS rank_level
               FROM guild_membership gm
               JOIN players p ON p.id = gm.{bind['m_player']}
               LEFT JOIN guild_ranks gr ON gm.{bind['m_rank']} = gr.{bind['gr_id']}
-              LEFT JOIN players_online po ON po.player_id = p.id
              WHERE gm.{bind['m_guild']} = %s
              ORDER BY COALESCE(gr.{bind['gr_level']}, 3) ASC, p.level DESC, p.name ASC
         """, [gid])
     else:
         members = []
 
+    online = presence.online_many(m["id"] for m in members)
+    for m in members:
+        m["is_online"] = int(m["id"] in online)
+
     # extras
     members_total = len(members)
     online_total = sum(1 for m in members if m.get("is_online"))
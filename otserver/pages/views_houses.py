@@ -151,7 +151,8 @@ def houses_list(request):
     else:
         order_by = "name ASC"
 
-    rows, meta = db.run("paginate", base_sql, params, order_by=order_by, page=page, per_page=25)
+    rows, meta = db.run("paginate", base_sql, params, order_by=order_by, page=page, per_page=25, count_ttl=60,
+                        cache_ttl=60, tags=("houses", "players"))
 
     # Build town options from data (unique ids seen)
     town_ids = sorted({r["town_id"] for r in rows} | set())
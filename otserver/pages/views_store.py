@@ -93,6 +93,7 @@ def _credit_coins(account_id: int, coins: int, txid: str, method: str):
                SET coins = COALESCE(coins, 0) + %s
              WHERE id = %s
         """, [coins, account_id])
+        db.invalidate(f"wallet:{account_id}")
 
 # ---------- Donate page (coins only; no character name) ----------
 @login_required
@@ -1,45 +1,24 @@
 # views_updater.py
-import os, zlib, mimetypes, re
-from pathlib import Path
-from django.http import JsonResponse, Http404, FileResponse, HttpResponse
+import os, mimetypes, re
+from django.http import Http404, FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import reverse
 from django.shortcuts import redirect
 
-API_DIR = Path("/srv/django_otwebsite/otserver/api").resolve()
-FILES_AND_DIRS = ["init.lua", "data", "modules", "mods", "layouts"]
-
-BINARIES = {
-    "WIN32-WGL":       "Retrowar_gl.exe",
-    "WIN32-EGL":       "Retrowar_dx.exe",
-    "WIN32-WGL-GCC":   "Retrowar_gcc_gl.exe",
-    "WIN32-EGL-GCC":   "Retrowar_gcc_dx.exe",
-    "X11-GLX":         "Retrowar_linux",
-    "X11-EGL":         "Retrowar_linux",
-    "ANDROID-EGL":     "",
-    "ANDROID64-EGL":   "",
-}
-
-def _crc32_hex(path: Path) -> str:
-    crc = 0
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            crc = zlib.crc32(chunk, crc)
-    return format(crc & 0xFFFFFFFF, "08x")
+from .updater_manifest import API_DIR, index as manifest_index
 
 def _files_base_url(request) -> str:
     base = request.build_absolute_uri(reverse("api", kwargs={"subpath": ""}))
     return base if base.endswith("/") else base + "/"
 
-URL_UNSAFE = re.compile(r"[ \t\(\)]")  # space, tab, parentheses
 @csrf_exempt
 def updater(request):
     """
-    Generate the OTClient update manifest.
+    Serve the OTClient update manifest (see pages/updater_manifest.py).
     Includes a manual version number to force updates only when bumped.
     """
-    MANUAL_VERSION = "1.0.0"  # 🔧 Increase this whenever you want clients to re-update
-
     client_platform = None
     if request.body:
         try:
@@ -49,71 +28,116 @@ def updater(request):
         except Exception:
             client_platform = None
 
-    base_url = "https://retrowarot.com/api/"
-    manifest = {
-        "url": base_url,
-        "files": {},
-        "keepFiles": True,
-        "version": MANUAL_VERSION,  # 🧩 Added manual version
-    }
-
-    wanted_binary_name = BINARIES.get(client_platform or "", "") or ""
-    wanted_binary_relpath = None
-    wanted_binary_checksum = None
-
-    for root, _, files in os.walk(API_DIR):
-        files.sort()
-        for fname in files:
-            fpath = Path(root) / fname
-            rel = fpath.relative_to(API_DIR).as_posix()
-            top = rel.split("/", 1)[0]
-
-            if top not in FILES_AND_DIRS:
-                continue
-            if URL_UNSAFE.search(rel):
-                continue
-
-            crc = _crc32_hex(fpath)
-            manifest["files"][rel] = crc
-
-            if wanted_binary_name and rel.endswith("/" + wanted_binary_name):
-                wanted_binary_relpath = rel
-                wanted_binary_checksum = crc
-
-    manifest["files"] = dict(sorted(manifest["files"].items()))
-
-    if wanted_binary_relpath and wanted_binary_checksum:
-        manifest["binary"] = {
-            "file": wanted_binary_relpath,
-            "checksum": wanted_binary_checksum,
-        }
-
-    resp = JsonResponse(manifest, json_dumps_params={"indent": 2})
+    # pre-serialized; files are rehashed only when their size/mtime/inode change
+    resp = HttpResponse(manifest_index.manifest_bytes(client_platform), content_type="application/json")
     resp["Cache-Control"] = "no-store"
     return resp
 
 
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _byte_range(header: str, size: int):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to serve the whole
+    file (no/unsupported/multi-range header), or False if unsatisfiable.
+    """
+    m = _RANGE.match(header.replace(" ", ""))
+    if not m or m.group(1) == m.group(2) == "":
+        return None
+    first, last = m.groups()
+    if first == "":                       # bytes=-N: the last N bytes
+        n = int(last)
+        if n == 0 or size == 0:
+            return False
+        return max(0, size - n), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None                       # syntactically invalid: ignore (RFC 9110 14.2)
+    if start >= size:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag: str, mtime: int) -> bool:
+    """No If-Range, or it names the current representation (strong ETag / exact date)."""
+    value = request.META.get("HTTP_IF_RANGE", "").strip()
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        return value == etag
+    return parse_http_date_safe(value) == mtime
+
+
+def _file_chunks(f, length: int, chunk: int = 65536):
+    try:
+        while length > 0:
+            data = f.read(min(chunk, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        f.close()
+
+
 @csrf_exempt
 def api_file(request, subpath: str):
     """
     Serve /api/<subpath> as raw bytes (always application/octet-stream).
     No content-disposition attachment; the client streams it.
+    Strong ETag from the manifest CRC (size/mtime when the index lags), Last-Modified,
+    304 on If-None-Match/If-Modified-Since, and single byte ranges (If-Range aware)
+    so interrupted downloads resume instead of starting over.
     """
     safe_path = (API_DIR / subpath).resolve()
-    if not str(safe_path).startswith(str(API_DIR)) or not safe_path.is_file():
+    if not safe_path.is_relative_to(API_DIR) or not safe_path.is_file():
         raise Http404("Not found")
 
-    resp = FileResponse(open(safe_path, "rb"),
-                        as_attachment=False,
-                        content_type="application/octet-stream")
-    # Long cache for immutable client assets
-   # resp["Cache-Control"] = "public, max-age=31536000, immutable"
-   # # Inline (not “download”)
-   # resp["Content-Disposition"] = f'inline; filename="{safe_path.name}"'
-   # api_file()
-    resp["Cache-Control"] = "no-cache, must-revalidate"
-    # or the nuclear option:
-    # resp["Cache-Control"] = "no-store"
+    f = open(safe_path, "rb")
+    try:
+        st = os.fstat(f.fileno())
+        size, mtime = st.st_size, int(st.st_mtime)
+        manifest_index.refresh()
+        crc = manifest_index.checksum(safe_path.relative_to(API_DIR).as_posix(), st)
+        etag = f'"{crc}-{size:x}"' if crc else f'"{st.st_mtime_ns:x}-{size:x}"'
+
+        headers = HttpResponse()
+        headers["ETag"] = etag
+        headers["Last-Modified"] = http_date(mtime)
+        headers["Cache-Control"] = "no-cache, must-revalidate"
+        conditional = get_conditional_response(request, etag=etag, last_modified=mtime, response=headers)
+        if conditional is not headers:     # 304 / 412
+            f.close()
+            return conditional
+
+        rng = None
+        if "HTTP_RANGE" in request.META and _if_range_matches(request, etag, mtime):
+            rng = _byte_range(request.META["HTTP_RANGE"], size)
+        if rng is False:
+            f.close()
+            resp = HttpResponse(status=416)
+            resp["Content-Range"] = f"bytes */{size}"
+            resp["Accept-Ranges"] = "bytes"
+            return resp
+
+        if rng is None:
+            resp = FileResponse(f, as_attachment=False, content_type="application/octet-stream")
+        else:
+            start, end = rng
+            f.seek(start)
+            resp = StreamingHttpResponse(_file_chunks(f, end - start + 1), status=206,
+                                         content_type="application/octet-stream")
+            resp["Content-Range"] = f"bytes {start}-{end}/{size}"
+            resp["Content-Length"] = str(end - start + 1)
+    except BaseException:
+        f.close()
+        raise
+
+    for name in ("ETag", "Last-Modified", "Cache-Control"):
+        resp[name] = headers[name]
+    resp["Accept-Ranges"] = "bytes"
     resp["Content-Disposition"] = f'inline; filename="{safe_path.name}"'
     return resp
 
@@ -88,18 +88,22 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
+  function show(data, list) {
+    const on = !!data.online;
+    setOnline(on);
+    const counts = data.players || {};
+    summary.textContent = on
+      ? `Online: ${counts.online || 0}  Record: ${counts.peak || 0}`
+      : `Server offline`;
+    render(list);
+    if (updated) updated.textContent = `Updated ${new Date().toLocaleTimeString()}`;
+  }
+
   async function tick() {
     try {
       const res = await fetch(endpoint, { cache: "no-store" });
       const data = await res.json();
-      const on = !!data.online;
-      setOnline(on);
-      const counts = data.players || {};
-      summary.textContent = on
-        ? `Online: ${counts.online || 0}  Record: ${counts.peak || 0}`
-        : `Server offline`;
-      render(data.list || []);
-      if (updated) updated.textContent = `Updated ${new Date().toLocaleTimeString()}`;
+      show(data, data.list || []);
     } catch {
       setOnline(false);
       summary.textContent = "Server offline";
@@ -107,6 +111,39 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
-  tick();
-  setInterval(tick, 30000); // 30s
+  function startPolling() {
+    tick();
+    setInterval(tick, 30000); // 30s
+  }
+
+  // Live updates over SSE: a snapshot, then joined/left/level deltas.
+  const stream = root.dataset.stream;
+  if (!stream || !window.EventSource) {
+    startPolling();
+    return;
+  }
+  const players = new Map();   // lowercased name -> player, in server order
+  const listed = () => [...players.values()];
+  const es = new EventSource(stream);
+  es.addEventListener("snapshot", (e) => {
+    const data = JSON.parse(e.data);
+    players.clear();
+    (data.list || []).forEach((p) => players.set(p.name.toLowerCase(), p));
+    show(data, listed());
+  });
+  es.addEventListener("delta", (e) => {
+    const data = JSON.parse(e.data);
+    (data.left || []).forEach((name) => players.delete(name.toLowerCase()));
+    (data.joined || []).forEach((p) => players.set(p.name.toLowerCase(), p));
+    Object.entries(data.levels || {}).forEach(([name, level]) => {
+      const p = players.get(name.toLowerCase());
+      if (p) p.level = level;
+    });
+    if (!data.online) players.clear();
+    show(data, listed());
+  });
+  es.onerror = () => {
+    // CONNECTING = the browser retries by itself; CLOSED = no stream here (404/503)
+    if (es.readyState === EventSource.CLOSED) startPolling();
+  };
 });
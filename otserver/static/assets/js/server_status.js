@@ -32,6 +32,23 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
-  fetchOnce();
-  setInterval(fetchOnce, 60000); // 60s poll if no provider is pushing updates
+  function startPolling() {
+    fetchOnce();
+    setInterval(fetchOnce, 60000); // 60s poll if no provider is pushing updates
+  }
+
+  // Live updates over SSE (ASGI deployments); polling when unavailable.
+  const stream = box.dataset.stream;
+  if (!stream || !window.EventSource) {
+    startPolling();
+    return;
+  }
+  const es = new EventSource(stream);
+  const onEvent = (e) => { try { apply(JSON.parse(e.data)); } catch {} };
+  es.addEventListener("snapshot", onEvent);
+  es.addEventListener("delta", onEvent);
+  es.onerror = () => {
+    // CONNECTING = the browser retries by itself; CLOSED = no stream here (404/503)
+    if (es.readyState === EventSource.CLOSED) startPolling();
+  };
 });